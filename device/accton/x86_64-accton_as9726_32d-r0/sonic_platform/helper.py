@@ -1,3 +1,4 @@
+import math
 import os
 import struct
 from mmap import *
@@ -50,3 +51,105 @@ class APIHelper():
             return False
         return True
 
+
+EEPROM_PAGE_SIZE = 128
+
+
+class EepromReader():
+    """
+    Reads the EEPROM of a transceiver through a file descriptor kept open
+    until presence of the module changes. Pages holding static data, e.g.
+    identity and thresholds, are read whole once and kept until then too,
+    other data is read from the EEPROM each time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.static_pages = frozenset()
+        self._fd = None
+        self._pages = {}
+
+    def set_static_pages(self, pages):
+        """
+        Args:
+            pages: Numbers of the pages to be kept, page N holds the bytes
+                   from N * EEPROM_PAGE_SIZE of the sysfs file
+        """
+        self.static_pages = frozenset(pages)
+        self._pages = {}
+
+    def invalidate(self):
+        """
+        Drop the pages kept and close the EEPROM
+        """
+        self._pages = {}
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    def _pread(self, offset, num_bytes):
+        try:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDONLY)
+            data = os.pread(self._fd, num_bytes, offset)
+        except OSError:
+            self.invalidate()
+            return None
+        if len(data) != num_bytes:
+            return None
+        return data
+
+    def _read_page(self, page):
+        data = self._pages.get(page)
+        if data is None:
+            data = self._pread(page * EEPROM_PAGE_SIZE, EEPROM_PAGE_SIZE)
+            if data is not None:
+                self._pages[page] = data
+        return data
+
+    def read(self, offset, num_bytes):
+        """
+        Read bytes of the EEPROM
+        Returns:
+            A memoryview of num_bytes bytes from offset, None if they can't be read
+        """
+        first_page = offset // EEPROM_PAGE_SIZE
+        last_page = (offset + num_bytes - 1) // EEPROM_PAGE_SIZE
+        pages = range(first_page, last_page + 1)
+        if num_bytes <= 0 or not all(page in self.static_pages for page in pages):
+            data = self._pread(offset, num_bytes)
+            return memoryview(data) if data is not None else None
+
+        buf = None
+        for page in pages:
+            data = self._read_page(page)
+            if data is None:
+                return None
+            buf = data if buf is None else buf + data
+        start = offset - first_page * EEPROM_PAGE_SIZE
+        return memoryview(buf)[start:start + num_bytes]
+
+
+# DOM values are parsed the way sff8436Dom/sff8472Dom parse internally
+# calibrated values, rounded the same as their strings. Power is in dBm,
+# 'N/A' if there is no light at all.
+def parse_dom_temperature(data, offset):
+    return round(struct.unpack_from('>h', data, offset)[0] / 256.0, 4)
+
+
+def parse_dom_voltage(data, offset):
+    return round(struct.unpack_from('>H', data, offset)[0] * 0.0001, 4)
+
+
+def parse_dom_bias(data, offset):
+    return round(struct.unpack_from('>H', data, offset)[0] * 0.002, 4)
+
+
+def parse_dom_power(data, offset):
+    power = struct.unpack_from('>H', data, offset)[0] * 0.0001
+    if power == 0:
+        return 'N/A'
+    return round(10.0 * math.log10(power), 4)
@@ -22,7 +22,8 @@ try:
     from sonic_platform_base.sonic_sfp.qsfp_dd import qsfp_dd_InterfaceId
     from sonic_platform_base.sonic_sfp.qsfp_dd import qsfp_dd_Dom
     from sonic_platform_base.sonic_sfp.sfputilhelper import SfpUtilHelper
-    from .helper import APIHelper
+    from .helper import APIHelper, EepromReader
+    from .helper import parse_dom_temperature, parse_dom_voltage, parse_dom_bias, parse_dom_power
 except ImportError as e:
     raise ImportError(str(e) + "- required module not found")
 
@@ -126,6 +127,9 @@ QSFP_VERSION_COMPLIANCE_WIDTH = 2
 QSFP_CHANNL_MON_OFFSET = 34
 QSFP_CHANNL_MON_WIDTH = 16
 QSFP_CHANNL_MON_WITH_TX_POWER_WIDTH = 24
+QSFP_CHANNL_RX_POWER_OFFSET = 34
+QSFP_CHANNL_TX_BIAS_OFFSET = 42
+QSFP_CHANNL_TX_POWER_OFFSET = 50
 QSFP_CHANNL_DISABLE_STATUS_OFFSET = 86
 QSFP_CHANNL_DISABLE_STATUS_WIDTH = 1
 QSFP_CHANNL_RX_LOS_STATUS_OFFSET = 3
@@ -160,6 +164,9 @@ SFP_VOLT_OFFSET = 98
 SFP_VOLT_WIDTH = 2
 SFP_CHANNL_MON_OFFSET = 100
 SFP_CHANNL_MON_WIDTH = 6
+SFP_TX_BIAS_OFFSET = 100
+SFP_TX_POWER_OFFSET = 102
+SFP_RX_POWER_OFFSET = 104
 SFP_CHANNL_STATUS_OFFSET = 110
 SFP_CHANNL_STATUS_WIDTH = 1
 
@@ -268,6 +275,15 @@ QSFP_PORT_END = 32
 SFP_I2C_START = 17
 I2C_EEPROM_PATH = '/sys/bus/i2c/devices/{0}-0050/eeprom'
 
+# EEPROM pages which hold static data, kept until presence changes.
+# QSFP: upper page 00h and page 03h, QSFP-DD: upper page 00h, pages 01h and 02h,
+# SFP: A0h
+SFP_STATIC_EEPROM_PAGES = {
+    SFP_TYPE: (0, 1),
+    QSFP_TYPE: (1, 4),
+    QSFP_DD_TYPE: (1, 2, 3),
+}
+
 
 class Sfp(SfpBase):
     """Platform-specific Sfp class"""
@@ -291,6 +307,8 @@ class Sfp(SfpBase):
         self._port_num = self._index + 1
         self._api_helper = APIHelper()
         self._name = sfp_name
+        self._eeprom = EepromReader(self._get_eeprom_path())
+        self._presence = None
 
         self._dom_capability_detect()
         self._eeprom_path = self._get_eeprom_path()
@@ -338,39 +356,10 @@ class Sfp(SfpBase):
             return 'N/A'
 
     def _read_eeprom_specific_bytes(self, offset, num_bytes):
-        sysfs_sfp_i2c_client_eeprom_path = self._get_eeprom_path()
-        eeprom_raw = []
-        try:
-            eeprom = open(
-                sysfs_sfp_i2c_client_eeprom_path,
-                mode="rb", buffering=0)
-        except IOError:
+        raw = self._eeprom.read(offset, num_bytes)
+        if raw is None:
             return None
-
-        for i in range(0, num_bytes):
-            eeprom_raw.append("0x00")
-
-        try:
-            eeprom.seek(offset)
-            raw = eeprom.read(num_bytes)
-        except IOError:
-            eeprom.close()
-            return None
-
-        try:
-            if isinstance(raw, str):
-                for n in range(0, num_bytes):
-                    eeprom_raw[n] = hex(ord(raw[n]))[2:].zfill(2)
-            else:
-                for n in range(0, num_bytes):
-                    eeprom_raw[n] = hex(raw[n])[2:].zfill(2)
-
-        except BaseException:
-            eeprom.close()
-            return None
-
-        eeprom.close()
-        return eeprom_raw
+        return ['%02x' % b for b in raw]
 
     def _detect_sfp_type(self):
         sfp_type = QSFP_TYPE
@@ -388,6 +377,7 @@ class Sfp(SfpBase):
                 self.sfp_type = sfp_type
         else:
             self.sfp_type = sfp_type
+        self._eeprom.set_static_pages(SFP_STATIC_EEPROM_PAGES.get(self.sfp_type, ()))
 
     def _get_eeprom_path(self):
         port_to_i2c_mapping = SFP_I2C_START + self._index
@@ -929,55 +919,30 @@ class Sfp(SfpBase):
             if not self.dom_supported:
                 return transceiver_dom_info_dict
 
-            offset = 0
-            sfpd_obj = sff8436Dom()
-            if sfpd_obj is None:
-                return transceiver_dom_info_dict
-
-            dom_data_raw = self._read_eeprom_specific_bytes(
-                (offset + QSFP_DOM_BULK_DATA_START), QSFP_DOM_BULK_DATA_SIZE)
-            if dom_data_raw is None:
+            # All DOM values are read at once and parsed from the buffer
+            dom_data = self._eeprom.read(QSFP_DOM_BULK_DATA_START, QSFP_DOM_BULK_DATA_SIZE)
+            if dom_data is None:
                 return transceiver_dom_info_dict
 
             if self.dom_temp_supported:
-                start = QSFP_TEMPE_OFFSET - QSFP_DOM_BULK_DATA_START
-                end = start + QSFP_TEMPE_WIDTH
-                dom_temperature_data = sfpd_obj.parse_temperature(
-                    dom_data_raw[start: end], 0)
-                temp = dom_temperature_data['data']['Temperature']['value']
-                if temp is not None:
-                    transceiver_dom_info_dict['temperature'] = temp
+                transceiver_dom_info_dict['temperature'] = parse_dom_temperature(
+                    dom_data, QSFP_TEMPE_OFFSET - QSFP_DOM_BULK_DATA_START)
 
             if self.dom_volt_supported:
-                start = QSFP_VOLT_OFFSET - QSFP_DOM_BULK_DATA_START
-                end = start + QSFP_VOLT_WIDTH
-                dom_voltage_data = sfpd_obj.parse_voltage(
-                    dom_data_raw[start: end], 0)
-                volt = dom_voltage_data['data']['Vcc']['value']
-                if volt is not None:
-                    transceiver_dom_info_dict['voltage'] = volt
+                transceiver_dom_info_dict['voltage'] = parse_dom_voltage(
+                    dom_data, QSFP_VOLT_OFFSET - QSFP_DOM_BULK_DATA_START)
 
-            start = QSFP_CHANNL_MON_OFFSET - QSFP_DOM_BULK_DATA_START
-            end = start + QSFP_CHANNL_MON_WITH_TX_POWER_WIDTH
-            dom_channel_monitor_data = sfpd_obj.parse_channel_monitor_params_with_tx_power(
-                dom_data_raw[start: end], 0)
-
-            if self.dom_tx_power_supported:
-                transceiver_dom_info_dict['tx1power'] = dom_channel_monitor_data['data']['TX1Power']['value']
-                transceiver_dom_info_dict['tx2power'] = dom_channel_monitor_data['data']['TX2Power']['value']
-                transceiver_dom_info_dict['tx3power'] = dom_channel_monitor_data['data']['TX3Power']['value']
-                transceiver_dom_info_dict['tx4power'] = dom_channel_monitor_data['data']['TX4Power']['value']
+            for lane in range(4):
+                if self.dom_tx_power_supported:
+                    transceiver_dom_info_dict['tx{}power'.format(lane + 1)] = parse_dom_power(
+                        dom_data, QSFP_CHANNL_TX_POWER_OFFSET - QSFP_DOM_BULK_DATA_START + lane * 2)
 
-            if self.dom_rx_power_supported:
-                transceiver_dom_info_dict['rx1power'] = dom_channel_monitor_data['data']['RX1Power']['value']
-                transceiver_dom_info_dict['rx2power'] = dom_channel_monitor_data['data']['RX2Power']['value']
-                transceiver_dom_info_dict['rx3power'] = dom_channel_monitor_data['data']['RX3Power']['value']
-                transceiver_dom_info_dict['rx4power'] = dom_channel_monitor_data['data']['RX4Power']['value']
+                if self.dom_rx_power_supported:
+                    transceiver_dom_info_dict['rx{}power'.format(lane + 1)] = parse_dom_power(
+                        dom_data, QSFP_CHANNL_RX_POWER_OFFSET - QSFP_DOM_BULK_DATA_START + lane * 2)
 
-            transceiver_dom_info_dict['tx1bias'] = dom_channel_monitor_data['data']['TX1Bias']['value']
-            transceiver_dom_info_dict['tx2bias'] = dom_channel_monitor_data['data']['TX2Bias']['value']
-            transceiver_dom_info_dict['tx3bias'] = dom_channel_monitor_data['data']['TX3Bias']['value']
-            transceiver_dom_info_dict['tx4bias'] = dom_channel_monitor_data['data']['TX4Bias']['value']
+                transceiver_dom_info_dict['tx{}bias'.format(lane + 1)] = parse_dom_bias(
+                    dom_data, QSFP_CHANNL_TX_BIAS_OFFSET - QSFP_DOM_BULK_DATA_START + lane * 2)
 
         elif self.sfp_type == QSFP_DD_TYPE:
 
@@ -986,28 +951,18 @@ class Sfp(SfpBase):
             if sfpd_obj is None:
                 return transceiver_dom_info_dict
 
-            dom_data_raw = self._read_eeprom_specific_bytes(
+            dom_data = self._eeprom.read(
                 (offset + QSFP_DD_DOM_BULK_DATA_START), QSFP_DD_DOM_BULK_DATA_SIZE)
-            if dom_data_raw is None:
+            if dom_data is None:
                 return transceiver_dom_info_dict
 
             if self.dom_temp_supported:
-                start = QSFP_DD_TEMPE_OFFSET - QSFP_DD_DOM_BULK_DATA_START
-                end = start + QSFP_DD_TEMPE_WIDTH
-                dom_temperature_data = sfpd_obj.parse_temperature(
-                    dom_data_raw[start: end], 0)
-                temp = dom_temperature_data['data']['Temperature']['value']
-                if temp is not None:
-                    transceiver_dom_info_dict['temperature'] = temp
+                transceiver_dom_info_dict['temperature'] = parse_dom_temperature(
+                    dom_data, QSFP_DD_TEMPE_OFFSET - QSFP_DD_DOM_BULK_DATA_START)
 
             if self.dom_volt_supported:
-                start = QSFP_DD_VOLT_OFFSET - QSFP_DD_DOM_BULK_DATA_START
-                end = start + QSFP_DD_VOLT_WIDTH
-                dom_voltage_data = sfpd_obj.parse_voltage(
-                    dom_data_raw[start: end], 0)
-                volt = dom_voltage_data['data']['Vcc']['value']
-                if volt is not None:
-                    transceiver_dom_info_dict['voltage'] = volt
+                transceiver_dom_info_dict['voltage'] = parse_dom_voltage(
+                    dom_data, QSFP_DD_VOLT_OFFSET - QSFP_DD_DOM_BULK_DATA_START)
 
             if self.dom_rx_tx_power_bias_supported:
                 # page 11h
@@ -1079,34 +1034,51 @@ class Sfp(SfpBase):
                 return transceiver_dom_info_dict
 
             offset = 256
-            sfpd_obj = sff8472Dom()
-            if sfpd_obj is None:
-                return transceiver_dom_info_dict
-            sfpd_obj._calibration_type = self.calibration
+            if self.calibration == 1:
+                # Internally calibrated values are parsed from the buffer directly
+                dom_data = self._eeprom.read(
+                    (offset + SFP_DOM_BULK_DATA_START), SFP_DOM_BULK_DATA_SIZE)
+                if dom_data is None:
+                    return transceiver_dom_info_dict
+                transceiver_dom_info_dict['temperature'] = parse_dom_temperature(
+                    dom_data, SFP_TEMPE_OFFSET - SFP_DOM_BULK_DATA_START)
+                transceiver_dom_info_dict['voltage'] = parse_dom_voltage(
+                    dom_data, SFP_VOLT_OFFSET - SFP_DOM_BULK_DATA_START)
+                transceiver_dom_info_dict['rx1power'] = parse_dom_power(
+                    dom_data, SFP_RX_POWER_OFFSET - SFP_DOM_BULK_DATA_START)
+                transceiver_dom_info_dict['tx1bias'] = parse_dom_bias(
+                    dom_data, SFP_TX_BIAS_OFFSET - SFP_DOM_BULK_DATA_START)
+                transceiver_dom_info_dict['tx1power'] = parse_dom_power(
+                    dom_data, SFP_TX_POWER_OFFSET - SFP_DOM_BULK_DATA_START)
+            else:
+                sfpd_obj = sff8472Dom()
+                if sfpd_obj is None:
+                    return transceiver_dom_info_dict
+                sfpd_obj._calibration_type = self.calibration
 
-            dom_data_raw = self._read_eeprom_specific_bytes(
-                (offset + SFP_DOM_BULK_DATA_START), SFP_DOM_BULK_DATA_SIZE)
+                dom_data_raw = self._read_eeprom_specific_bytes(
+                    (offset + SFP_DOM_BULK_DATA_START), SFP_DOM_BULK_DATA_SIZE)
 
-            start = SFP_TEMPE_OFFSET - SFP_DOM_BULK_DATA_START
-            end = start + SFP_TEMPE_WIDTH
-            dom_temperature_data = sfpd_obj.parse_temperature(
-                dom_data_raw[start: end], 0)
+                start = SFP_TEMPE_OFFSET - SFP_DOM_BULK_DATA_START
+                end = start + SFP_TEMPE_WIDTH
+                dom_temperature_data = sfpd_obj.parse_temperature(
+                    dom_data_raw[start: end], 0)
 
-            start = SFP_VOLT_OFFSET - SFP_DOM_BULK_DATA_START
-            end = start + SFP_VOLT_WIDTH
-            dom_voltage_data = sfpd_obj.parse_voltage(
-                dom_data_raw[start: end], 0)
+                start = SFP_VOLT_OFFSET - SFP_DOM_BULK_DATA_START
+                end = start + SFP_VOLT_WIDTH
+                dom_voltage_data = sfpd_obj.parse_voltage(
+                    dom_data_raw[start: end], 0)
 
-            start = SFP_CHANNL_MON_OFFSET - SFP_DOM_BULK_DATA_START
-            end = start + SFP_CHANNL_MON_WIDTH
-            dom_channel_monitor_data = sfpd_obj.parse_channel_monitor_params(
-                dom_data_raw[start: end], 0)
+                start = SFP_CHANNL_MON_OFFSET - SFP_DOM_BULK_DATA_START
+                end = start + SFP_CHANNL_MON_WIDTH
+                dom_channel_monitor_data = sfpd_obj.parse_channel_monitor_params(
+                    dom_data_raw[start: end], 0)
 
-            transceiver_dom_info_dict['temperature'] = dom_temperature_data['data']['Temperature']['value']
-            transceiver_dom_info_dict['voltage'] = dom_voltage_data['data']['Vcc']['value']
-            transceiver_dom_info_dict['rx1power'] = dom_channel_monitor_data['data']['RXPower']['value']
-            transceiver_dom_info_dict['tx1bias'] = dom_channel_monitor_data['data']['TXBias']['value']
-            transceiver_dom_info_dict['tx1power'] = dom_channel_monitor_data['data']['TXPower']['value']
+                transceiver_dom_info_dict['temperature'] = dom_temperature_data['data']['Temperature']['value']
+                transceiver_dom_info_dict['voltage'] = dom_voltage_data['data']['Vcc']['value']
+                transceiver_dom_info_dict['rx1power'] = dom_channel_monitor_data['data']['RXPower']['value']
+                transceiver_dom_info_dict['tx1bias'] = dom_channel_monitor_data['data']['TXBias']['value']
+                transceiver_dom_info_dict['tx1power'] = dom_channel_monitor_data['data']['TXPower']['value']
 
         transceiver_dom_info_dict['lp_mode'] = self.get_lpmode()
         transceiver_dom_info_dict['reset_status'] = self.get_reset_status()
@@ -1505,33 +1477,22 @@ class Sfp(SfpBase):
             # SFP doesn't support this feature
             return False
         else:
-            try:
-                eeprom = None
-    
-                if not self.get_presence():
-                    return False
-                # Write to eeprom
-                port_to_i2c_mapping = SFP_I2C_START + self._index
-                port_eeprom_path = I2C_EEPROM_PATH.format(port_to_i2c_mapping)
-    
-                eeprom = open(port_eeprom_path, "rb")
-                eeprom.seek(QSFP_POWEROVERRIDE_OFFSET)
-                lpmode = ord(eeprom.read(1))
-    
-                if ((lpmode & 0x3) == 0x3):
-                    return True  # Low Power Mode if "Power override" bit is 1 and "Power set" bit is 1
-                else:
-                    # High Power Mode if one of the following conditions is matched:
-                    # 1. "Power override" bit is 0
-                    # 2. "Power override" bit is 1 and "Power set" bit is 0
-                    return False
-            except IOError as e:
-                print("Error: unable to open file: %s" % str(e))
+            if not self.get_presence():
+                return False
+
+            raw = self._eeprom.read(QSFP_POWEROVERRIDE_OFFSET, QSFP_POWEROVERRIDE_WIDTH)
+            if raw is None:
+                print("Error: unable to read {}".format(self._eeprom.path))
+                return False
+            lpmode = raw[0]
+
+            if ((lpmode & 0x3) == 0x3):
+                return True  # Low Power Mode if "Power override" bit is 1 and "Power set" bit is 1
+            else:
+                # High Power Mode if one of the following conditions is matched:
+                # 1. "Power override" bit is 0
+                # 2. "Power override" bit is 1 and "Power set" bit is 0
                 return False
-            finally:
-                if eeprom is not None:
-                    eeprom.close()
-                    time.sleep(0.01)
 
     def get_power_set(self):        
 
@@ -2172,10 +2133,11 @@ class Sfp(SfpBase):
             present_path = "{}{}{}".format(CPLD3_I2C_PATH, '/module_present_', self._port_num)
 
         val=self._api_helper.read_txt_file(present_path)
-        if val is not None:
-            return int(val, 10)==1
-        else:           
-            return False
+        presence = val is not None and int(val, 10)==1
+        if presence != self._presence:
+            self._presence = presence
+            self._eeprom.invalidate()
+        return presence
 
 
     def get_model(self):
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Measure Sfp.get_transceiver_bulk_status on an emulated sysfs tree.
+
+QSFP28 modules with DOM are emulated by EEPROM files and CPLD attribute
+files in a temporary directory, the sysfs paths of sonic_platform.sfp are
+pointed there. The bulk status of every port is read several times and the
+time per port is reported.
+
+To compare with another implementation of sfp.py, e.g. the one before a
+change, pass it with --baseline. It is loaded as a module of the
+sonic_platform package, and its bulk status has to match the current one.
+
+Usage:
+    git show HEAD~1:./sonic_platform/sfp.py > /tmp/sfp_baseline.py
+    python3 tests/sfp_benchmark.py [--baseline /tmp/sfp_baseline.py] [--cycles 100] [--repeat 3]
+"""
+
+import argparse
+import importlib.util
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from sonic_platform import sfp
+
+PORT_COUNT = 32
+EEPROM_SIZE = 640
+
+
+def build_eeprom(port):
+    eeprom = bytearray(EEPROM_SIZE)
+    eeprom[0] = 0x11                                     # QSFP28
+    eeprom[1] = 0x08                                     # SFF-8636 rev 2.5 or later
+    struct.pack_into('>h', eeprom, 22, 30 * 256 + port)  # temperature
+    struct.pack_into('>H', eeprom, 26, 33000 + port)     # voltage
+    for lane in range(4):
+        struct.pack_into('>H', eeprom, 34 + lane * 2, 5000 + lane * 100 + port)  # rx power
+        struct.pack_into('>H', eeprom, 42 + lane * 2, 3000 + lane * 10 + port)   # tx bias
+        struct.pack_into('>H', eeprom, 50 + lane * 2, 6000 + lane * 100 + port)  # tx power
+    eeprom[93] = 0x01                                    # power override, high power
+    eeprom[128] = 0x11
+    eeprom[128 + 20:128 + 36] = b'ACCTON'.ljust(16)
+    eeprom[128 + 92] = 0x3c                              # temp, voltage, rx and tx power monitored
+    eeprom[128 + 195] = 0x10                             # tx disable implemented
+    return eeprom
+
+
+def build_sysfs(root):
+    cpld2 = os.path.join(root, 'cpld2')
+    cpld3 = os.path.join(root, 'cpld3')
+    for path in (cpld2, cpld3):
+        os.makedirs(path)
+    for port in range(1, PORT_COUNT + 1):
+        cpld = cpld2 if port <= 16 else cpld3
+        for name, value in (('module_present_', '1'), ('module_reset_', '0')):
+            with open(os.path.join(cpld, name + str(port)), 'w') as f:
+                f.write(value + '\n')
+        bus_path = os.path.join(root, '{}-0050'.format(sfp.SFP_I2C_START + port - 1))
+        os.makedirs(bus_path)
+        with open(os.path.join(bus_path, 'eeprom'), 'wb') as f:
+            f.write(build_eeprom(port))
+    return cpld2 + '/', cpld3 + '/', os.path.join(root, '{0}-0050', 'eeprom')
+
+
+def load_baseline(path):
+    spec = importlib.util.spec_from_file_location('sonic_platform.sfp_baseline', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_bulk_status(module, cycles):
+    ports = [module.Sfp(index, 'QSFP') for index in range(PORT_COUNT)]
+    status = [port.get_transceiver_bulk_status() for port in ports]
+    start = time.time()
+    for _ in range(cycles):
+        for port in ports:
+            port.get_transceiver_bulk_status()
+    return time.time() - start, status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', help='sfp.py to compare with')
+    parser.add_argument('--cycles', type=int, default=100, help='number of reads of every port per run')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per implementation, the best one is reported')
+    args = parser.parse_args()
+
+    modules = [('current', sfp)]
+    if args.baseline:
+        modules.insert(0, ('baseline', load_baseline(args.baseline)))
+
+    root = tempfile.mkdtemp(prefix='sfp_benchmark_')
+    try:
+        cpld2, cpld3, eeprom_path = build_sysfs(root)
+        print('{} ports, {} cycles'.format(PORT_COUNT, args.cycles))
+        print('{:<10} {:>10} {:>12}'.format('sfp.py', 'wall (s)', 'us per port'))
+        results = {}
+        for name, module in modules:
+            module.CPLD2_I2C_PATH, module.CPLD3_I2C_PATH, module.I2C_EEPROM_PATH = cpld2, cpld3, eeprom_path
+            runs = []
+            for _ in range(args.repeat):
+                wall, results[name] = run_bulk_status(module, args.cycles)
+                runs.append(wall)
+            wall = min(runs)
+            print('{:<10} {:>10.3f} {:>12.1f}'.format(name, wall, wall * 1e6 / (args.cycles * PORT_COUNT)))
+        if args.baseline and results['baseline'] != results['current']:
+            for index, (old, new) in enumerate(zip(results['baseline'], results['current'])):
+                diff = {key: (old.get(key), new.get(key)) for key in set(old) | set(new) if old.get(key) != new.get(key)}
+                if diff:
+                    print('port {} differs: {}'.format(index + 1, diff))
+            sys.exit(1)
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
@@ -29,6 +29,7 @@ try:
     import os
     import threading
     import time
+    from collections import OrderedDict
     from sonic_py_common.logger import Logger
     from sonic_py_common.general import check_output_pipe
     from . import utils
@@ -175,6 +176,8 @@ SFP_UPPER_PAGE_OFFSET = 128  # page size of other pages
 # SFP sysfs path constants
 SFP_PAGE0_PATH = '0/i2c-0x50/data'
 SFP_A2H_PAGE0_PATH = '0/i2c-0x51/data'
+SFP_PAGE_CACHE_TTL = 2       # seconds a range read by SFP.read_dom_snapshot serves EEPROM reads
+SFP_MAX_OPEN_PAGES = 8       # EEPROM page files kept open per module, least recently read ones are closed
 SFP_SDK_MODULE_SYSFS_ROOT_TEMPLATE = '/sys/module/sx_core/asic0/module{}/'
 SFP_EEPROM_ROOT_TEMPLATE = SFP_SDK_MODULE_SYSFS_ROOT_TEMPLATE + 'eeprom/pages'
 SFP_SYSFS_STATUS = 'status'
@@ -194,6 +197,25 @@ SFP_TYPE_CMIS = 'cmis'
 SFP_TYPE_SFF8472 = 'sff8472'
 SFP_TYPE_SFF8636 = 'sff8636'
 
+# EEPROM ranges holding DOM values and thresholds, read at once by SFP.read_dom_snapshot.
+# Each range is (page number, start offset, end offset) in the page file. Ranges must not hold
+# latched flags, which are cleared when they are read, e.g. CMIS lower page bytes 8-13 and
+# page 11h bytes 134-153, SFF-8636 bytes 3-21
+SFP_DOM_SNAPSHOT_RANGES = {
+    SFP_TYPE_CMIS: (
+        (0, 14, 26),        # module monitors
+        (0x2, 0, 128),      # module and lane thresholds
+        (0x11, 26, 74),     # lane monitors, bytes 154-201
+    ),
+    SFP_TYPE_SFF8636: (
+        (0, 22, 82),        # module and channel monitors
+        (0x3, 0, 72),       # module and channel thresholds, bytes 128-199
+    ),
+    SFP_TYPE_SFF8472: (
+        (-1, 0, 106),       # thresholds, calibration constants and monitors
+    ),
+}
+
 # SFP stderr
 SFP_EEPROM_NOT_AVAILABLE = 'Input/output error'
 
@@ -464,6 +486,13 @@ class SFP(NvidiaSFPCommon):
         self._sfp_type_str = None
         # SFP state, only applicable for module host management
         self.state = STATE_DOWN
+        # EEPROM page path ==> (fd, page size), in order of last read, kept open until module changes,
+        # a read of the page fails, or SFP_MAX_OPEN_PAGES other pages are read after it
+        self._page_fds = OrderedDict()
+        # EEPROM page path ==> (expire time, page size, {start offset: content}), filled by read_dom_snapshot
+        self._page_cache = {}
+        self._page_lock = threading.Lock()
+        self._eeprom_presence = None
 
     def __str__(self):
         return f'SFP {self.sdk_index}'
@@ -483,8 +512,12 @@ class SFP(NvidiaSFPCommon):
         Returns:
             bool: True if device is present, False if not
         """
-        eeprom_raw = self._read_eeprom(0, 1, log_on_error=False)
-        return eeprom_raw is not None
+        eeprom_raw = self._read_eeprom(0, 1, log_on_error=False, use_cache=False)
+        presence = eeprom_raw is not None
+        if presence != self._eeprom_presence:
+            self.invalidate_eeprom_cache()
+            self._eeprom_presence = presence
+        return presence
 
     # read eeprom specfic bytes beginning from offset with size as num_bytes
     def read_eeprom(self, offset, num_bytes):
@@ -496,13 +529,14 @@ class SFP(NvidiaSFPCommon):
         """
         return self._read_eeprom(offset, num_bytes)
 
-    def _read_eeprom(self, offset, num_bytes, log_on_error=True):
+    def _read_eeprom(self, offset, num_bytes, log_on_error=True, use_cache=True):
         """Read eeprom specfic bytes beginning from a random offset with size as num_bytes
 
         Args:
             offset (int): read offset
             num_bytes (int): read size
             log_on_error (bool, optional): whether log error when exception occurs. Defaults to True.
+            use_cache (bool, optional): whether ranges cached by read_dom_snapshot can be used. Defaults to True.
 
         Returns:
             bytearray: the content of EEPROM
@@ -514,33 +548,154 @@ class SFP(NvidiaSFPCommon):
                 return None
 
             try:
-                with open(page, mode='rb', buffering=0) as f:
-                    f.seek(page_offset)
-                    content = f.read(num_bytes)
-                    if not result:
-                        result = content
+                with self._page_lock:
+                    content, page_size = self._read_page(page, page_offset, num_bytes, use_cache)
+                result += content
+                read_length = len(content)
+                num_bytes -= read_length
+                if num_bytes > 0:
+                    if page_offset + read_length == page_size:
+                        offset += read_length
                     else:
-                        result += content
-                    read_length = len(content)
-                    num_bytes -= read_length
-                    if num_bytes > 0:
-                        page_size = f.seek(0, os.SEEK_END)
-                        if page_offset + read_length == page_size:
-                            offset += read_length
-                        else:
-                            # Indicate read finished
-                            num_bytes = 0
-                    if ctypes.get_errno() != 0:
-                        raise IOError(f'errno = {os.strerror(ctypes.get_errno())}')
-                    logger.log_debug(f'read EEPROM sfp={self.sdk_index}, page={page}, page_offset={page_offset}, '\
-                        f'size={read_length}, data={content}')
+                        # Indicate read finished
+                        num_bytes = 0
+                logger.log_debug(f'read EEPROM sfp={self.sdk_index}, page={page}, page_offset={page_offset}, '\
+                    f'size={read_length}, data={content}')
             except (OSError, IOError) as e:
+                # reopen the page on next read, replacing the module is detected by get_presence
+                with self._page_lock:
+                    self._close_page(page)
                 if log_on_error:
                     logger.log_warning(f'Failed to read sfp={self.sdk_index} EEPROM page={page}, page_offset={page_offset}, '\
                         f'size={num_bytes}, offset={offset}, error = {e}')
                 return None
 
-        return bytearray(result)
+        return result
+
+    def _read_page(self, page, page_offset, num_bytes, use_cache):
+        """Read from an EEPROM page, from a cached range holding the requested bytes if it has not expired.
+        Page files are opened once and kept open, up to SFP_MAX_OPEN_PAGES of them, must be called with _page_lock held.
+
+        Args:
+            page (str): EEPROM page path
+            page_offset (int): read offset in page
+            num_bytes (int): read size
+            use_cache (bool): whether cached content can be used
+
+        Returns:
+            tuple: (<content>, <page_size>)
+        """
+        cached = self._page_cache.get(page)
+        if cached is not None and time.monotonic() >= cached[0]:
+            del self._page_cache[page]
+        elif cached is not None and use_cache:
+            _, page_size, ranges = cached
+            for start, content in ranges.items():
+                if start <= page_offset and page_offset + num_bytes <= start + len(content):
+                    return content[page_offset - start:page_offset - start + num_bytes], page_size
+        if page in self._page_fds:
+            self._page_fds.move_to_end(page)
+        else:
+            fd = os.open(page, os.O_RDONLY)
+            try:
+                page_size = os.lseek(fd, 0, os.SEEK_END)
+            except OSError:
+                os.close(fd)
+                raise
+            self._page_fds[page] = (fd, page_size)
+            while len(self._page_fds) > SFP_MAX_OPEN_PAGES:
+                _, (lru_fd, _) = self._page_fds.popitem(last=False)
+                self._close_fd(lru_fd)
+        fd, page_size = self._page_fds[page]
+        return os.pread(fd, num_bytes, page_offset), page_size
+
+    def _close_page(self, page):
+        """Close an EEPROM page file and drop its cached ranges, must be called with _page_lock held.
+
+        Args:
+            page (str): EEPROM page path
+        """
+        self._page_cache.pop(page, None)
+        fd_info = self._page_fds.pop(page, None)
+        if fd_info is not None:
+            self._close_fd(fd_info[0])
+
+    @staticmethod
+    def _close_fd(fd):
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+    def invalidate_eeprom_cache(self):
+        """Drop cached EEPROM pages and close page files, called when the module changes
+        """
+        with self._page_lock:
+            for fd, _ in self._page_fds.values():
+                self._close_fd(fd)
+            self._page_fds = OrderedDict()
+            self._page_cache = {}
+
+    def read_dom_snapshot(self):
+        """Read EEPROM ranges holding DOM values and thresholds, one read per range. EEPROM reads
+        within these ranges, i.e. DOM, threshold and temperature getters, are served from the snapshot
+        until it expires after SFP_PAGE_CACHE_TTL seconds. Flags and other bytes are always read from
+        the module. Ranges which are already in the snapshot are not read again, pages the module does
+        not support are skipped.
+
+        Returns:
+            bool: True if at least one range is read
+        """
+        eeprom_path = self._get_eeprom_path()
+        ranges = SFP_DOM_SNAPSHOT_RANGES.get(self._get_sfp_type_str(eeprom_path))
+        if not ranges:
+            return False
+
+        read_count = 0
+        now = time.monotonic()
+        with self._page_lock:
+            for page_num, start, end in ranges:
+                page = os.path.join(eeprom_path, self._get_page_path(page_num))
+                cached = self._page_cache.get(page)
+                if cached is not None and now < cached[0]:
+                    if start in cached[2]:
+                        read_count += 1
+                        continue
+                else:
+                    cached = None
+                try:
+                    content, page_size = self._read_page(page, start, end - start, False)
+                except (OSError, IOError) as e:
+                    # page is not supported by the module or module is not readable
+                    self._close_page(page)
+                    logger.log_debug(f'Failed to read sfp={self.sdk_index} EEPROM page={page} for DOM snapshot, error = {e}')
+                    continue
+                if len(content) != end - start:
+                    continue
+                if cached is None:
+                    cached = (now + SFP_PAGE_CACHE_TTL, page_size, {})
+                    self._page_cache[page] = cached
+                cached[2][start] = content
+                read_count += 1
+        return read_count > 0
+
+    def get_transceiver_bulk_status(self):
+        """Retrieves transceiver bulk status, DOM ranges are read at once
+
+        Returns:
+            dict: transceiver bulk status
+        """
+        self.read_dom_snapshot()
+        return super().get_transceiver_bulk_status()
+
+    def get_transceiver_threshold_info(self):
+        """Retrieves transceiver threshold info, DOM ranges are read at once
+
+        Returns:
+            dict: transceiver threshold info
+        """
+        self.read_dom_snapshot()
+        return super().get_transceiver_threshold_info()
 
     # write eeprom specfic bytes beginning from offset with size as num_bytes
     def write_eeprom(self, offset, num_bytes, write_buffer):
@@ -578,6 +733,8 @@ class SFP(NvidiaSFPCommon):
                         else:
                             raise IOError(f'write return code = {ret}')
                     num_bytes -= ret
+                    with self._page_lock:
+                        self._page_cache.pop(page, None)
                     if ctypes.get_errno() != 0:
                         raise IOError(f'errno = {os.strerror(ctypes.get_errno())}')
                     logger.log_debug(f'write EEPROM sfp={self.sdk_index}, page={page}, page_offset={page_offset}, '\
@@ -953,9 +1110,24 @@ class SFP(NvidiaSFPCommon):
             page1h_start = SFP_PAGE_SIZE
 
         page_num = (overall_offset - page1h_start) // SFP_UPPER_PAGE_OFFSET + 1
-        page = f'{page_num}/data'
         offset = (overall_offset - page1h_start) % SFP_UPPER_PAGE_OFFSET
-        return page_num, os.path.join(eeprom_path, page), offset
+        return page_num, os.path.join(eeprom_path, self._get_page_path(page_num)), offset
+
+    @staticmethod
+    def _get_page_path(page_num):
+        """Get EEPROM page path relative to EEPROM root
+
+        Args:
+            page_num (int): page number, -1 for A2h page of SFF-8472
+
+        Returns:
+            str: page path
+        """
+        if page_num == 0:
+            return SFP_PAGE0_PATH
+        if page_num == -1:
+            return SFP_A2H_PAGE0_PATH
+        return f'{page_num}/data'
 
     def _get_sfp_type_str(self, eeprom_path):
         """Get SFP type by reading first byte of EEPROM
@@ -1531,6 +1703,8 @@ class SFP(NvidiaSFPCommon):
         Args:
             new_state (str): new state
         """
+        if new_state != self.state:
+            self.invalidate_eeprom_cache()
         self.state = new_state
 
     def on_action(self, action_name):
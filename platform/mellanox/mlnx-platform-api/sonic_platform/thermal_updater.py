@@ -18,6 +18,7 @@
 from . import utils
 from sonic_py_common import logger
 
+import concurrent.futures
 import sys
 import time
 
@@ -43,6 +44,12 @@ ASIC_DEFAULT_TEMP_CRITICAL_THRESHOLD = 120000
 
 ERROR_READ_THERMAL_DATA = 254000
 
+MODULE_UPDATE_MAX_WORKERS = 8
+MODULE_UPDATE_DEADLINE = 1              # seconds a module update may take from the start of its read, checked each cycle
+MODULE_NOT_STARTED_FAULT_CYCLES = 3     # polling cycles a module update may wait for a worker
+MODULE_FAILURE_BACKOFF_THRESHOLD = 3    # consecutive failed updates before a module is polled less often
+MODULE_MAX_BACKOFF_CYCLES = 16
+
 TC_CONFIG_FILE = '/run/hw-management/config/tc_config.json'
 logger = logger.Logger('thermal-updater')
 
@@ -52,6 +59,29 @@ class ThermalUpdater:
         self._sfp_list = sfp_list
         self._sfp_status = {}
         self._timer = utils.Timer()
+        # sdk_index ==> (warning threshold, critical threshold), kept until module presence changes
+        self._sfp_thresholds = {}
+        self._executor = None
+        # sdk_index ==> future of module update which is not collected yet
+        self._module_futures = {}
+        # sdk_index ==> time the running module update started
+        self._module_started = {}
+        # sdk_index of modules whose running update passed its deadline
+        self._module_timed_out = set()
+        # sdk_index ==> number of polling cycles the module update has not started for
+        self._module_not_started = {}
+        # sdk_index ==> number of consecutive failed module updates
+        self._module_failures = {}
+        # sdk_index ==> number of polling cycles the module is skipped for
+        self._module_backoff = {}
+        self.module_update_stats = {
+            'cycles': 0,
+            'last_cycle_ms': 0,
+            'max_cycle_ms': 0,
+            'timeouts': 0,
+            'skipped': 0,
+            'not_started': 0
+        }
 
     def load_tc_config(self):
         asic_poll_interval = 1
@@ -87,6 +117,9 @@ class ThermalUpdater:
 
     def stop(self):
         self._timer.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         self.control_tc(True)
 
     def control_tc(self, suspend):
@@ -115,9 +148,17 @@ class ThermalUpdater:
         return critical * ASIC_TEMPERATURE_SCALE if  critical is not None else ASIC_DEFAULT_TEMP_CRITICAL_THRESHOLD
 
     def update_single_module(self, sfp):
+        """Update thermal data of a module
+
+        Returns:
+            bool: False if module thermal data could not be read
+        """
+        fault = 0
         try:
             presence = sfp.get_presence()
             pre_presence = self._sfp_status.get(sfp.sdk_index)
+            if pre_presence != presence:
+                self._sfp_thresholds.pop(sfp.sdk_index, None)
             if presence:
                 temperature = sfp.get_temperature()
                 if temperature == 0:
@@ -125,8 +166,17 @@ class ThermalUpdater:
                     critical_thresh = 0
                     fault = 0
                 else:
-                    warning_thresh = sfp.get_temperature_warning_threshold()
-                    critical_thresh = sfp.get_temperature_critical_threshold()
+                    thresholds = self._sfp_thresholds.get(sfp.sdk_index)
+                    if thresholds is None:
+                        # thresholds are served from DOM pages read at once instead of field by field
+                        sfp.read_dom_snapshot()
+                        warning_thresh = sfp.get_temperature_warning_threshold()
+                        critical_thresh = sfp.get_temperature_critical_threshold()
+                        if warning_thresh and critical_thresh:
+                            # thresholds are static, no need to read them again until module is replaced
+                            self._sfp_thresholds[sfp.sdk_index] = (warning_thresh, critical_thresh)
+                    else:
+                        warning_thresh, critical_thresh = thresholds
                     fault = ERROR_READ_THERMAL_DATA if (temperature is None or warning_thresh is None or critical_thresh is None) else 0
                     temperature = 0 if temperature is None else temperature * SFP_TEMPERATURE_SCALE
                     warning_thresh = 0 if warning_thresh is None else warning_thresh * SFP_TEMPERATURE_SCALE
@@ -148,18 +198,116 @@ class ThermalUpdater:
                 self._sfp_status[sfp.sdk_index] = presence
         except Exception as e:
             logger.log_error(f'Failed to update module {sfp.sdk_index} thermal data - {e}')
-            hw_management_independent_mode_update.thermal_data_set_module(
-                0, # ASIC index always 0 for now
-                sfp.sdk_index + 1,
-                0,
-                0,
-                0,
-                ERROR_READ_THERMAL_DATA
-            )
+            self.set_module_fault(sfp)
+            return False
+        return fault == 0
+
+    def set_module_fault(self, sfp):
+        hw_management_independent_mode_update.thermal_data_set_module(
+            0, # ASIC index always 0 for now
+            sfp.sdk_index + 1,
+            0,
+            0,
+            0,
+            ERROR_READ_THERMAL_DATA
+        )
 
     def update_module(self):
+        """Update thermal data of all modules concurrently, without waiting for the updates. Updates
+        started by earlier polling cycles are collected at the start of each cycle. A module whose update
+        is still running MODULE_UPDATE_DEADLINE seconds after the start of its read, or has not started
+        for MODULE_NOT_STARTED_FAULT_CYCLES cycles, is reported as fault. A module is not updated again
+        until its last update finishes. Modules failing repeatedly are skipped for an increasing number
+        of cycles.
+        """
+        start = time.monotonic()
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=MODULE_UPDATE_MAX_WORKERS,
+                                                                   thread_name_prefix='module-thermal')
+        updated = self.collect_module_updates()
+        submitted = 0
+        skipped = 0
+        for sfp in self._sfp_list:
+            if self.skip_module(sfp, start):
+                skipped += 1
+                continue
+            self._module_futures[sfp.sdk_index] = self._executor.submit(self.run_module_update, sfp)
+            submitted += 1
+
+        cycle_ms = int((time.monotonic() - start) * 1000)
+        self.module_update_stats['cycles'] += 1
+        self.module_update_stats['last_cycle_ms'] = cycle_ms
+        self.module_update_stats['max_cycle_ms'] = max(self.module_update_stats['max_cycle_ms'], cycle_ms)
+        self.module_update_stats['skipped'] += skipped
+        logger.log_debug(f'Module thermal data update cycle in {cycle_ms} ms, {updated} updated, '
+                         f'{submitted} submitted, {skipped} skipped')
+
+    def collect_module_updates(self):
+        """Collect results of module updates which have finished since last polling cycle
+
+        Returns:
+            int: number of collected updates
+        """
+        updated = 0
         for sfp in self._sfp_list:
-            self.update_single_module(sfp)
+            future = self._module_futures.get(sfp.sdk_index)
+            if future is None or not future.done():
+                continue
+            del self._module_futures[sfp.sdk_index]
+            self._module_not_started.pop(sfp.sdk_index, None)
+            if sfp.sdk_index in self._module_timed_out:
+                # already counted as failure when it passed its deadline
+                self._module_timed_out.discard(sfp.sdk_index)
+                continue
+            self.on_module_updated(sfp, future.result())
+            updated += 1
+        return updated
+
+    def run_module_update(self, sfp):
+        self._module_started[sfp.sdk_index] = time.monotonic()
+        try:
+            return self.update_single_module(sfp)
+        finally:
+            self._module_started.pop(sfp.sdk_index, None)
+
+    def skip_module(self, sfp, now):
+        if sfp.sdk_index in self._module_futures:
+            # update of an earlier cycle is not finished yet
+            started = self._module_started.get(sfp.sdk_index)
+            if started is not None:
+                if now - started >= MODULE_UPDATE_DEADLINE and sfp.sdk_index not in self._module_timed_out:
+                    logger.log_warning(f'Module {sfp.sdk_index} thermal data is not updated in {MODULE_UPDATE_DEADLINE} seconds')
+                    self._module_timed_out.add(sfp.sdk_index)
+                    self.set_module_fault(sfp)
+                    self.on_module_updated(sfp, False)
+                    self.module_update_stats['timeouts'] += 1
+            elif not self._module_futures[sfp.sdk_index].done():
+                # all workers are busy with other modules
+                cycles = self._module_not_started.get(sfp.sdk_index, 0) + 1
+                self._module_not_started[sfp.sdk_index] = cycles
+                self.module_update_stats['not_started'] += 1
+                if cycles == MODULE_NOT_STARTED_FAULT_CYCLES:
+                    logger.log_warning(f'Module {sfp.sdk_index} thermal data update is not started in {cycles} cycles')
+                    self.set_module_fault(sfp)
+                    self.on_module_updated(sfp, False)
+            return True
+        backoff = self._module_backoff.get(sfp.sdk_index, 0)
+        if backoff > 0:
+            self._module_backoff[sfp.sdk_index] = backoff - 1
+            return True
+        return False
+
+    def on_module_updated(self, sfp, success):
+        if success:
+            self._module_failures.pop(sfp.sdk_index, None)
+            return
+        failures = self._module_failures.get(sfp.sdk_index, 0) + 1
+        self._module_failures[sfp.sdk_index] = failures
+        if failures >= MODULE_FAILURE_BACKOFF_THRESHOLD:
+            backoff = min(2 ** (failures - MODULE_FAILURE_BACKOFF_THRESHOLD), MODULE_MAX_BACKOFF_CYCLES)
+            self._module_backoff[sfp.sdk_index] = backoff
+            logger.log_notice(f'Module {sfp.sdk_index} thermal data failed to update {failures} times, '
+                              f'skip it for {backoff} cycles')
 
     def update_asic(self):
         try:
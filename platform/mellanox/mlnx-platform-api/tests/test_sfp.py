@@ -18,7 +18,9 @@ import ctypes
 import os
 import pytest
 import shutil
+import struct
 import sys
+import time
 if sys.version_info.major == 3:
     from unittest import mock
 else:
@@ -145,29 +147,132 @@ class TestSfp:
         mock_get_page.return_value = (None, None, None)
         assert sfp.read_eeprom(0, 1) is None
 
-        mock_get_page.return_value = (0, '/tmp/mock_page', 0)
-        mo = mock.mock_open()
-        with mock.patch('sonic_platform.sfp.open', mo):
-            handle = mo()
-            assert sfp.read_eeprom(0, 0) == bytearray(0)
-
-            handle.read.return_value = b'\x00'
+        mock_dir = '/tmp/mock_eeprom_pages'
+        os.makedirs(mock_dir, exist_ok=True)
+        for page_num in range(3):
+            with open(os.path.join(mock_dir, str(page_num)), 'wb') as f:
+                f.write(bytes([page_num]) * 128)
+
+        page = os.path.join(mock_dir, '0')
+        mock_get_page.return_value = (0, page, 0)
+        assert sfp.read_eeprom(0, 0) == bytearray(0)
+        assert sfp.read_eeprom(0, 1) == bytearray([0])
+        # page file is kept open
+        with mock.patch('os.open') as mock_os_open:
             assert sfp.read_eeprom(0, 1) == bytearray([0])
-            handle.seek.assert_called_once_with(0)
+            mock_os_open.assert_not_called()
 
-            ctypes.set_errno(1)
-            assert sfp.read_eeprom(0, 1) is None
-            ctypes.set_errno(0)
+        mock_get_page.side_effect = [(page_num, os.path.join(mock_dir, str(page_num)), 0) for page_num in range(3)]
+        assert sfp.read_eeprom(0, 320) == bytearray([0]*128 + [1]*128 + [2]*64)
+        mock_get_page.side_effect = None
 
-            handle.read.side_effect = OSError('')
+        # only the page file failed to read is closed, and it is opened again by next read
+        with mock.patch('os.pread', mock.MagicMock(side_effect=OSError(''))):
             assert sfp.read_eeprom(0, 1) is None
+        assert list(sfp._page_fds) == [os.path.join(mock_dir, '1'), os.path.join(mock_dir, '2')]
+        assert sfp.read_eeprom(0, 1) == bytearray([0])
+
+        # least recently read page files are closed
+        sfp.invalidate_eeprom_cache()
+        pages = [os.path.join(mock_dir, str(page_num)) for page_num in range(3)]
+        with mock.patch('sonic_platform.sfp.SFP_MAX_OPEN_PAGES', 2):
+            for page_num in (0, 1, 0):
+                mock_get_page.return_value = (page_num, pages[page_num], 0)
+                assert sfp.read_eeprom(0, 1) == bytearray([page_num])
+            page1_fd = sfp._page_fds[pages[1]][0]
+            with mock.patch('os.close') as mock_os_close:
+                mock_get_page.return_value = (2, pages[2], 0)
+                assert sfp.read_eeprom(0, 1) == bytearray([2])
+                mock_os_close.assert_called_once_with(page1_fd)
+            os.close(page1_fd)
+            assert list(sfp._page_fds) == [pages[0], pages[2]]
+
+        sfp.invalidate_eeprom_cache()
+        os.system('rm -rf {}'.format(mock_dir))
+        mock_get_page.side_effect = None
+        assert sfp.read_eeprom(0, 1) is None
 
-        mo = mock.mock_open()
-        with mock.patch('sonic_platform.sfp.open', mo):
-            handle = mo()
-            handle.read.side_effect = [b'\x00'*128, b'\x01'*128, b'\x02'*64]
-            handle.seek.side_effect = [0, 128, 0, 128, 0]
-            assert sfp.read_eeprom(0, 320) == bytearray([0]*128 + [1]*128 + [2]*64)
+    @mock.patch('sonic_platform.sfp.SFP._get_sfp_type_str', mock.MagicMock(return_value='sff8636'))
+    @mock.patch('sonic_platform.sfp.SFP._get_eeprom_path')
+    def test_read_dom_snapshot(self, mock_eeprom_path):
+        mock_eeprom_path.return_value = '/tmp/mock_eeprom_snapshot'
+        # SFF-8636 QSFP28, paged memory, temperature 35C and Vcc 3.3V, latched flags in bytes 3-21
+        page0 = bytearray(256)
+        page0[0] = page0[128] = 0x11
+        page0[3:22] = bytes(range(1, 20))
+        struct.pack_into('>hH', page0, 22, 35 * 256, 33000)
+        page0 = bytes(page0)
+        # page 03h thresholds in bytes 128-199: temperature, Vcc, reserved, Rx power, Tx bias and Tx power,
+        # each as high alarm, low alarm, high warning and low warning
+        page3 = struct.pack('>4h8x4H24x4H4H4H', 75 * 256, -5 * 256, 70 * 256, 0,
+                            36300, 29700, 34650, 31350,
+                            20000, 500, 15000, 1000,
+                            50000, 1000, 45000, 2000,
+                            20000, 500, 15000, 1000).ljust(128, b'\0')
+        for page_path, content in (('0/i2c-0x50/data', page0), ('3/data', page3)):
+            page_path = os.path.join(mock_eeprom_path.return_value, page_path)
+            os.makedirs(os.path.dirname(page_path), exist_ok=True)
+            with open(page_path, 'wb') as f:
+                f.write(content)
+
+        sfp = SFP(0)
+        assert sfp.get_presence()
+        with mock.patch('os.pread', mock.MagicMock(wraps=os.pread)) as mock_pread:
+            assert sfp.read_dom_snapshot()
+            # one read per range, monitors and thresholds
+            assert mock_pread.call_count == 2
+            mock_pread.reset_mock()
+            assert sfp.read_eeprom(22, 2) == bytearray(page0[22:24])
+            assert sfp.read_eeprom(34, 48) == bytearray(page0[34:82])
+            # page 03h bytes 128-199 as a threshold getter reads them
+            thresholds = sfp.read_eeprom(512, 72)
+            assert struct.unpack_from('>4h', thresholds, 0) == (75 * 256, -5 * 256, 70 * 256, 0)
+            assert struct.unpack_from('>4H', thresholds, 16) == (36300, 29700, 34650, 31350)
+            assert struct.unpack_from('>4H', thresholds, 64) == (20000, 500, 15000, 1000)
+            mock_pread.assert_not_called()
+
+            # latched flags are cleared on read, they are always read from the module
+            assert sfp.read_eeprom(3, 4) == bytearray(page0[3:7])
+            mock_pread.assert_called_once()
+            mock_pread.reset_mock()
+            # so is a read beyond the snapshot ranges
+            assert sfp.read_eeprom(80, 4) == bytearray(page0[80:84])
+            mock_pread.assert_called_once()
+            mock_pread.reset_mock()
+
+            # presence is always read from EEPROM
+            assert sfp.get_presence()
+            mock_pread.assert_called_once()
+            mock_pread.reset_mock()
+
+            # snapshot expires
+            with mock.patch('time.monotonic', mock.MagicMock(return_value=time.monotonic() + 10)):
+                assert sfp.read_eeprom(22, 2) == bytearray(page0[22:24])
+            mock_pread.assert_called_once()
+            mock_pread.reset_mock()
+
+            # module state change drops snapshot
+            assert sfp.read_dom_snapshot()
+            assert mock_pread.call_count == 1
+            sfp.change_state('Not Present')
+            assert not sfp._page_cache
+            assert not sfp._page_fds
+
+        os.system('rm -rf {}'.format(mock_eeprom_path.return_value))
+        assert not sfp.get_presence()
+        assert not sfp.read_dom_snapshot()
+
+    def test_dom_getters_read_snapshot(self):
+        sfp = SFP(0)
+        manager = mock.MagicMock()
+        with mock.patch.object(SFP, 'read_dom_snapshot', manager.read_dom_snapshot), \
+                mock.patch('sonic_platform.sfp.SfpOptoeBase.get_transceiver_threshold_info', manager.get_threshold_info), \
+                mock.patch('sonic_platform.sfp.SfpOptoeBase.get_transceiver_bulk_status', manager.get_bulk_status):
+            assert sfp.get_transceiver_threshold_info() == manager.get_threshold_info.return_value
+            assert sfp.get_transceiver_bulk_status() == manager.get_bulk_status.return_value
+        # DOM ranges are read before the getters of the xcvr API read them field by field
+        assert manager.method_calls == [mock.call.read_dom_snapshot(), mock.call.get_threshold_info(),
+                                        mock.call.read_dom_snapshot(), mock.call.get_bulk_status()]
 
     @mock.patch('sonic_platform.sfp.SFP._fetch_port_status')
     def test_is_port_admin_status_up(self, mock_port_status):
@@ -46,6 +46,10 @@ mock_tc_config = """
 """
 
 
+def wait_module_updates(updater):
+    assert utils.wait_until(lambda: all(future.done() for future in list(updater._module_futures.values())), 5, 0.01)
+
+
 class TestThermalUpdater:
     def test_load_tc_config_non_exists(self):
         updater = ThermalUpdater(None)
@@ -99,13 +103,162 @@ class TestThermalUpdater:
         mock_sfp.get_temperature_critical_threshold = mock.MagicMock(return_value=80.0)
         updater = ThermalUpdater([mock_sfp])
         updater.update_module()
+        wait_module_updates(updater)
         hw_management_independent_mode_update.thermal_data_set_module.assert_called_once_with(0, 11, 55000, 80000, 70000, 0)
 
         mock_sfp.get_temperature = mock.MagicMock(return_value=0.0)
         hw_management_independent_mode_update.reset_mock()
         updater.update_module()
+        wait_module_updates(updater)
         hw_management_independent_mode_update.thermal_data_set_module.assert_called_once_with(0, 11, 0, 0, 0, 0)
 
         mock_sfp.get_presence = mock.MagicMock(return_value=False)
         updater.update_module()
+        wait_module_updates(updater)
         hw_management_independent_mode_update.thermal_data_clean_module.assert_called_once_with(0, 11)
+
+    @mock.patch('sonic_platform.utils.write_file', mock.MagicMock())
+    def test_update_module_threshold_cache(self):
+        mock_sfp = mock.MagicMock()
+        mock_sfp.sdk_index = 10
+        mock_sfp.get_presence = mock.MagicMock(return_value=True)
+        mock_sfp.get_temperature = mock.MagicMock(return_value=55.0)
+        mock_sfp.get_temperature_warning_threshold = mock.MagicMock(return_value=70.0)
+        mock_sfp.get_temperature_critical_threshold = mock.MagicMock(return_value=80.0)
+        updater = ThermalUpdater([mock_sfp])
+        hw_management_independent_mode_update.reset_mock()
+        updater.update_module()
+        wait_module_updates(updater)
+        updater.update_module()
+        wait_module_updates(updater)
+        assert hw_management_independent_mode_update.thermal_data_set_module.call_count == 2
+        hw_management_independent_mode_update.thermal_data_set_module.assert_called_with(0, 11, 55000, 80000, 70000, 0)
+        mock_sfp.get_temperature_warning_threshold.assert_called_once()
+        mock_sfp.get_temperature_critical_threshold.assert_called_once()
+        mock_sfp.read_dom_snapshot.assert_called_once()
+
+        # thresholds are read again once module is replaced
+        mock_sfp.get_presence.return_value = False
+        updater.update_module()
+        wait_module_updates(updater)
+        mock_sfp.get_presence.return_value = True
+        updater.update_module()
+        wait_module_updates(updater)
+        assert mock_sfp.get_temperature_warning_threshold.call_count == 2
+        assert mock_sfp.get_temperature_critical_threshold.call_count == 2
+        updater.stop()
+
+    @mock.patch('sonic_platform.thermal_updater.MODULE_UPDATE_DEADLINE', 0.2)
+    @mock.patch('sonic_platform.utils.write_file', mock.MagicMock())
+    def test_update_module_deadline(self):
+        slow_sfp = mock.MagicMock()
+        slow_sfp.sdk_index = 1
+        slow_sfp.get_presence = mock.MagicMock(side_effect=lambda: time.sleep(0.5) or True)
+        slow_sfp.get_temperature = mock.MagicMock(return_value=0.0)
+        fast_sfp = mock.MagicMock()
+        fast_sfp.sdk_index = 2
+        fast_sfp.get_presence = mock.MagicMock(return_value=True)
+        fast_sfp.get_temperature = mock.MagicMock(return_value=0.0)
+        updater = ThermalUpdater([slow_sfp, fast_sfp])
+        hw_management_independent_mode_update.reset_mock()
+        start = time.monotonic()
+        updater.update_module()
+        # polling cycle doesn't wait for module updates
+        assert time.monotonic() - start < 0.2
+        assert utils.wait_until(updater._module_futures[2].done, 5, 0.01)
+        hw_management_independent_mode_update.thermal_data_set_module.assert_called_once_with(0, 3, 0, 0, 0, 0)
+
+        # slow module is reported as fault by next cycle, and is not updated again until its last update finishes
+        time.sleep(0.25)
+        updater.update_module()
+        hw_management_independent_mode_update.thermal_data_set_module.assert_any_call(0, 2, 0, 0, 0, 254000)
+        assert updater.module_update_stats['timeouts'] == 1
+        assert updater._module_failures == {1: 1}
+        assert slow_sfp.get_presence.call_count == 1
+        assert utils.wait_until(lambda: fast_sfp.get_presence.call_count == 2, 5, 0.01)
+        assert updater.module_update_stats['skipped'] == 1
+
+        # fault is reported once, result of the late update is not counted again
+        updater.update_module()
+        assert updater.module_update_stats['timeouts'] == 1
+        wait_module_updates(updater)
+        updater.update_module()
+        assert updater._module_failures == {1: 1}
+        assert utils.wait_until(lambda: slow_sfp.get_presence.call_count == 2, 5, 0.01)
+        assert updater.module_update_stats['cycles'] == 4
+        updater.stop()
+
+    @mock.patch('sonic_platform.thermal_updater.MODULE_UPDATE_MAX_WORKERS', 1)
+    @mock.patch('sonic_platform.thermal_updater.MODULE_UPDATE_DEADLINE', 0.8)
+    @mock.patch('sonic_platform.thermal_updater.MODULE_NOT_STARTED_FAULT_CYCLES', 2)
+    @mock.patch('sonic_platform.utils.write_file', mock.MagicMock())
+    def test_update_module_not_started(self):
+        sfp_list = []
+        for sdk_index in range(20, 23):
+            mock_sfp = mock.MagicMock()
+            mock_sfp.sdk_index = sdk_index
+            mock_sfp.get_presence = mock.MagicMock(side_effect=lambda: time.sleep(0.6) or True)
+            mock_sfp.get_temperature = mock.MagicMock(return_value=0.0)
+            sfp_list.append(mock_sfp)
+        updater = ThermalUpdater(sfp_list)
+        hw_management_independent_mode_update.reset_mock()
+
+        def module_calls():
+            # modules of other tests may still be updated in background
+            return [call[0] for call in hw_management_independent_mode_update.thermal_data_set_module.call_args_list
+                    if call[0][1] in (21, 22, 23)]
+
+        # modules are read one after another, the last two wait for the worker
+        updater.update_module()
+        time.sleep(0.2)
+        updater.update_module()
+        assert module_calls() == []
+        time.sleep(0.2)
+        updater.update_module()
+        # reported as fault once they have not started for 2 cycles
+        assert module_calls() == [(0, 22, 0, 0, 0, 254000), (0, 23, 0, 0, 0, 254000)]
+        assert updater.module_update_stats['not_started'] == 4
+
+        # the second module is read within its deadline from the start of its read
+        time.sleep(0.6)
+        updater.update_module()
+        assert (0, 21, 0, 0, 0, 0) in module_calls()
+        assert module_calls().count((0, 22, 0, 0, 0, 254000)) == 1
+        assert module_calls().count((0, 23, 0, 0, 0, 254000)) == 1
+        assert updater.module_update_stats['timeouts'] == 0
+        assert sfp_list[2].get_presence.call_count == 0
+        updater.stop()
+
+    @mock.patch('sonic_platform.thermal_updater.MODULE_FAILURE_BACKOFF_THRESHOLD', 2)
+    @mock.patch('sonic_platform.utils.write_file', mock.MagicMock())
+    def test_update_module_backoff(self):
+        mock_sfp = mock.MagicMock()
+        mock_sfp.sdk_index = 10
+        mock_sfp.get_presence = mock.MagicMock(side_effect=Exception(''))
+        updater = ThermalUpdater([mock_sfp])
+
+        def update_module():
+            updater.update_module()
+            wait_module_updates(updater)
+
+        update_module()
+        update_module()
+        assert mock_sfp.get_presence.call_count == 2
+        # skipped for 1 cycle after 2 failures, then for 2 cycles after 3 failures
+        update_module()
+        assert mock_sfp.get_presence.call_count == 2
+        update_module()
+        assert mock_sfp.get_presence.call_count == 3
+        update_module()
+        update_module()
+        assert mock_sfp.get_presence.call_count == 3
+
+        # failure count is reset by a successful update
+        mock_sfp.get_presence.side_effect = None
+        mock_sfp.get_presence.return_value = False
+        update_module()
+        assert mock_sfp.get_presence.call_count == 4
+        update_module()
+        assert 10 not in updater._module_failures
+        assert mock_sfp.get_presence.call_count == 5
+        updater.stop()
@@ -1,21 +1,274 @@
+import re
+
+from collections import OrderedDict
+
+from .log import log_debug
+
+
+class RunningConfig(object):
+    """ Model of the FRR running configuration.
+        Prefix-lists, community-lists and route-maps are parsed and indexed by name,
+        everything else is kept as opaque text blocks. Neighbors and peer-groups are
+        indexed from the opaque blocks. The model follows the changes bgpcfgd pushes
+        to FRR, see apply()
+    """
+    RE_PREFIX_LIST = re.compile(r'^(ip|ipv6) prefix-list (\S+) seq (\d+) (.+)$')
+    RE_NO_PREFIX_LIST = re.compile(r'^no (ip|ipv6) prefix-list (\S+)$')
+    RE_COMMUNITY_LIST = re.compile(r'^bgp community-list standard (\S+) (.+)$')
+    RE_NO_COMMUNITY_LIST = re.compile(r'^no bgp community-list standard (\S+)$')
+    RE_ROUTE_MAP = re.compile(r'^route-map (\S+) (permit|deny) (\d+)$')
+    RE_NO_ROUTE_MAP = re.compile(r'^no route-map (\S+) (permit|deny) (\d+)$')
+    RE_ROUTE_MAP_COMMAND = re.compile(r'^(match (?:ip|ipv6) address prefix-list|match community|set community|set tag|call) \S')
+    RE_PEER_GROUP = re.compile(r'^\s*neighbor (\S+) peer-group$')
+    RE_NEIGHBOR_ROUTE_MAP_IN = re.compile(r'^\s*neighbor (\S+) route-map (\S+) in$')
+
+    def __init__(self, lines):
+        """
+        Constructor
+        :param lines: lines of the running configuration, without comments
+        """
+        self.blocks = OrderedDict()  # block key -> lines of an opaque block, None for an indexed block
+        self.prefix_lists = {}       # (family, name) -> OrderedDict of seq -> rule
+        self.community_lists = {}    # name -> list of entries
+        self.route_maps = {}         # name -> OrderedDict of seq -> entry
+        self.peer_groups = []
+        self.neighbor_route_map_in = {}  # neighbor or peer-group -> name of the inbound route-map
+        self.text = None
+        self.parse(lines)
+
+    def parse(self, lines):
+        """ Build the model from the running configuration lines """
+        current = None  # key of the block, the indented lines belong to
+        for line in lines:
+            if line[:1].isspace() and current is not None:
+                if current[0] == 'route-map':
+                    self.route_maps[current[1]][current[2]]['body'].append(line.strip())
+                else:
+                    self.add_opaque_line(current, line)
+                continue
+            if line == 'exit' and current is not None and current[0] == 'route-map':
+                self.route_maps[current[1]][current[2]]['exit'] = True
+                current = None
+                continue
+            current = self.add_line(line)
+            if current is not None and current[0] != 'route-map':
+                current = None  # prefix-lists and community-lists are one line blocks
+            elif current is None:
+                current = ('text', len(self.blocks))
+                self.blocks[current] = []
+                self.add_opaque_line(current, line)
+
+    def add_opaque_line(self, key, line):
+        """ Add a line to an opaque block and index the neighbors it configures """
+        self.blocks[key].append(line)
+        result = self.RE_PEER_GROUP.match(line)
+        if result:
+            self.peer_groups.append(result.group(1))
+            return
+        result = self.RE_NEIGHBOR_ROUTE_MAP_IN.match(line)
+        if result:
+            self.neighbor_route_map_in.setdefault(result.group(1), result.group(2))
+
+    def add_line(self, line):
+        """
+        Add a top level prefix-list, community-list or route-map line to the model
+        :param line: configuration line
+        :return: the key of the updated block, None if the line isn't indexed
+        """
+        result = self.RE_PREFIX_LIST.match(line)
+        if result:
+            family, name, seq, rule = result.groups()
+            key = ('prefix-list', family, name, int(seq))
+            self.prefix_lists.setdefault((family, name), OrderedDict())[int(seq)] = rule
+            self.blocks.setdefault(key, None)
+            return key
+        result = self.RE_COMMUNITY_LIST.match(line)
+        if result:
+            name, entry = result.groups()
+            key = ('community-list', name, entry)
+            entries = self.community_lists.setdefault(name, [])
+            if entry not in entries:
+                entries.append(entry)
+            self.blocks.setdefault(key, None)
+            return key
+        result = self.RE_ROUTE_MAP.match(line)
+        if result:
+            name, action, seq = result.groups()
+            key = ('route-map', name, int(seq))
+            entries = self.route_maps.setdefault(name, OrderedDict())
+            if int(seq) in entries:
+                entries[int(seq)]['action'] = action
+            else:
+                entries[int(seq)] = {'action': action, 'body': [], 'exit': False}
+            self.blocks.setdefault(key, None)
+            return key
+        return None
+
+    def apply(self, commands):
+        """
+        Apply configuration commands to the model
+        :param commands: list of configuration lines, as they are sent to FRR
+        :return: True if the model follows the commands, False if a command can't be modelled.
+                 The model must be read from FRR again in the latter case
+        """
+        self.text = None
+        route_map_entry = None  # the route-map entry indented commands belong to
+        for line in commands:
+            s_line = line.strip()
+            if s_line == '' or s_line.startswith('!'):
+                continue
+            if line[0].isspace():
+                if route_map_entry is None or not self.apply_route_map_command(route_map_entry, s_line):
+                    log_debug("RunningConfig::apply. Can't model command '%s'" % s_line)
+                    return False
+                continue
+            route_map_entry = None
+            if s_line in ('exit', 'end'):
+                continue
+            key = self.add_line(s_line)
+            if key is not None:
+                if key[0] == 'route-map':
+                    route_map_entry = self.route_maps[key[1]][key[2]]
+                continue
+            if not self.remove_line(s_line):
+                log_debug("RunningConfig::apply. Can't model command '%s'" % s_line)
+                return False
+        return True
+
+    @classmethod
+    def apply_route_map_command(cls, entry, command):
+        """
+        Apply a command to a route-map entry. A command replaces the command of the same kind
+        :param entry: the route-map entry
+        :param command: the command
+        :return: True if the command was applied, False if it can't be modelled
+        """
+        result = cls.RE_ROUTE_MAP_COMMAND.match(command)
+        if not result:
+            return False
+        kind = result.group(1) + ' '
+        body = entry['body']
+        for i, line in enumerate(body):
+            if line.startswith(kind):
+                body[i] = command
+                return True
+        body.append(command)
+        return True
+
+    def remove_line(self, line):
+        """
+        Apply a 'no' command for a prefix-list, community-list or route-map entry
+        :param line: configuration line
+        :return: True if the command was applied, False if it can't be modelled
+        """
+        result = self.RE_NO_PREFIX_LIST.match(line)
+        if result:
+            family, name = result.groups()
+            for seq in self.prefix_lists.pop((family, name), {}):
+                del self.blocks[('prefix-list', family, name, seq)]
+            return True
+        result = self.RE_NO_COMMUNITY_LIST.match(line)
+        if result:
+            name = result.group(1)
+            for entry in self.community_lists.pop(name, []):
+                del self.blocks[('community-list', name, entry)]
+            return True
+        result = self.RE_NO_ROUTE_MAP.match(line)
+        if result:
+            name, _, seq = result.groups()
+            entries = self.route_maps.get(name, {})
+            if int(seq) in entries:
+                del entries[int(seq)]
+                del self.blocks[('route-map', name, int(seq))]
+                if not entries:
+                    del self.route_maps[name]
+            return True
+        return False
+
+    def get_prefix_list(self, family, name):
+        """
+        Get prefix-list entries
+        :param family: 'ip' or 'ipv6'
+        :param name: name of the prefix-list
+        :return: OrderedDict of sequence number -> rule. Empty if the prefix-list doesn't exist
+        """
+        return self.prefix_lists.get((family, name), OrderedDict())
+
+    def get_community_list(self, name):
+        """
+        Get standard community-list entries
+        :param name: name of the community-list
+        :return: list of entries, e.g. 'permit 1010:2020'. Empty if the community-list doesn't exist
+        """
+        return self.community_lists.get(name, [])
+
+    def get_route_map(self, name):
+        """
+        Get route-map entries
+        :param name: name of the route-map
+        :return: OrderedDict of sequence number -> entry. Every entry is a dictionary with
+                 the 'action' of the entry and its 'body': a list of commands
+        """
+        return self.route_maps.get(name, OrderedDict())
+
+    def get_peer_groups(self):
+        """ Get names of all peer-groups """
+        return self.peer_groups
+
+    def get_route_map_in(self, neighbor):
+        """
+        Get the inbound route-map of a neighbor or of a peer-group
+        :param neighbor: neighbor address or peer-group name
+        :return: name of the route-map, None if no inbound route-map is set
+        """
+        return self.neighbor_route_map_in.get(neighbor)
+
+    def get_text(self):
+        """ Render the model as a list of configuration lines """
+        if self.text is None:
+            self.text = []
+            for key, lines in self.blocks.items():
+                if lines is not None:
+                    self.text += lines
+                elif key[0] == 'prefix-list':
+                    _, family, name, seq = key
+                    self.text.append('%s prefix-list %s seq %d %s' % (family, name, seq, self.prefix_lists[(family, name)][seq]))
+                elif key[0] == 'community-list':
+                    self.text.append('bgp community-list standard %s %s' % (key[1], key[2]))
+                else:
+                    _, name, seq = key
+                    entry = self.route_maps[name][seq]
+                    self.text.append('route-map %s %s %d' % (name, entry['action'], seq))
+                    self.text += [' ' + line for line in entry['body']]
+                    if entry['exit']:
+                        self.text.append('exit')
+        return self.text
+
+
 class ConfigMgr(object):
     """ The class represents frr configuration """
     def __init__(self, frr):
         self.frr = frr
         self.current_config = None
         self.current_config_raw = None
+        self.running_config = None  # RunningConfig. None, when the config must be read from FRR
         self.changes = ""
+        self.changes_modelled = True  # False, when running_config doesn't follow the pending changes
         self.peer_groups_to_restart = []
 
     def reset(self):
-        """ Reset stored config """
-        self.current_config = None
-        self.current_config_raw = None
+        """ Reset pending changes. The running config model already has the committed ones """
         self.changes = ""
+        self.changes_modelled = True
         self.peer_groups_to_restart = []
 
-    def update(self):
-        """ Read current config from FRR """
+    def update(self, force=False):
+        """
+        Read current config from FRR, unless the running config model is in sync with it
+        :param force: read the config even if the model is in sync
+        """
+        if self.running_config is not None and not force:
+            return
         self.current_config = None
         self.current_config_raw = None
         out = self.frr.get_config()
@@ -27,6 +280,12 @@ class ConfigMgr(object):
         text += ["     "]  # Add empty line to have something to work on, if there is no text
         self.current_config_raw = text
         self.current_config = self.to_canonical(out)  # FIXME: use text as an input
+        self.running_config = RunningConfig(text)
+
+    def get_running_config(self):
+        """ Get the running config model, read from FRR if the model isn't in sync """
+        self.update()
+        return self.running_config
 
     def push_list(self, cmdlist):
         """
@@ -34,6 +293,7 @@ class ConfigMgr(object):
         :param cmdlist: configuration change for FRR. Type: List of Strings
         """
         self.changes += "\n".join(cmdlist) + "\n"
+        self.apply(cmdlist)
 
     def push(self, cmd):
         """
@@ -41,8 +301,19 @@ class ConfigMgr(object):
         :param cmd: configuration change for FRR. Type: String
         """
         self.changes += cmd + "\n"
+        self.apply(cmd.split("\n"))
         return True
 
+    def apply(self, cmdlist):
+        """
+        Apply pending changes to the running config model. The model is read from FRR again
+        if it can't follow the changes
+        :param cmdlist: configuration change for FRR. Type: List of Strings
+        """
+        if self.running_config is None or not self.running_config.apply(cmdlist):
+            self.running_config = None
+            self.changes_modelled = False
+
     def restart_peer_groups(self, peer_groups):
         """
         Schedule peer_groups for restart on commit
@@ -59,11 +330,16 @@ class ConfigMgr(object):
             return True
         rc_write = self.frr.write(self.changes)
         rc_restart = self.frr.restart_peer_groups(self.peer_groups_to_restart)
+        if not rc_write or not self.changes_modelled:
+            # FRR config doesn't match the model anymore
+            self.running_config = None
         self.reset()
         return rc_write and rc_restart
 
     def get_text(self):
-        return self.current_config_raw
+        if self.running_config is None:
+            return self.current_config_raw
+        return self.running_config.get_text()
 
     @staticmethod
     def to_canonical(raw_config):
@@ -1,4 +1,4 @@
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 from .log import log_err
 
@@ -6,9 +6,20 @@ from .log import log_err
 class Directory(object):
     """ This class stores values and notifies callbacks which were registered to be executed as soon
         as some value is changed. This class works as DB cache mostly """
+    MISSING = object()  # value of a path which doesn't exist
+
     def __init__(self):
         self.data = defaultdict(dict)  # storage. A key is a slot name, a value is a dictionary with data
-        self.notify = defaultdict(lambda: defaultdict(list))  # registered callbacks: slot -> path -> handlers[]
+        # registered callbacks: slot -> trie of the split paths. Every node is a dictionary
+        # with 'handlers' registered for the path and 'children': path element -> node
+        self.notify = defaultdict(self.new_node)
+        self.pending = OrderedDict()  # handlers to run by flush_notifications()
+        self.on_hold = False
+
+    @staticmethod
+    def new_node():
+        """ Create a node of the callbacks trie """
+        return {'handlers': [], 'children': {}}
 
     @staticmethod
     def get_slot_name(db, table):
@@ -62,7 +73,10 @@ class Directory(object):
 
     def put(self, db, table, key, value):
         """
-        Put information into the storage. Notify handlers which are dependant to the information
+        Put information into the storage. Notify handlers which are dependant to the information.
+        If the value of the key was changed, handlers registered for the slot and for every path
+        under the key which is available are run. A handler depending on the key can check other
+        fields of it, so it is run even if its own path wasn't changed
         :param db: db name
         :param table: table name
         :param key: key to change
@@ -70,12 +84,45 @@ class Directory(object):
         :return:
         """
         slot = self.get_slot_name(db, table)
+        old_value = self.data[slot].get(key, self.MISSING)
         self.data[slot][key] = value
-        if slot in self.notify:
-            for path in self.notify[slot].keys():
-                if self.path_exist(db, table, path):
-                    for handler in self.notify[slot][path]:
-                        handler()
+        if slot not in self.notify or old_value == value:
+            return
+        root = self.notify[slot]
+        handlers = OrderedDict((handler, None) for handler in root['handlers'])
+        if key in root['children']:
+            self.collect_handlers(root['children'][key], value, handlers)
+        if self.on_hold:
+            self.pending.update(handlers)
+        else:
+            for handler in handlers:
+                handler()
+
+    def collect_handlers(self, node, value, handlers):
+        """
+        Collect handlers registered for the paths under the node which are available
+        :param node: node of the callbacks trie
+        :param value: value of the node path, MISSING if the path doesn't exist
+        :param handlers: OrderedDict of collected handlers
+        """
+        if value is self.MISSING:
+            return
+        for handler in node['handlers']:
+            handlers[handler] = None
+        for name, child in node['children'].items():
+            child_value = value.get(name, self.MISSING) if isinstance(value, dict) else self.MISSING
+            self.collect_handlers(child, child_value, handlers)
+
+    def hold_notifications(self):
+        """ Collect handlers of changed paths instead of running them, until flush_notifications() is called """
+        self.on_hold = True
+
+    def flush_notifications(self):
+        """ Run every handler collected since hold_notifications() once and stop holding notifications """
+        self.on_hold = False
+        while self.pending:
+            handler, _ = self.pending.popitem(last=False)
+            handler()
 
     def get(self, db, table, key):
         """
@@ -156,4 +203,8 @@ class Directory(object):
         """
         for db, table, path in deps:
             slot = self.get_slot_name(db, table)
-            self.notify[slot][path].append(handler)
\ No newline at end of file
+            node = self.notify[slot]
+            if path != '':
+                for p in path.split("/"):
+                    node = node['children'].setdefault(p, self.new_node())
+            node['handlers'].append(handler)
\ No newline at end of file
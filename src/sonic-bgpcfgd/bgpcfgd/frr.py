@@ -3,15 +3,39 @@ import datetime
 import time
 import tempfile
 
-from bgpcfgd.log import log_err, log_info, log_warn, log_crit
+from bgpcfgd.log import log_debug, log_err, log_info, log_warn, log_crit
 from .vars import g_debug
 from .utils import run_command
+from .vty import VtyClient, VtyError
 
 
 class FRR(object):
-    """Proxy object with FRR"""
-    def __init__(self, daemons):
+    """Proxy object with FRR
+       Commands for a single daemon go through a persistent connection to the
+       daemon vty socket. Configuration is still pushed and read with vtysh,
+       which dispatches every line to the daemons handling it and merges
+       their running configurations.
+    """
+    def __init__(self, daemons, vty_dir=VtyClient.VTY_DIR):
         self.daemons = daemons
+        self.vty_dir = vty_dir
+        self.vty_clients = {}
+
+    def vty(self, daemon):
+        """ Return the persistent vty client of the daemon """
+        if daemon not in self.vty_clients:
+            self.vty_clients[daemon] = VtyClient(daemon, self.vty_dir)
+        return self.vty_clients[daemon]
+
+    def run_commands(self, commands, daemon="bgpd"):
+        """
+        Run commands on one daemon through its vty socket. The commands are pipelined
+        :param commands: list of commands
+        :param daemon: name of the daemon
+        :return: list of (status, output) tuples, status is VtyClient.CMD_SUCCESS on success.
+                 Raises VtyError when the daemon can't be reached
+        """
+        return self.vty(daemon).execute(commands)
 
     def wait_for_daemons(self, seconds):
         """
@@ -21,6 +45,13 @@ class FRR(object):
         stop_time = datetime.datetime.now() + datetime.timedelta(seconds=seconds)
         log_info("Start waiting for FRR daemons: %s" % str(datetime.datetime.now()))
         while datetime.datetime.now() < stop_time:
+            try:
+                for daemon in self.daemons:
+                    self.vty(daemon).connect()
+                log_info("All required daemons accept vty connections: %s" % str(datetime.datetime.now()))
+                return
+            except VtyError as e:
+                log_debug("Can't connect to FRR daemons vty sockets: %s" % str(e))
             ret_code, out, err = run_command(["vtysh", "-c", "show daemons"], hide_errors=True)
             if ret_code == 0 and all(daemon in out for daemon in self.daemons):
                 log_info("All required daemons have connected to vtysh: %s" % str(datetime.datetime.now()))
@@ -54,14 +85,30 @@ class FRR(object):
                 os.remove(tmp_filename)
         return ret_code == 0
 
-    @staticmethod
-    def restart_peer_groups(peer_groups):
+    def restart_peer_groups(self, peer_groups):
         """ Restart peer-groups which support BBR
         :param peer_groups: List of peer_groups to restart
         :return: True if restart of all peer-groups was successful, False otherwise
         """
+        peer_groups = sorted(peer_groups)
+        if not peer_groups:
+            return True
+        commands = ["clear bgp peer-group %s soft in" % peer_group for peer_group in peer_groups]
+        try:
+            replies = self.run_commands(commands, "bgpd")
+        except VtyError as e:
+            log_warn("Can't restart bgp peer-groups through the bgpd vty socket, use vtysh: %s" % str(e))
+        else:
+            res = True
+            for peer_group, (rc, out) in zip(peer_groups, replies):
+                if rc != VtyClient.CMD_SUCCESS:
+                    log_value = peer_group, rc, out, ""
+                    log_crit("Can't restart bgp peer-group '%s'. rc='%d', out='%s', err='%s'" % log_value)
+                res = res and (rc == VtyClient.CMD_SUCCESS)
+            return res
+
         res = True
-        for peer_group in sorted(peer_groups):
+        for peer_group in peer_groups:
             rc, out, err = run_command(["vtysh", "-c", "clear bgp peer-group %s soft in" % peer_group])
             if rc != 0:
                 log_value = peer_group, rc, out, err
@@ -74,7 +74,11 @@ def do_work():
         # Device Global Manager
         DeviceGlobalCfgMgr(common_objs, "CONFIG_DB", swsscommon.CFG_BGP_DEVICE_GLOBAL_TABLE_NAME),
     ]
-    runner = Runner(common_objs['cfg_mgr'])
+    runner_cfg = common_objs['constants'].get('bgp', {}).get('runner', {})
+    runner = Runner(common_objs['cfg_mgr'],
+                    max_delay=runner_cfg.get('coalesce_max_delay', Runner.COALESCE_MAX_DELAY),
+                    max_batch=runner_cfg.get('coalesce_max_batch', Runner.COALESCE_MAX_BATCH),
+                    directory=common_objs['directory'])
     for mgr in managers:
         runner.add_manager(mgr)
     runner.run()
@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from swsscommon import swsscommon
 
 from .log import log_debug, log_err
@@ -19,7 +21,7 @@ class Manager(object):
         self.deps = deps
         self.db_name = database
         self.table_name = table_name
-        self.set_queue = []
+        self.set_queue = OrderedDict()  # key -> data of 'SET' commands which weren't processed yet
         self.directory.subscribe(deps, self.on_deps_change)  # subscribe this class method on directory changes
 
     def get_database(self):
@@ -37,15 +39,17 @@ class Manager(object):
         :param op: operation on the table entry. Could be either 'SET' or 'DEL'
         :param data: associated data of the event. Empty for 'DEL' operation.
         """
+        # The latest command for the key supersedes a queued 'SET' command
+        self.set_queue.pop(key, None)
         if op == swsscommon.SET_COMMAND:
             if self.directory.available_deps(self.deps):  # all required dependencies are set in the Directory?
                 res = self.set_handler(key, data)
                 if not res:  # set handler returned False, which means it is not ready to process is. Save it for later.
                     log_debug("'SET' handler returned NOT_READY for the Manager: %s" % self.__class__)
-                    self.set_queue.append((key, data))
+                    self.set_queue[key] = data
             else:
                 log_debug("Not all dependencies are met for the Manager: %s" % self.__class__)
-                self.set_queue.append((key, data))
+                self.set_queue[key] = data
         elif op == swsscommon.DEL_COMMAND:
             self.del_handler(key)
         else:
@@ -55,11 +59,11 @@ class Manager(object):
         """ This method is being executed on every dependency change """
         if not self.directory.available_deps(self.deps):
             return
-        new_queue = []
-        for key, data in self.set_queue:
+        new_queue = OrderedDict()
+        for key, data in self.set_queue.items():
             res = self.set_handler(key, data)
             if not res:
-                new_queue.append((key, data))
+                new_queue[key] = data
         self.set_queue = new_queue
 
     def set_handler(self, key, data):
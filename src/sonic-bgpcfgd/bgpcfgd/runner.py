@@ -1,4 +1,6 @@
-from collections import defaultdict
+import time
+
+from collections import defaultdict, OrderedDict
 from swsscommon import swsscommon
 
 from .log import log_debug, log_crit
@@ -19,14 +21,39 @@ class Runner(object):
         when corresponding db/table is updated
     """
     SELECT_TIMEOUT = 1000
+    COALESCE_MAX_DELAY = 200   # ms. How long to keep collecting events once the first one has arrived
+    COALESCE_MAX_BATCH = 1000  # Stop collecting once a batch holds that many coalesced events
+    STATS_TABLE = "BGPCFGD_STATS"
+    STATS_KEY = "runner"
 
-    def __init__(self, cfg_manager):
-        """ Constructor """
+    def __init__(self, cfg_manager, max_delay=COALESCE_MAX_DELAY, max_batch=COALESCE_MAX_BATCH, directory=None):
+        """
+        Constructor
+        :param cfg_manager: ConfigMgr object, committed once per batch of events
+        :param max_delay: maximum time in ms an event waits in a batch before it is handled
+        :param max_batch: maximum number of coalesced events in a batch
+        :param directory: Directory object. Its dependency handlers run once per batch of events
+        """
         self.cfg_manager = cfg_manager
+        self.directory = directory
+        self.max_delay = max_delay
+        self.max_batch = max_batch
         self.db_connectors = {}
         self.selector = swsscommon.Select()
         self.callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> handlers[]
         self.subscribers = set()
+        self.stats = {
+            'batches': 0,
+            'events_received': 0,
+            'events_handled': 0,
+            'last_batch_size': 0,
+            'max_batch_size': 0,
+            'last_commit_ms': 0,
+            'max_commit_ms': 0,
+            'commit_failures': 0,
+        }
+        self.stats_db = None
+        self.stats_table = None
 
     def add_manager(self, manager):
         """
@@ -57,14 +84,114 @@ class Runner(object):
             elif state == self.selector.ERROR:
                 raise Exception("Received error from select")
 
-            for subscriber in self.subscribers:
-                while True:
-                    key, op, fvs = subscriber.pop()
-                    if not key:
-                        break
-                    log_debug("Received message : '%s'" % str((key, op, fvs)))
-                    for callback in self.callbacks[subscriber.getDbConnector().getDbId()][subscriber.getTableName()]:
-                        callback(key, op, dict(fvs))
-            rc = self.cfg_manager.commit()
-            if not rc:
-                log_crit("Runner::commit was unsuccessful")
+            events, received = self.collect_events()
+            self.handle_events(events, received)
+
+    def collect_events(self):
+        """
+        Read events from all subscribers until the batch is full, max_delay ms
+        have passed since the first event, or no new event arrived in time.
+        :return: a tuple of coalesced events, see coalesce(), and the number of received events
+        """
+        events = OrderedDict()
+        received = 0
+        deadline = time.time() + self.max_delay / 1000.0
+        while True:
+            received += self.pop_events(events)
+            remaining = deadline - time.time()
+            if len(events) >= self.max_batch or remaining <= 0:
+                break
+            state, _ = self.selector.select(int(remaining * 1000))
+            if state == self.selector.TIMEOUT:
+                break
+            elif state == self.selector.ERROR:
+                raise Exception("Received error from select")
+        return events, received
+
+    def pop_events(self, events):
+        """
+        Pop pending events from the subscribers into events until the batch holds max_batch
+        coalesced events. The other events stay queued in the subscribers for the next batch
+        :param events: coalesced events, see coalesce()
+        :return: number of events popped
+        """
+        count = 0
+        for subscriber in self.subscribers:
+            db = subscriber.getDbConnector().getDbId()
+            table = subscriber.getTableName()
+            while len(events) < self.max_batch:
+                key, op, fvs = subscriber.pop()
+                if not key:
+                    break
+                log_debug("Received message : '%s'" % str((key, op, fvs)))
+                self.coalesce(events, (db, table, key), op, dict(fvs))
+                count += 1
+        return count
+
+    @staticmethod
+    def coalesce(events, event_key, op, data):
+        """
+        Add an event to a batch, dropping the events of the same db/table/key it makes useless.
+        A 'DEL' replaces everything pending for the key, a 'SET' replaces a pending 'SET'.
+        A 'DEL' followed by a 'SET' is kept as is: recreating an entry is not the same as
+        updating it for every manager. The key moves to the end of the batch, so entries are
+        handled in the order of their latest change.
+        :param events: OrderedDict of (db, table, key) -> list of (op, data)
+        :param event_key: (db, table, key) of the event
+        :param op: operation of the event
+        :param data: associated data of the event
+        """
+        ops = events.pop(event_key, [])
+        if op == swsscommon.DEL_COMMAND:
+            ops = [(op, data)]
+        elif ops and ops[-1][0] == swsscommon.SET_COMMAND:
+            ops[-1] = (op, data)
+        else:
+            ops.append((op, data))
+        events[event_key] = ops
+
+    def handle_events(self, events, received):
+        """
+        Run the handlers of a batch of events and commit their changes to FRR at once
+        :param events: coalesced events, see coalesce()
+        :param received: number of events received for the batch
+        """
+        handled = 0
+        if self.directory is not None:
+            self.directory.hold_notifications()
+        try:
+            for (db, table, key), ops in events.items():
+                for op, data in ops:
+                    for callback in self.callbacks[db][table]:
+                        callback(key, op, data)
+                    handled += 1
+        finally:
+            if self.directory is not None:
+                self.directory.flush_notifications()
+
+        start = time.time()
+        rc = self.cfg_manager.commit()
+        commit_ms = int((time.time() - start) * 1000)
+        if not rc:
+            log_crit("Runner::commit was unsuccessful")
+        self.update_stats(received, handled, commit_ms, rc)
+
+    def update_stats(self, received, handled, commit_ms, rc):
+        """ Update the batch statistics and publish them in STATE_DB """
+        self.stats['batches'] += 1
+        self.stats['events_received'] += received
+        self.stats['events_handled'] += handled
+        self.stats['last_batch_size'] = handled
+        self.stats['max_batch_size'] = max(self.stats['max_batch_size'], handled)
+        self.stats['last_commit_ms'] = commit_ms
+        self.stats['max_commit_ms'] = max(self.stats['max_commit_ms'], commit_ms)
+        if not rc:
+            self.stats['commit_failures'] += 1
+        try:
+            if self.stats_table is None:
+                self.stats_db = swsscommon.DBConnector("STATE_DB", 0)
+                self.stats_table = swsscommon.Table(self.stats_db, Runner.STATS_TABLE)
+            fvs = swsscommon.FieldValuePairs([(name, str(value)) for name, value in sorted(self.stats.items())])
+            self.stats_table.set(Runner.STATS_KEY, fvs)
+        except Exception as e:
+            log_debug("Runner: can't publish statistics: %s" % str(e))
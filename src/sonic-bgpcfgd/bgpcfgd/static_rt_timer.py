@@ -1,19 +1,40 @@
 from .log import log_err, log_info, log_debug
 from swsscommon import swsscommon
+import heapq
 import time
 
 class StaticRouteTimer(object):
-    """ This class checks the static routes and deletes those entries that have not been refreshed """
+    """ This class checks the static routes and deletes those entries that have not been refreshed.
+        Every route has its own expiry time, kept in a heap: a sweep reads only the routes which are due.
+        New routes are discovered with SCAN, the changes are written through a redis pipeline """
     def __init__(self):
         self.db = swsscommon.SonicV2Connector()
         self.db.connect(self.db.APPL_DB)
+        self.db.connect(self.db.STATE_DB)
+        self.client = self.db.get_redis_client(self.db.APPL_DB)
+        self.pipe = swsscommon.RedisPipeline(self.client)
         self.timer = None
         self.start = None
+        self.routes = {}        # static route key -> its expiry time
+        self.expiry_heap = []   # (expiry time, static route key). Entries which don't match self.routes are stale
+        self.last_discovery = None
+        self.stats = {
+            'sweeps': 0,
+            'routes': 0,
+            'last_sweep_ms': 0,
+            'max_sweep_ms': 0,
+            'last_checked': 0,
+            'last_expired': 0,
+            'expired': 0,
+        }
 
     DEFAULT_TIMER = 180
     DEFAULT_SLEEP = 60
     # keep same range as value defined in sonic-restapi/sonic_api.yaml
     MAX_TIMER     = 172800
+    SCAN_COUNT = 1000
+    PIPE_BATCH_MAX_COUNT = 1000
+    STATS_KEY = "BGPCFGD_STATS|static_route_timer"
 
     def set_timer(self):
         """ Check for custom route expiry time in STATIC_ROUTE_EXPIRY_TIME """
@@ -27,34 +48,100 @@ class StaticRouteTimer(object):
                 log_err("Custom static route expiry time of {}s is invalid!".format(timer))
         return
 
-    def alarm(self):
-        """ Clear unrefreshed static routes """
-        static_routes = self.db.keys(self.db.APPL_DB, "STATIC_ROUTE:*")
-        if static_routes is not None:
-            for sr in static_routes:
-                expiry = self.db.get(self.db.APPL_DB, sr, "expiry")
-                if expiry == "false":
-                    continue
-                refresh = self.db.get(self.db.APPL_DB, sr, "refresh")
-                if refresh == "true":
-                    self.db.set(self.db.APPL_DB, sr, "refresh", "false")
-                    log_debug("Refresh status of static route {} is set to false".format(sr))
-                else:
-                    self.db.delete(self.db.APPL_DB, sr)
-                    log_debug("Static route {} deleted".format(sr))
+    def get_period(self):
+        """ Time in seconds a static route has to be refreshed in """
+        return self.timer if self.timer else self.DEFAULT_TIMER
+
+    def schedule(self, key, expiry):
+        """ Set expiry time of the static route """
+        self.routes[key] = expiry
+        heapq.heappush(self.expiry_heap, (expiry, key))
+
+    def discover(self, now):
+        """ Find static routes added or removed since the last discovery """
+        found = set()
+        cursor = 0
+        while True:
+            cursor, keys = self.client.scan(cursor, "STATIC_ROUTE:*", self.SCAN_COUNT)
+            found.update(keys)
+            if cursor == 0:
+                break
+        for key in found:
+            if key not in self.routes:
+                self.schedule(key, now + self.get_period())
+        for key in [key for key in self.routes if key not in found]:
+            del self.routes[key]
+        self.last_discovery = now
+
+    def sweep(self):
+        """ Clear unrefreshed static routes which are due, reset the refresh flag of the others """
+        start = time.time()
+        if self.last_discovery is None or start - self.last_discovery >= self.DEFAULT_SLEEP:
+            self.discover(start)
+        checked = expired = pending = 0
+        while self.expiry_heap and self.expiry_heap[0][0] <= start:
+            expiry, sr = heapq.heappop(self.expiry_heap)
+            if self.routes.get(sr) != expiry:
+                continue  # the route was removed or rescheduled
+            checked += 1
+            fvs = self.db.get_all(self.db.APPL_DB, sr)
+            if not fvs:
+                del self.routes[sr]
+                continue
+            if fvs.get("expiry") == "false":
+                self.schedule(sr, start + self.get_period())
+                continue
+            command = swsscommon.RedisCommand()
+            if fvs.get("refresh") == "true":
+                command.formatHSET(sr, {"refresh": "false"})
+                self.schedule(sr, start + self.get_period())
+                log_debug("Refresh status of static route {} is set to false".format(sr))
+            else:
+                command.formatDEL(sr)
+                del self.routes[sr]
+                expired += 1
+                log_debug("Static route {} deleted".format(sr))
+            self.pipe.push(command)
+            pending += 1
+            if pending >= self.PIPE_BATCH_MAX_COUNT:
+                self.pipe.flush()
+                pending = 0
+        if pending:
+            self.pipe.flush()
+        self.update_stats(start, checked, expired)
         self.start = time.time()
         return
 
+    def update_stats(self, start, checked, expired):
+        """ Update the sweep statistics and publish them in STATE_DB """
+        sweep_ms = int((time.time() - start) * 1000)
+        self.stats['sweeps'] += 1
+        self.stats['routes'] = len(self.routes)
+        self.stats['last_sweep_ms'] = sweep_ms
+        self.stats['max_sweep_ms'] = max(self.stats['max_sweep_ms'], sweep_ms)
+        self.stats['last_checked'] = checked
+        self.stats['last_expired'] = expired
+        self.stats['expired'] += expired
+        if expired:
+            log_info("Static route expiry: {} of {} checked routes deleted in {}ms".format(expired, checked, sweep_ms))
+        try:
+            self.db.hmset(self.db.STATE_DB, self.STATS_KEY, {name: str(value) for name, value in self.stats.items()})
+        except Exception as e:
+            log_debug("StaticRouteTimer: can't publish statistics: %s" % str(e))
+
+    def get_sleep_time(self):
+        """ Time in seconds until the next route is due, at most DEFAULT_SLEEP """
+        if not self.expiry_heap:
+            return self.DEFAULT_SLEEP
+        return min(self.DEFAULT_SLEEP, max(1, self.expiry_heap[0][0] - time.time()))
+
     def run(self):
         self.start = time.time()
+        timer = None
         while True:
             self.set_timer()
-            if self.timer:
-                log_info("Static route expiry set to {}s".format(self.timer))
-                time.sleep(self.timer)
-                self.alarm()
-            else:
-                time.sleep(self.DEFAULT_SLEEP)
-                if time.time() - self.start >= self.DEFAULT_TIMER:
-                    self.alarm()
-
+            if self.timer != timer:
+                timer = self.timer
+                log_info("Static route expiry set to {}s".format(self.get_period()))
+            self.sweep()
+            time.sleep(self.get_sleep_time())
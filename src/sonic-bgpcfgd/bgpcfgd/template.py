@@ -1,17 +1,28 @@
+import os
 from collections import OrderedDict
 from functools import partial
 
 import jinja2
 import netaddr
+from jinja2_cache import BytecodeCache
+
+from .log import log_err, log_warn
+
+# Compiled templates are stored here when the directory exists. Each entry
+# carries a checksum of the template source, so edited templates are recompiled.
+BYTECODE_CACHE_DIR = '/var/cache/sonic/jinja2'
+BYTECODE_CACHE_PATTERN = '__bgpcfgd_%s.cache'
 
-from .log import log_err
 
 class TemplateFabric(object):
     """ Fabric for rendering jinja2 templates """
-    def __init__(self, template_path = '/usr/share/sonic/templates'):
+    def __init__(self, template_path = '/usr/share/sonic/templates', bytecode_cache_dir = BYTECODE_CACHE_DIR):
         j2_template_paths = [template_path]
         j2_loader = jinja2.FileSystemLoader(j2_template_paths)
-        j2_env = jinja2.Environment(loader=j2_loader, trim_blocks=False)
+        bytecode_cache = None
+        if bytecode_cache_dir is not None and os.path.isdir(bytecode_cache_dir):
+            bytecode_cache = BytecodeCache(bytecode_cache_dir, BYTECODE_CACHE_PATTERN)
+        j2_env = jinja2.Environment(loader=j2_loader, trim_blocks=False, bytecode_cache=bytecode_cache)
         j2_env.filters['ipv4'] = self.is_ipv4
         j2_env.filters['ipv6'] = self.is_ipv6
         j2_env.filters['pfx_filter'] = self.pfx_filter
@@ -27,6 +38,20 @@ class TemplateFabric(object):
         """
         return self.env.get_template(filename)
 
+    def precompile(self):
+        """
+        Compile all templates found under the template path, so they are stored in the bytecode cache
+        :return: number of templates which failed to compile
+        """
+        failures = 0
+        for name in self.env.list_templates(extensions=['j2']):
+            try:
+                self.env.get_template(name)
+            except jinja2.TemplateError as e:
+                log_warn("Can't precompile template '%s': %s" % (name, str(e)))
+                failures += 1
+        return failures
+
     def from_string(self, tmpl):
         """
         Read a template from a string
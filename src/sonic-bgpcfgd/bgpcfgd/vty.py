@@ -0,0 +1,89 @@
+import os
+import socket
+
+from .log import log_debug
+
+
+class VtyError(Exception):
+    """ The daemon vty socket can't be used """
+    pass
+
+
+class VtyClient(object):
+    """ Persistent connection to the vty socket of one FRR daemon.
+        This is the socket vtysh itself talks to: every command is sent
+        NUL terminated, the daemon answers with the command output followed
+        by three NUL bytes and the status of the command.
+        Commands are pipelined: all of them are sent before the replies are read.
+    """
+    VTY_DIR = "/var/run/frr"
+    TIMEOUT = 30  # seconds
+    CMD_SUCCESS = 0
+
+    def __init__(self, daemon, vty_dir=VTY_DIR, timeout=TIMEOUT):
+        """
+        Constructor
+        :param daemon: name of the FRR daemon, e.g. 'bgpd'
+        :param vty_dir: directory with the daemons vty sockets
+        :param timeout: timeout in seconds of every socket operation
+        """
+        self.daemon = daemon
+        self.path = os.path.join(vty_dir, "%s.vty" % daemon)
+        self.timeout = timeout
+        self.sock = None
+        self.buffer = b""
+
+    def connect(self):
+        """ Connect to the daemon, unless already connected """
+        if self.sock is not None:
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except (OSError, socket.error) as e:
+            sock.close()
+            raise VtyError("can't connect to '%s': %s" % (self.path, str(e)))
+        self.sock = sock
+        self.buffer = b""
+        log_debug("Connected to vty socket '%s'" % self.path)
+        # vty sessions start in the view node. The enable node is needed for 'clear' commands
+        self.execute(["enable"])
+
+    def close(self):
+        """ Close the connection. The next command reconnects """
+        if self.sock is not None:
+            self.sock.close()
+        self.sock = None
+        self.buffer = b""
+
+    def execute(self, commands):
+        """
+        Execute commands on the daemon
+        :param commands: list of commands
+        :return: list of (status, output) tuples, one per command. Status is CMD_SUCCESS on success
+        """
+        self.connect()
+        try:
+            self.sock.sendall(b"".join(command.encode() + b"\0" for command in commands))
+            return [self.read_reply() for _ in commands]
+        except (OSError, socket.error, socket.timeout) as e:
+            self.close()
+            raise VtyError("vty socket '%s' failed: %s" % (self.path, str(e)))
+        except VtyError:
+            self.close()
+            raise
+
+    def read_reply(self):
+        """ Read the reply of the next command """
+        while True:
+            pos = self.buffer.find(b"\0\0\0")
+            if pos != -1 and len(self.buffer) > pos + 3:
+                output = self.buffer[:pos].decode("utf-8", "replace")
+                status = self.buffer[pos + 3]
+                self.buffer = self.buffer[pos + 4:]
+                return status, output
+            data = self.sock.recv(65536)
+            if not data:
+                raise VtyError("vty socket '%s' was closed by the daemon" % self.path)
+            self.buffer += data
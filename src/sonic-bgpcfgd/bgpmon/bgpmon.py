@@ -23,16 +23,94 @@ Description: bgpmon.py -- populating bgp related information in stateDB.
     "previous" neighbor dictionary will be kept and used to determine if there
     is a need to perform update or the peer is stale to be removed from the
     state DB
+
+    By default the daemon runs in the event mode: it follows the frr.log file and
+    looks for the neighbor state changes FRR logs (bgp log-neighbor-changes).
+    Only the neighbors which changed are requested from bgpd, over its vty socket,
+    and updated in the state DB. The full snapshot described above is still done
+    periodically to reconcile the states FRR doesn't log. The original polling
+    behavior is available with '--mode poll'.
+    Statistics of the daemon are published in the BGPMON_STATS|bgpmon entry of the
+    state DB.
 """
+import argparse
 import json
 import os
+import re
 import sys
 import syslog
 from swsscommon import swsscommon
 import time
 from sonic_py_common.general import getstatusoutput_noshell
+from bgpcfgd.vty import VtyClient, VtyError
 
 PIPE_BATCH_MAX_COUNT = 50
+FRR_LOG_FILE = "/var/log/frr/frr.log"
+POLL_INTERVAL = 15        # seconds between checks of bgp activity in the poll mode
+EVENT_POLL_INTERVAL = 1   # seconds between reads of the frr.log file in the event mode
+RECONCILE_INTERVAL = 60   # seconds between full snapshots in the event mode
+STATS_KEY = "BGPMON_STATS|bgpmon"
+
+
+class FrrLogTailer:
+    """Follow the FRR log file and extract the neighbor state changes logged by bgpd."""
+    ADJCHANGE_RE = re.compile(r'%ADJCHANGE: neighbor (\S+?)(?:\([^)]*\))? in vrf (\S+) (Up|Down)')
+
+    def __init__(self, path=FRR_LOG_FILE):
+        self.path = path
+        self.file = None
+        self.inode = None
+        self.buffer = ""
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+        self.file = None
+        self.buffer = ""
+
+    def read_lines(self):
+        """Read the lines appended to the log since the previous call.
+        The log is followed across rotations. The lines logged before the first call are skipped.
+        Returns:
+            list of lines, None if the log file can't be read
+        """
+        try:
+            stat = os.stat(self.path)
+            if self.file is None or stat.st_ino != self.inode or stat.st_size < self.file.tell():
+                rotated = self.inode is not None
+                self.close()
+                self.file = open(self.path, errors="replace")
+                self.inode = stat.st_ino
+                if not rotated:
+                    self.file.seek(0, os.SEEK_END)
+            data = self.file.read()
+        except (IOError, OSError):
+            self.close()
+            return None
+        if not data:
+            return []
+        lines = (self.buffer + data).split("\n")
+        self.buffer = lines.pop()  # incomplete line
+        return lines
+
+    def read_changed_peers(self):
+        """Get the neighbors of the default vrf which changed their state since the previous call.
+        Returns:
+            a tuple: number of new log lines and a set of neighbor addresses,
+            None if the log file can't be read
+        """
+        lines = self.read_lines()
+        if lines is None:
+            return None
+        peers = set()
+        for line in lines:
+            if "%ADJCHANGE" not in line:
+                continue
+            match = self.ADJCHANGE_RE.search(line)
+            if match and match.group(2) == "default":
+                peers.add(match.group(1))
+        return len(lines), peers
+
 
 class BgpStateGet:
     def __init__(self):
@@ -50,6 +128,20 @@ class BgpStateGet:
         self.pipe = swsscommon.RedisPipeline(self.db.get_redis_client(self.db.STATE_DB))
         self.db.delete_all_by_pattern(self.db.STATE_DB, "NEIGH_STATE_TABLE|*" )
         self.MAX_RETRY_ATTEMPTS = 3
+        self.vty = VtyClient("bgpd")
+        self.stats = {
+            'events': 0,
+            'peer_updates': 0,
+            'last_event_latency_ms': 0,
+            'max_event_latency_ms': 0,
+            'reconciliations': 0,
+            'last_reconcile_ms': 0,
+            'cpu_time_ms': 0,
+        }
+
+    @staticmethod
+    def peer_type(remote_as, local_as):
+        return "i-BGP" if remote_as == local_as else "e-BGP"
 
     # A quick way to check if there are anything happening within BGP is to
     # check its log file has any activities. This is by checking its modified
@@ -157,7 +249,7 @@ class BgpStateGet:
                 if self.peer_state[peer] != self.new_peer_state[peer][0]:
                     # state changed. Update state DB for this entry
                     state = self.new_peer_state[peer][0]
-                    peerType = "i-BGP" if self.new_peer_state[peer][1] == self.new_peer_state[peer][2] else "e-BGP"
+                    peerType = self.peer_type(self.new_peer_state[peer][1], self.new_peer_state[peer][2])
                     data[key] = {'state':state, 'peerType':peerType}
                     self.peer_state[peer] = state
                 # remove this neighbor from old set since it is accounted for
@@ -165,7 +257,7 @@ class BgpStateGet:
             else:
                 # New neighbor found case. Add to dictionary and state DB
                 state = self.new_peer_state[peer][0]
-                peerType = "i-BGP" if self.new_peer_state[peer][1] == self.new_peer_state[peer][2] else "e-BGP"
+                peerType = self.peer_type(self.new_peer_state[peer][1], self.new_peer_state[peer][2])
                 data[key] = {'state':state, 'peerType':peerType}
                 self.peer_state[peer] = state
             if len(data) > PIPE_BATCH_MAX_COUNT:
@@ -185,7 +277,136 @@ class BgpStateGet:
         # Save the new set
         self.peer_l = self.new_peer_l.copy()
 
+    # Get the state of a few neighbors, instead of the whole bgp summary.
+    # The commands are pipelined over the bgpd vty socket, vtysh is used if the socket can't be used
+    def get_peer_states(self, peers):
+        """Get the current states of the neighbors
+        Args:
+            peers: list of neighbor addresses
+        Returns:
+            dictionary: neighbor address -> (state, remote as, local as), None if the neighbor doesn't exist
+        """
+        cmds = ["show bgp neighbors {} json".format(peer) for peer in peers]
+        try:
+            outputs = [output for _, output in self.vty.execute(cmds)]
+        except VtyError as e:
+            syslog.syslog(syslog.LOG_WARNING, "*WARNING* bgpd vty socket failed: {}. Fall back to vtysh".format(e))
+            outputs = []
+            for cmd in cmds:
+                rc, output = getstatusoutput_noshell(["vtysh", "-c", cmd])
+                outputs.append(output if rc == 0 else "")
+        peer_states = {}
+        for peer, output in zip(peers, outputs):
+            try:
+                info = json.loads(output).get(peer)
+            except (ValueError, AttributeError):
+                syslog.syslog(syslog.LOG_WARNING, "*WARNING* Can't get the state of neighbor {}".format(peer))
+                continue
+            if isinstance(info, dict) and "bgpState" in info:
+                peer_states[peer] = (info["bgpState"], info.get("remoteAs"), info.get("localAs"))
+            else:
+                peer_states[peer] = None
+        return peer_states
+
+    def update_peer_states(self, peer_states):
+        """Update the state DB for the given neighbors only
+        Args:
+            peer_states: dictionary, see get_peer_states()
+        Returns:
+            number of updated state DB entries
+        """
+        data = {}
+        updates = 0
+        for peer, new_state in peer_states.items():
+            key = "NEIGH_STATE_TABLE|%s" % peer
+            if new_state is None:
+                if peer in self.peer_l:
+                    data[key] = None
+                    self.peer_l.remove(peer)
+                    self.peer_state.pop(peer, None)
+            elif peer not in self.peer_l or self.peer_state.get(peer) != new_state[0]:
+                data[key] = {'state': new_state[0], 'peerType': self.peer_type(new_state[1], new_state[2])}
+                self.peer_l.add(peer)
+                self.peer_state[peer] = new_state[0]
+            if len(data) > PIPE_BATCH_MAX_COUNT:
+                updates += len(data)
+                self.flush_pipe(data)
+        if len(data) > 0:
+            updates += len(data)
+            self.flush_pipe(data)
+        return updates
+
+    def handle_peer_events(self, peers, detected):
+        """Update the neighbors which changed their state
+        Args:
+            peers: set of neighbor addresses
+            detected: time the changes were read from the log
+        """
+        updates = self.update_peer_states(self.get_peer_states(sorted(peers)))
+        latency_ms = int((time.time() - detected) * 1000)
+        self.stats['events'] += len(peers)
+        self.stats['peer_updates'] += updates
+        self.stats['last_event_latency_ms'] = latency_ms
+        self.stats['max_event_latency_ms'] = max(self.stats['max_event_latency_ms'], latency_ms)
+        self.publish_stats()
+
+    def reconcile(self):
+        """Take the full snapshot of the neighbors and update the state DB accordingly"""
+        start = time.time()
+        self.get_all_neigh_states()
+        self.update_neigh_states()
+        self.stats['reconciliations'] += 1
+        self.stats['last_reconcile_ms'] = int((time.time() - start) * 1000)
+        self.publish_stats()
+
+    def publish_stats(self):
+        self.stats['cpu_time_ms'] = int(time.process_time() * 1000)
+        self.flush_pipe({STATS_KEY: {name: str(value) for name, value in self.stats.items()}})
+
+
+def run_poll_mode(bgp_state_get):
+    # periodically obtain the new neighbor information and update if necessary
+    while True:
+        time.sleep(POLL_INTERVAL)
+        if bgp_state_get.bgp_activity_detected():
+            bgp_state_get.get_all_neigh_states()
+            bgp_state_get.update_neigh_states()
+
+
+def run_event_mode(bgp_state_get, reconcile_interval):
+    # update the neighbors as soon as their state changes are logged,
+    # take the full snapshot if there was any bgp activity since the last one
+    tailer = FrrLogTailer()
+    tailer.read_lines()  # skip the log history, the first snapshot has it
+    bgp_state_get.reconcile()
+    last_reconcile = time.time()
+    activity = False
+    while True:
+        time.sleep(EVENT_POLL_INTERVAL)
+        changes = tailer.read_changed_peers()
+        if changes is None:
+            # no log to follow. Default back to constant pulling every 15 seconds
+            interval = POLL_INTERVAL
+            activity = True
+        else:
+            interval = reconcile_interval
+            lines, peers = changes
+            activity = activity or lines > 0
+            if peers:
+                bgp_state_get.handle_peer_events(peers, time.time())
+        if activity and time.time() - last_reconcile >= interval:
+            bgp_state_get.reconcile()
+            last_reconcile = time.time()
+            activity = False
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Populate BGP neighbor states in the state DB")
+    parser.add_argument("--mode", choices=["event", "poll"], default="event",
+                        help="'event': follow the neighbor state changes in frr.log, 'poll': poll the bgp summary every {} seconds".format(POLL_INTERVAL))
+    parser.add_argument("--reconcile-interval", type=int, default=RECONCILE_INTERVAL,
+                        help="seconds between full snapshots of the neighbor states in the event mode")
+    args = parser.parse_args()
 
     syslog.syslog(syslog.LOG_INFO, "bgpmon service started")
     bgp_state_get = None
@@ -195,12 +416,10 @@ def main():
         syslog.syslog(syslog.LOG_ERR, "{}: error exit 1, reason {}".format("THIS_MODULE", str(e)))
         sys.exit(1)
 
-    # periodically obtain the new neighbor information and update if necessary
-    while True:
-        time.sleep(15)
-        if bgp_state_get.bgp_activity_detected():
-            bgp_state_get.get_all_neigh_states()
-            bgp_state_get.update_neigh_states()
+    if args.mode == "poll":
+        run_poll_mode(bgp_state_get)
+    else:
+        run_event_mode(bgp_state_get, args.reconcile_interval)
 
 if __name__ == '__main__':
     main()
@@ -146,6 +146,16 @@ def test_add_peer_without_lo_ipv4_router_id():
         res = m.set_handler("30.30.30.1", {'asn': '65200', 'holdtime': '180', 'keepalive': '60', 'local_addr': '30.30.30.30', 'name': 'TOR', 'nhopself': '0', 'rrclient': '0'})
         assert res, "Expect True return value"
 
+def test_add_peer_later_router_id():
+    for constant in load_constant_files():
+        m = constructor(constant, with_lo0_ipv4=False)
+        m.directory.put("CONFIG_DB", swsscommon.CFG_BGP_DEVICE_GLOBAL_TABLE_NAME, "tsa_enabled", "false")
+        m.handler("30.30.30.1", "SET", {'asn': '65200', 'holdtime': '180', 'keepalive': '60', 'local_addr': '30.30.30.30', 'name': 'TOR', 'nhopself': '0', 'rrclient': '0'})
+        assert "30.30.30.1" in m.set_queue, "Expect the peer to wait for the router id"
+        # bgp_asn, the subscribed path, isn't changed
+        m.directory.put("CONFIG_DB", swsscommon.CFG_DEVICE_METADATA_TABLE_NAME, "localhost", {"bgp_asn": "65100", "bgp_router_id": "8.8.8.8"})
+        assert not m.set_queue, "Expect the peer to be added as soon as the router id is configured"
+
 def test_add_peer_ipv6():
     for constant in load_constant_files():
         m = constructor(constant)
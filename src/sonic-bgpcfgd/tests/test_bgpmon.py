@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+
+from unittest.mock import MagicMock, patch
+
+from . import swsscommon_test
+
+with patch.dict("sys.modules", swsscommon=swsscommon_test):
+    from bgpmon import bgpmon
+
+
+def test_log_tailer():
+    with tempfile.TemporaryDirectory() as log_dir:
+        path = os.path.join(log_dir, "frr.log")
+        with open(path, "w") as f:
+            f.write("bgpd[41]: %ADJCHANGE: neighbor 10.0.0.5(ARISTA03T1) in vrf default Up\n")
+        tailer = bgpmon.FrrLogTailer(path)
+        # The history is skipped
+        assert tailer.read_changed_peers() == (0, set())
+        with open(path, "a") as f:
+            f.write("bgpd[41]: %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T1) in vrf default Up\n")
+            f.write("bgpd[41]: %ADJCHANGE: neighbor fc00::2 in vrf default Down Peer closed the session\n")
+            f.write("bgpd[41]: %ADJCHANGE: neighbor 10.0.0.9 in vrf Vrf1 Up\n")
+            f.write("bgpd[41]: %ADJCHANGE: neighbor 10.0.0.3(ARISTA02T1) in vrf def")
+        assert tailer.read_changed_peers() == (3, {"10.0.0.1", "fc00::2"})
+        with open(path, "a") as f:
+            f.write("ault Up\n")
+        assert tailer.read_changed_peers() == (1, {"10.0.0.3"})
+        # The log was rotated
+        os.rename(path, path + ".1")
+        with open(path, "w") as f:
+            f.write("bgpd[41]: %ADJCHANGE: neighbor 10.0.0.7 in vrf default Up\n")
+        assert tailer.read_changed_peers() == (1, {"10.0.0.7"})
+        os.remove(path)
+        assert tailer.read_changed_peers() is None
+
+
+@patch.object(bgpmon.swsscommon, "SonicV2Connector", MagicMock())
+@patch.object(bgpmon.swsscommon, "RedisPipeline", MagicMock())
+def test_handle_peer_events():
+    bgp_state_get = bgpmon.BgpStateGet()
+    bgp_state_get.peer_l = {"10.0.0.1", "10.0.0.3"}
+    bgp_state_get.peer_state = {"10.0.0.1": "Established", "10.0.0.3": "Established"}
+    bgp_state_get.vty = MagicMock()
+    bgp_state_get.vty.execute.return_value = [
+        (0, json.dumps({"10.0.0.1": {"bgpState": "Active", "remoteAs": 64802, "localAs": 65100}})),
+        (0, json.dumps({"bgpNoSuchNeighbor": True})),
+        (0, json.dumps({"10.0.0.5": {"bgpState": "Established", "remoteAs": 65100, "localAs": 65100}})),
+    ]
+    flushed = []
+    bgp_state_get.flush_pipe = lambda data: flushed.append(dict(data))
+    bgp_state_get.handle_peer_events({"10.0.0.1", "10.0.0.3", "10.0.0.5"}, 0)
+
+    bgp_state_get.vty.execute.assert_called_once_with(["show bgp neighbors 10.0.0.1 json",
+                                                       "show bgp neighbors 10.0.0.3 json",
+                                                       "show bgp neighbors 10.0.0.5 json"])
+    assert flushed[0] == {
+        "NEIGH_STATE_TABLE|10.0.0.1": {"state": "Active", "peerType": "e-BGP"},
+        "NEIGH_STATE_TABLE|10.0.0.3": None,
+        "NEIGH_STATE_TABLE|10.0.0.5": {"state": "Established", "peerType": "i-BGP"},
+    }
+    assert bgp_state_get.peer_l == {"10.0.0.1", "10.0.0.5"}
+    assert bgp_state_get.stats["events"] == 3
+    assert bgp_state_get.stats["peer_updates"] == 3
+    assert flushed[1][bgpmon.STATS_KEY]["peer_updates"] == "3"
@@ -205,3 +205,90 @@ def test_from_canonical():
     c = ConfigMgr(frr)
     raw = c.from_canonical(canonical)
     assert raw == expected
+
+running_config = """!
+ip prefix-list PL_A seq 10 permit 10.0.0.0/8 le 32
+ip prefix-list PL_A seq 20 deny 0.0.0.0/0 le 17
+bgp community-list standard COMMUNITY_A permit 1010:2020
+router bgp 65100
+ neighbor PEER_V4 peer-group
+ address-family ipv4
+  neighbor PEER_V4 route-map FROM_BGP_PEER_V4 in
+ exit-address-family
+exit
+route-map FROM_BGP_PEER_V4 permit 2
+ call RM_A
+ on-match next
+exit
+route-map RM_A permit 65535
+ set community 123:123 additive
+exit
+"""
+
+def test_running_config_index():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value=running_config)
+    c = ConfigMgr(frr)
+    rc = c.get_running_config()
+    assert list(rc.get_prefix_list("ip", "PL_A").items()) == [(10, "permit 10.0.0.0/8 le 32"), (20, "deny 0.0.0.0/0 le 17")]
+    assert rc.get_prefix_list("ipv6", "PL_A") == {}
+    assert rc.get_community_list("COMMUNITY_A") == ["permit 1010:2020"]
+    assert rc.get_route_map("FROM_BGP_PEER_V4")[2] == {'action': 'permit', 'body': ['call RM_A', 'on-match next'], 'exit': True}
+    assert rc.get_peer_groups() == ["PEER_V4"]
+    assert rc.get_route_map_in("PEER_V4") == "FROM_BGP_PEER_V4"
+    assert c.get_text() == [line for line in running_config.split("\n") if not line.startswith("!")] + ["     "]
+
+def test_running_config_incremental():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value=running_config)
+    frr.write = MagicMock(return_value=True)
+    c = ConfigMgr(frr)
+    c.update()
+    c.push_list([
+        "no ip prefix-list PL_A",
+        "ip prefix-list PL_A seq 10 permit 20.0.0.0/8 le 32",
+        "no bgp community-list standard COMMUNITY_A",
+        "bgp community-list standard COMMUNITY_A permit 3030:4040",
+        "route-map RM_A permit 10",
+        " match ip address prefix-list PL_A",
+        " match community COMMUNITY_A",
+        "route-map RM_A permit 65535",
+        " set community 456:456 additive",
+    ])
+    # Pending changes are visible before the commit
+    rc = c.get_running_config()
+    assert list(rc.get_prefix_list("ip", "PL_A").items()) == [(10, "permit 20.0.0.0/8 le 32")]
+    assert rc.get_community_list("COMMUNITY_A") == ["permit 3030:4040"]
+    assert rc.get_route_map("RM_A")[10]['body'] == ["match ip address prefix-list PL_A", "match community COMMUNITY_A"]
+    assert rc.get_route_map("RM_A")[65535]['body'] == ["set community 456:456 additive"]
+    assert c.commit()
+    c.push_list(["no route-map RM_A permit 10"])
+    assert c.commit()
+    assert list(c.get_running_config().get_route_map("RM_A")) == [65535]
+    assert "route-map RM_A permit 10" not in c.get_text()
+    assert "ip prefix-list PL_A seq 10 permit 20.0.0.0/8 le 32" in c.get_text()
+    # The running config was read once
+    assert frr.get_config.call_count == 1
+
+def test_running_config_refresh():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value=running_config)
+    frr.write = MagicMock(return_value=True)
+    c = ConfigMgr(frr)
+    c.update()
+    # The model can't follow changes of other parts of the config
+    c.push("router bgp 65100\n neighbor 10.0.0.1 peer-group PEER_V4")
+    c.update()
+    assert frr.get_config.call_count == 2
+    c.push_list(["ip prefix-list PL_B seq 10 permit 10.0.0.0/8"])
+    assert c.commit()
+    c.update()
+    assert frr.get_config.call_count == 3
+    # The model doesn't match FRR, when the changes weren't written
+    frr.write = MagicMock(return_value=False)
+    c.push_list(["ip prefix-list PL_B seq 10 permit 10.0.0.0/8"])
+    assert not c.commit()
+    c.update()
+    assert frr.get_config.call_count == 4
+    c.update(force=True)
+    assert frr.get_config.call_count == 5
@@ -55,3 +55,41 @@ def test_directory(mocked_log_err):
     # Test remove_slot() with nonexist table
     directory.remove_slot("db_name", "table_nonexist")
     mocked_log_err.assert_called_with("Directory: Can't remove slot 'db_name__table_nonexist'. The slot doesn't exist")
+
+def test_directory_notify():
+    directory = Directory()
+    calls = []
+    asn_handler = lambda: calls.append("asn")
+    slot_handler = lambda: calls.append("slot")
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"),
+                         ("CONFIG_DB", "DEVICE_METADATA", "localhost/type")], asn_handler)
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "")], slot_handler)
+
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"hostname": "switch"})
+    assert calls == ["slot"]
+    # Both paths have become available. The handler runs once
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"hostname": "switch", "bgp_asn": "65100", "type": "ToRRouter"})
+    assert calls == ["slot", "slot", "asn"]
+    # The subscribed paths weren't changed, but other fields of the key were
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"hostname": "switch2", "bgp_asn": "65100", "type": "ToRRouter"})
+    assert calls == ["slot", "slot", "asn", "slot", "asn"]
+    # Nothing was changed
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"hostname": "switch2", "bgp_asn": "65100", "type": "ToRRouter"})
+    directory.put("CONFIG_DB", "DEVICE_NEIGHBOR", "Ethernet0", {"name": "ARISTA01T1"})
+    assert calls == ["slot", "slot", "asn", "slot", "asn"]
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"hostname": "switch2", "bgp_asn": "65200", "type": "ToRRouter"})
+    assert calls == ["slot", "slot", "asn", "slot", "asn", "slot", "asn"]
+
+def test_directory_hold_notifications():
+    directory = Directory()
+    handler = MagicMock()
+    directory.subscribe([("LOCAL", "interfaces", ""), ("LOCAL", "local_addresses", "")], handler)
+    directory.hold_notifications()
+    for i in range(10):
+        directory.put("LOCAL", "interfaces", "Ethernet%d" % i, {})
+        directory.put("LOCAL", "local_addresses", "10.0.0.%d" % i, {})
+    assert not handler.called
+    directory.flush_notifications()
+    handler.assert_called_once()
+    directory.put("LOCAL", "interfaces", "Ethernet100", {})
+    assert handler.call_count == 2
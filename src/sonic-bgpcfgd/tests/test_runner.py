@@ -0,0 +1,150 @@
+from collections import OrderedDict
+from unittest.mock import MagicMock, patch
+
+from . import swsscommon_test
+
+with patch.dict("sys.modules", swsscommon=swsscommon_test):
+    from bgpcfgd import runner
+    from bgpcfgd.runner import Runner
+
+
+class FakeSubscriber(object):
+    def __init__(self, db, table, events):
+        self.db = db
+        self.table = table
+        self.events = list(events)
+
+    def getDbConnector(self):
+        return MagicMock(getDbId=MagicMock(return_value=self.db))
+
+    def getTableName(self):
+        return self.table
+
+    def pop(self):
+        if not self.events:
+            return "", "", ()
+        return self.events.pop(0)
+
+
+def constructor(*subscribers, **kwargs):
+    cfg_mgr = MagicMock()
+    cfg_mgr.commit.return_value = True
+    r = Runner(cfg_mgr, **kwargs)
+    r.selector = MagicMock(TIMEOUT=1, ERROR=2)
+    r.selector.select.return_value = (r.selector.TIMEOUT, None)
+    handled = []
+    for subscriber in subscribers:
+        r.subscribers.add(subscriber)
+        r.callbacks[subscriber.db][subscriber.table].append(
+            lambda key, op, data, table=subscriber.table: handled.append((table, key, op, data)))
+    return r, handled
+
+
+@patch.object(runner.swsscommon, "SET_COMMAND", "SET")
+@patch.object(runner.swsscommon, "DEL_COMMAND", "DEL")
+def test_coalesce():
+    events = OrderedDict()
+    for key, op, data in [("a", "SET", {"v": "1"}),
+                          ("b", "SET", {"v": "1"}),
+                          ("a", "SET", {"v": "2"}),
+                          ("c", "SET", {"v": "1"}),
+                          ("c", "DEL", {}),
+                          ("d", "DEL", {}),
+                          ("d", "SET", {"v": "1"}),
+                          ("d", "SET", {"v": "2"})]:
+        Runner.coalesce(events, (4, "T", key), op, data)
+    assert list(events.items()) == [
+        ((4, "T", "b"), [("SET", {"v": "1"})]),
+        ((4, "T", "a"), [("SET", {"v": "2"})]),
+        ((4, "T", "c"), [("DEL", {})]),
+        ((4, "T", "d"), [("DEL", {}), ("SET", {"v": "2"})]),
+    ]
+
+
+@patch.object(runner.swsscommon, "SET_COMMAND", "SET")
+@patch.object(runner.swsscommon, "DEL_COMMAND", "DEL")
+def test_batch_single_commit():
+    neighbors = FakeSubscriber(4, "BGP_NEIGHBOR", [("10.0.0.1", "SET", (("asn", "1"),)),
+                                                   ("10.0.0.1", "SET", (("asn", "2"),)),
+                                                   ("10.0.0.3", "SET", (("asn", "3"),)),
+                                                   ("10.0.0.3", "DEL", ())])
+    routes = FakeSubscriber(4, "STATIC_ROUTE", [("default|0.0.0.0/0", "SET", (("nexthop", "1.1.1.1"),))])
+    r, handled = constructor(neighbors, routes)
+    events, received = r.collect_events()
+    r.handle_events(events, received)
+
+    assert sorted(handled) == sorted([
+        ("BGP_NEIGHBOR", "10.0.0.1", "SET", {"asn": "2"}),
+        ("BGP_NEIGHBOR", "10.0.0.3", "DEL", {}),
+        ("STATIC_ROUTE", "default|0.0.0.0/0", "SET", {"nexthop": "1.1.1.1"}),
+    ])
+    r.cfg_manager.commit.assert_called_once()
+    assert r.stats["batches"] == 1
+    assert r.stats["events_received"] == 5
+    assert r.stats["events_handled"] == 3
+    assert r.stats["last_batch_size"] == 3
+    assert r.stats["commit_failures"] == 0
+
+
+@patch.object(runner.swsscommon, "SET_COMMAND", "SET")
+@patch.object(runner.swsscommon, "DEL_COMMAND", "DEL")
+def test_collect_events_max_batch():
+    subscriber = FakeSubscriber(4, "T", [("k%d" % i, "SET", ()) for i in range(5)])
+    r, _ = constructor(subscriber, max_batch=3)
+    r.selector.select.return_value = (0, None)  # more events are always ready
+    events, received = r.collect_events()
+    assert received == 3
+    assert [key for _, _, key in events] == ["k0", "k1", "k2"]
+    r.selector.select.assert_not_called()
+    # the other events are left for the next batch
+    assert [key for key, _, _ in subscriber.events] == ["k3", "k4"]
+    events, received = r.collect_events()
+    assert received == 2
+    assert [key for _, _, key in events] == ["k3", "k4"]
+
+
+@patch.object(runner.swsscommon, "SET_COMMAND", "SET")
+@patch.object(runner.swsscommon, "DEL_COMMAND", "DEL")
+def test_collect_events_waits_for_more():
+    subscriber = FakeSubscriber(4, "T", [("k1", "SET", ())])
+    r, _ = constructor(subscriber, max_delay=1000)
+
+    def select(timeout):
+        assert 0 < timeout <= 1000
+        if not subscriber.events and r.selector.select.call_count == 1:
+            subscriber.events.append(("k2", "SET", ()))
+            return 0, None
+        return r.selector.TIMEOUT, None
+
+    r.selector.select.side_effect = select
+    events, received = r.collect_events()
+    assert received == 2
+    assert [key for _, _, key in events] == ["k1", "k2"]
+    assert r.selector.select.call_count == 2
+
+
+@patch.object(runner.swsscommon, "SET_COMMAND", "SET")
+@patch.object(runner.swsscommon, "DEL_COMMAND", "DEL")
+@patch.object(runner, "log_crit")
+def test_commit_failure_stats(mocked_log_crit):
+    r, _ = constructor(FakeSubscriber(4, "T", [("k1", "SET", ())]))
+    r.cfg_manager.commit.return_value = False
+    with patch.object(runner.swsscommon, "Table") as mocked_table:
+        r.handle_events(*r.collect_events())
+        r.handle_events(*r.collect_events())
+    mocked_log_crit.assert_called_with("Runner::commit was unsuccessful")
+    assert r.stats["batches"] == 2
+    assert r.stats["commit_failures"] == 2
+    mocked_table.return_value.set.assert_called()
+    assert mocked_table.return_value.set.call_args[0][0] == Runner.STATS_KEY
+
+
+@patch.object(runner.swsscommon, "SET_COMMAND", "SET")
+@patch.object(runner.swsscommon, "DEL_COMMAND", "DEL")
+def test_batch_directory_notifications():
+    directory = MagicMock()
+    r, handled = constructor(FakeSubscriber(4, "T", [("k1", "SET", ())]), directory=directory)
+    r.cfg_manager.commit.side_effect = lambda: directory.flush_notifications.assert_called_once() or True
+    r.handle_events(*r.collect_events())
+    directory.hold_notifications.assert_called_once()
+    assert handled == [("T", "k1", "SET", {})]
@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock, patch
+
+from . import swsscommon_test
+
+with patch.dict("sys.modules", swsscommon=swsscommon_test):
+    from bgpcfgd import static_rt_timer
+    from bgpcfgd.static_rt_timer import StaticRouteTimer
+
+
+class FakeRedis(object):
+    """ APPL_DB with SCAN and HGETALL """
+    def __init__(self, routes):
+        self.routes = routes
+        self.reads = []
+
+    def scan(self, cursor, match, count):
+        keys = sorted(self.routes)
+        return (cursor + 2 if cursor + 2 < len(keys) else 0), keys[cursor:cursor + 2]
+
+    def get_all(self, db, key):
+        self.reads.append(key)
+        return dict(self.routes.get(key, {}))
+
+
+class FakeCommand(object):
+    def formatHSET(self, key, values):
+        self.op = ("HSET", key, values)
+
+    def formatDEL(self, key):
+        self.op = ("DEL", key)
+
+
+def constructor(routes):
+    fake = FakeRedis(routes)
+    with patch.object(static_rt_timer.swsscommon, "SonicV2Connector") as connector:
+        db = connector.return_value
+        db.get_redis_client.return_value = fake
+        db.get_all.side_effect = fake.get_all
+        timer = StaticRouteTimer()
+    timer.pipe = MagicMock()
+    return timer, fake
+
+
+@patch.object(static_rt_timer.swsscommon, "RedisCommand", FakeCommand)
+def test_sweep():
+    timer, fake = constructor({
+        "STATIC_ROUTE:10.0.0.0/24": {"refresh": "true"},
+        "STATIC_ROUTE:10.0.1.0/24": {"refresh": "false"},
+        "STATIC_ROUTE:10.0.2.0/24": {"expiry": "false"},
+    })
+    with patch.object(static_rt_timer.time, "time", return_value=1000):
+        timer.sweep()
+    # Nothing is due right after the routes were discovered
+    assert len(timer.routes) == 3
+    assert fake.reads == []
+    timer.pipe.push.assert_not_called()
+
+    # A route which was added later has its own expiry time
+    fake.routes["STATIC_ROUTE:10.0.3.0/24"] = {}
+    with patch.object(static_rt_timer.time, "time", return_value=1060):
+        timer.sweep()
+    assert timer.routes["STATIC_ROUTE:10.0.3.0/24"] == 1060 + StaticRouteTimer.DEFAULT_TIMER
+
+    with patch.object(static_rt_timer.time, "time", return_value=1000 + StaticRouteTimer.DEFAULT_TIMER):
+        timer.sweep()
+    assert sorted(fake.reads) == ["STATIC_ROUTE:10.0.0.0/24", "STATIC_ROUTE:10.0.1.0/24", "STATIC_ROUTE:10.0.2.0/24"]
+    assert sorted(call[0][0].op for call in timer.pipe.push.call_args_list) == [
+        ("DEL", "STATIC_ROUTE:10.0.1.0/24"),
+        ("HSET", "STATIC_ROUTE:10.0.0.0/24", {"refresh": "false"}),
+    ]
+    timer.pipe.flush.assert_called_once()
+    assert "STATIC_ROUTE:10.0.1.0/24" not in timer.routes
+    assert timer.stats["last_checked"] == 3
+    assert timer.stats["last_expired"] == 1
+    assert timer.db.hmset.call_args[0][1] == StaticRouteTimer.STATS_KEY
+
+
+def test_sleep_time():
+    timer, _ = constructor({})
+    assert timer.get_sleep_time() == StaticRouteTimer.DEFAULT_SLEEP
+    with patch.object(static_rt_timer.time, "time", return_value=1000):
+        timer.schedule("STATIC_ROUTE:10.0.0.0/24", 1010)
+        assert timer.get_sleep_time() == 10
+        timer.schedule("STATIC_ROUTE:10.0.1.0/24", 900)
+        assert timer.get_sleep_time() == 1
@@ -164,3 +164,19 @@ def test_sentinel_pg():
 def test_sentinel_instance():
     test_data = load_tests("sentinels", "instance.conf")
     run_tests("sentinel_instance", *test_data)
+
+def test_bytecode_cache(tmp_path):
+    test_data = load_tests("general", "policies.conf")
+    tf = TemplateFabric(TEMPLATE_PATH, str(tmp_path))
+    assert tf.precompile() == 0
+    assert any(name.startswith("__bgpcfgd_") for name in os.listdir(str(tmp_path)))
+    # A new fabric renders from the cached bytecode with the same result
+    cached = TemplateFabric(TEMPLATE_PATH, str(tmp_path)).from_file(test_data[0])
+    fresh = TemplateFabric(TEMPLATE_PATH, None).from_file(test_data[0])
+    for _, param_fname, _ in test_data[1]:
+        params = load_json(param_fname)
+        assert cached.render(params) == fresh.render(params)
+
+def test_bytecode_cache_missing_dir(tmp_path):
+    tf = TemplateFabric(TEMPLATE_PATH, str(tmp_path / "nonexistent"))
+    assert tf.env.bytecode_cache is None
@@ -0,0 +1,107 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+import pytest
+from unittest.mock import patch
+
+import bgpcfgd.frr
+from bgpcfgd.vty import VtyClient, VtyError
+
+
+class FakeDaemon(object):
+    """ Answers vty commands like an FRR daemon. Unknown commands fail with status 2 """
+    def __init__(self, vty_dir, name, replies):
+        self.path = os.path.join(vty_dir, "%s.vty" % name)
+        self.replies = replies
+        self.received = []
+        self.connections = 0
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.path)
+        self.server.listen(1)
+        self.thread = threading.Thread(target=self.serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            buf = b""
+            while True:
+                data = conn.recv(4096)
+                if not data:
+                    break
+                buf += data
+                while b"\0" in buf:
+                    command, buf = buf.split(b"\0", 1)
+                    command = command.decode()
+                    self.received.append(command)
+                    status, output = self.replies.get(command, (2, "%% Unknown command: %s\n" % command))
+                    conn.sendall(output.encode() + b"\0\0\0" + bytes([status]))
+            conn.close()
+
+    def close(self):
+        self.server.close()
+
+
+@pytest.fixture
+def vty_dir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+
+def test_execute_pipelined(vty_dir):
+    daemon = FakeDaemon(vty_dir, "bgpd", {"enable": (0, ""),
+                                          "show version": (0, "FRRouting 8.5\n"),
+                                          "clear bgp peer-group PEER_V4 soft in": (0, "")})
+    client = VtyClient("bgpd", vty_dir)
+    replies = client.execute(["show version", "clear bgp peer-group PEER_V4 soft in", "bad command"])
+    assert replies == [(0, "FRRouting 8.5\n"), (0, ""), (2, "% Unknown command: bad command\n")]
+    # The connection is kept open for the next commands
+    assert client.execute(["show version"]) == [(0, "FRRouting 8.5\n")]
+    assert daemon.connections == 1
+    assert daemon.received == ["enable", "show version", "clear bgp peer-group PEER_V4 soft in", "bad command", "show version"]
+    client.close()
+    daemon.close()
+
+
+def test_execute_no_daemon(vty_dir):
+    client = VtyClient("bgpd", vty_dir)
+    with pytest.raises(VtyError):
+        client.execute(["show version"])
+    assert client.sock is None
+
+
+def test_restart_peer_groups_vty(vty_dir):
+    daemon = FakeDaemon(vty_dir, "bgpd", {"enable": (0, ""),
+                                          "clear bgp peer-group pg_1 soft in": (0, ""),
+                                          "clear bgp peer-group pg_2 soft in": (1, "some output")})
+    f = bgpcfgd.frr.FRR(["bgpd"], vty_dir)
+    with patch('bgpcfgd.frr.run_command') as mocked_run_command, \
+         patch('bgpcfgd.frr.log_crit') as mocked_log_crit:
+        assert f.restart_peer_groups(["pg_1"])
+        assert not f.restart_peer_groups(["pg_2", "pg_1"])
+        mocked_run_command.assert_not_called()
+    mocked_log_crit.assert_called_once_with("Can't restart bgp peer-group 'pg_2'. rc='1', out='some output', err=''")
+    assert daemon.connections == 1
+    f.vty("bgpd").close()
+    daemon.close()
+
+
+def test_wait_for_daemons_vty(vty_dir):
+    daemons = [FakeDaemon(vty_dir, name, {"enable": (0, "")}) for name in ("bgpd", "zebra")]
+    f = bgpcfgd.frr.FRR(["bgpd", "zebra"], vty_dir)
+    with patch('bgpcfgd.frr.run_command') as mocked_run_command:
+        f.wait_for_daemons(5)
+        mocked_run_command.assert_not_called()
+    for daemon in daemons:
+        assert daemon.received == ["enable"]
+        f.vty(os.path.basename(daemon.path)[:-len(".vty")]).close()
+        daemon.close()
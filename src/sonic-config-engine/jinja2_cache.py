@@ -0,0 +1,24 @@
+"""
+Jinja2 bytecode cache shared by sonic-cfggen and the daemons rendering
+templates with jinja2, e.g. bgpcfgd
+"""
+
+import jinja2
+
+
+class BytecodeCache(jinja2.FileSystemBytecodeCache):
+    """
+    On-disk jinja2 bytecode cache which never fails a render: a corrupted
+    entry is compiled again and a read-only cache directory is ignored
+    """
+    def load_bytecode(self, bucket):
+        try:
+            super(BytecodeCache, self).load_bytecode(bucket)
+        except Exception:
+            bucket.reset()
+
+    def dump_bytecode(self, bucket):
+        try:
+            super(BytecodeCache, self).dump_bytecode(bucket)
+        except Exception:
+            pass
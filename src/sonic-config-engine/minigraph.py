@@ -6,7 +6,9 @@ import os
 import sys
 import json
 import jinja2
+import pickle
 import subprocess
+import tempfile
 from collections import defaultdict
 
 from lxml import etree as ET
@@ -14,7 +16,7 @@ from lxml.etree import QName
 
 from natsort import natsorted, ns as natsortns
 
-from portconfig import get_port_config, get_fabric_port_config, get_fabric_monitor_config
+from portconfig import get_port_config, get_fabric_port_config, get_fabric_monitor_config, get_port_config_sources
 from sonic_py_common.interface import backplane_prefix
 from sonic_py_common.multi_asic import is_multi_asic
 
@@ -59,6 +61,9 @@ dualtor_cable_types = ["active-active", "active-standby"]
 # Default Virtual Network Index (VNI)
 vni_default = 8000
 
+# Bump whenever the layout of the persisted parse_xml result changes
+MINIGRAPH_CACHE_VERSION = 2
+
 # Defination of custom acl table types
 acl_table_type_defination = {
     'BMCDATA': {
@@ -79,6 +84,16 @@ acl_table_type_defination = {
 #
 ###############################################################################
 
+# Clark notation ('{namespace}tag') of the minigraph tags, built once per tag
+_qname_cache = {}
+
+def qname(namespace, tag):
+    """ Return str(QName(namespace, tag)), computing it only once per (namespace, tag) """
+    try:
+        return _qname_cache[(namespace, tag)]
+    except KeyError:
+        return _qname_cache.setdefault((namespace, tag), str(QName(namespace, tag)))
+
 class minigraph_encoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, (
@@ -124,29 +139,29 @@ def parse_device(device):
     d_subtype = None
 
     for node in device:
-        if node.tag == str(QName(ns, "Address")):
-            lo_prefix = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "AddressV6")):
-            lo_prefix_v6 = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "ManagementAddress")):
-            mgmt_prefix = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "ManagementAddressV6")):
-            mgmt_prefix_v6 = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "Hostname")):
+        if node.tag == qname(ns, "Address"):
+            lo_prefix = node.find(qname(ns2, "IPPrefix")).text
+        elif node.tag == qname(ns, "AddressV6"):
+            lo_prefix_v6 = node.find(qname(ns2, "IPPrefix")).text
+        elif node.tag == qname(ns, "ManagementAddress"):
+            mgmt_prefix = node.find(qname(ns2, "IPPrefix")).text
+        elif node.tag == qname(ns, "ManagementAddressV6"):
+            mgmt_prefix_v6 = node.find(qname(ns2, "IPPrefix")).text
+        elif node.tag == qname(ns, "Hostname"):
             name = node.text
-        elif node.tag == str(QName(ns, "HwSku")):
+        elif node.tag == qname(ns, "HwSku"):
             hwsku = node.text
-        elif node.tag == str(QName(ns, "DeploymentId")):
+        elif node.tag == qname(ns, "DeploymentId"):
             deployment_id = node.text
-        elif node.tag == str(QName(ns, "ElementType")):
+        elif node.tag == qname(ns, "ElementType"):
             d_type = node.text
-        elif node.tag == str(QName(ns, "ClusterName")):
+        elif node.tag == qname(ns, "ClusterName"):
             cluster = node.text
-        elif node.tag == str(QName(ns, "SubType")):
+        elif node.tag == qname(ns, "SubType"):
             d_subtype = node.text
 
-    if d_type is None and str(QName(ns3, "type")) in device.attrib:
-        d_type = device.attrib[str(QName(ns3, "type"))]
+    if d_type is None and qname(ns3, "type") in device.attrib:
+        d_type = device.attrib[qname(ns3, "type")]
 
     return (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, d_subtype)
 
@@ -231,16 +246,18 @@ def parse_png(png, hname, dpg_ecmp_content = None):
     NEIGH = {}
 
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
-                linktype = link.find(str(QName(ns, "ElementType"))).text
+        if child.tag == qname(ns, "DeviceInterfaceLinks"):
+            # Every link is visited once so that the links can be streamed,
+            # see iter_minigraph_sections()
+            for link in child.findall(qname(ns, "DeviceLinkBase")):
+                linktype = link.find(qname(ns, "ElementType")).text
                 if linktype == "DeviceSerialLink":
-                    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-                    endport = link.find(str(QName(ns, "EndPort"))).text
-                    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                    startport = link.find(str(QName(ns, "StartPort"))).text
-                    baudrate = link.find(str(QName(ns, "Bandwidth"))).text
-                    flowcontrol = 1 if link.find(str(QName(ns, "FlowControl"))) is not None and link.find(str(QName(ns, "FlowControl"))).text == 'true' else 0
+                    enddevice = link.find(qname(ns, "EndDevice")).text
+                    endport = link.find(qname(ns, "EndPort")).text
+                    startdevice = link.find(qname(ns, "StartDevice")).text
+                    startport = link.find(qname(ns, "StartPort")).text
+                    baudrate = link.find(qname(ns, "Bandwidth")).text
+                    flowcontrol = 1 if link.find(qname(ns, "FlowControl")) is not None and link.find(qname(ns, "FlowControl")).text == 'true' else 0
                     if enddevice.lower() == hname.lower() and endport.isdigit():
                         console_ports[endport] = {
                             'remote_device': startdevice,
@@ -253,39 +270,56 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                             'baud_rate': baudrate,
                             'flow_control': flowcontrol
                         }
-                    continue
 
-                if linktype == "DeviceInterfaceLink":
-                    endport = link.find(str(QName(ns, "EndPort"))).text
-                    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                    port_device_map[endport] = startdevice
+                elif linktype == "DeviceInterfaceLink" or linktype == "UnderlayInterfaceLink" or linktype == "DeviceMgmtLink":
+                    enddevice = link.find(qname(ns, "EndDevice")).text
+                    endport = link.find(qname(ns, "EndPort")).text
+                    startdevice = link.find(qname(ns, "StartDevice")).text
+                    startport = link.find(qname(ns, "StartPort")).text
+                    bandwidth_node = link.find(qname(ns, "Bandwidth"))
+                    bandwidth = bandwidth_node.text if bandwidth_node is not None else None
+                    if linktype == "DeviceInterfaceLink":
+                        port_device_map[endport] = startdevice
+                    if enddevice.lower() == hname.lower():
+                        if endport in port_alias_map:
+                            endport = port_alias_map[endport]
+                        if linktype != "DeviceMgmtLink":
+                            neighbors[endport] = {'name': startdevice, 'port': startport}
+                        if bandwidth:
+                            port_speeds[endport] = bandwidth
+                    elif startdevice.lower() == hname.lower():
+                        if startport in port_alias_map:
+                            startport = port_alias_map[startport]
+                        if linktype != "DeviceMgmtLink":
+                            neighbors[startport] = {'name': enddevice, 'port': endport}
+                        if bandwidth:
+                            port_speeds[startport] = bandwidth
+
+                elif linktype == "LogicalLink":
+                    intf_name = link.find(qname(ns, "EndPort")).text
+                    start_device = link.find(qname(ns, "StartDevice")).text
+                    if intf_name in port_alias_map:
+                        intf_name = port_alias_map[intf_name]
 
-                if linktype != "DeviceInterfaceLink" and linktype != "UnderlayInterfaceLink" and linktype != "DeviceMgmtLink":
-                    continue
+                    mux_cable_ports[intf_name] = start_device
+
+                if qname(ns3, "type") in link.attrib:
+                    link_type = link.attrib[qname(ns3, "type")]
+                    if link_type == 'DeviceSerialLink':
+                        for node in link:
+                            if node.tag == qname(ns, "EndPort"):
+                                console_port = node.text.split()[-1]
+                            elif node.tag == qname(ns, "EndDevice"):
+                                console_dev = node.text
+                    elif link_type == 'DeviceMgmtLink':
+                        for node in link:
+                            if node.tag == qname(ns, "EndPort"):
+                                mgmt_port = node.text.split()[-1]
+                            elif node.tag == qname(ns, "EndDevice"):
+                                mgmt_dev = node.text
 
-                enddevice = link.find(str(QName(ns, "EndDevice"))).text
-                endport = link.find(str(QName(ns, "EndPort"))).text
-                startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                startport = link.find(str(QName(ns, "StartPort"))).text
-                bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
-                bandwidth = bandwidth_node.text if bandwidth_node is not None else None
-                if enddevice.lower() == hname.lower():
-                    if endport in port_alias_map:
-                        endport = port_alias_map[endport]
-                    if linktype != "DeviceMgmtLink":
-                        neighbors[endport] = {'name': startdevice, 'port': startport}
-                    if bandwidth:
-                        port_speeds[endport] = bandwidth
-                elif startdevice.lower() == hname.lower():
-                    if startport in port_alias_map:
-                        startport = port_alias_map[startport]
-                    if linktype != "DeviceMgmtLink":
-                        neighbors[startport] = {'name': enddevice, 'port': endport}
-                    if bandwidth:
-                        port_speeds[startport] = bandwidth
-
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == qname(ns, "Devices"):
+            for device in child.findall(qname(ns, "Device")):
                 (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, d_subtype) = parse_device(device)
                 device_data = {}
                 if hwsku != None:
@@ -308,34 +342,6 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     device_data['subtype'] = d_subtype
                 devices[name] = device_data
 
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for if_link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if str(QName(ns3, "type")) in if_link.attrib:
-                    link_type = if_link.attrib[str(QName(ns3, "type"))]
-                    if link_type == 'DeviceSerialLink':
-                        for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
-                                console_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
-                                console_dev = node.text
-                    elif link_type == 'DeviceMgmtLink':
-                        for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
-                                mgmt_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
-                                mgmt_dev = node.text
-
-
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if link.find(str(QName(ns, "ElementType"))).text == "LogicalLink":
-                    intf_name = link.find(str(QName(ns, "EndPort"))).text
-                    start_device = link.find(str(QName(ns, "StartDevice"))).text
-                    if intf_name in port_alias_map:
-                        intf_name = port_alias_map[intf_name]
-
-                    mux_cable_ports[intf_name] = start_device
-
         if dpg_ecmp_content and (len(dpg_ecmp_content)):
             for version, content in dpg_ecmp_content.items():  # version is ipv4 or ipv6
                 fine_grained_content = formulate_fine_grained_ecmp(version, content, port_device_map, port_alias_map)  # port_alias_map
@@ -351,11 +357,11 @@ def parse_png(png, hname, dpg_ecmp_content = None):
 def parse_asic_external_link(link, asic_name, hostname):
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link.find(qname(ns, "EndDevice")).text
+    endport = link.find(qname(ns, "EndPort")).text
+    startdevice = link.find(qname(ns, "StartDevice")).text
+    startport = link.find(qname(ns, "StartPort")).text
+    bandwidth_node = link.find(qname(ns, "Bandwidth"))
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     # if chassis internal is false, the interface name will be
     # interface alias which should be converted to asic port name
@@ -377,11 +383,11 @@ def parse_asic_external_link(link, asic_name, hostname):
 def parse_asic_internal_link(link, asic_name, hostname):
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link.find(qname(ns, "EndDevice")).text
+    endport = link.find(qname(ns, "EndPort")).text
+    startdevice = link.find(qname(ns, "StartDevice")).text
+    startport = link.find(qname(ns, "StartPort")).text
+    bandwidth_node = link.find(qname(ns, "Bandwidth"))
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     if ((enddevice.lower() == asic_name.lower()) and
             (startdevice.lower() != hostname.lower())):
@@ -405,13 +411,13 @@ def parse_asic_png(png, asic_name, hostname):
     devices = {}
     port_speeds = {}
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
+        if child.tag == qname(ns, "DeviceInterfaceLinks"):
+            for link in child.findall(qname(ns, "DeviceLinkBase")):
                 # Chassis internal node is used in multi-asic device or chassis minigraph
                 # where the minigraph will contain the internal asic connectivity and
                 # external neighbor information. The ChassisInternal node will be used to
                 # determine if the link is internal to the device or chassis.
-                chassis_internal_node = link.find(str(QName(ns, "ChassisInternal")))
+                chassis_internal_node = link.find(qname(ns, "ChassisInternal"))
                 chassis_internal = chassis_internal_node.text if chassis_internal_node is not None else "false"
 
                 # If the link is an external link include the external neighbor
@@ -425,8 +431,8 @@ def parse_asic_png(png, asic_name, hostname):
                     neighbors.update(int_neighbors)
                     port_speeds.update(int_port_speeds)
 
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == qname(ns, "Devices"):
+            for device in child.findall(qname(ns, "Device")):
                 (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, _) = parse_device(device)
                 device_data = {}
                 if hwsku != None:
@@ -451,11 +457,11 @@ def parse_asic_png(png, asic_name, hostname):
 
 
 def parse_loopback_intf(child):
-    lointfs = child.find(str(QName(ns, "LoopbackIPInterfaces")))
+    lointfs = child.find(qname(ns, "LoopbackIPInterfaces"))
     lo_intfs = {}
-    for lointf in lointfs.findall(str(QName(ns1, "LoopbackIPInterface"))):
-        intfname = lointf.find(str(QName(ns, "AttachTo"))).text
-        ipprefix = lointf.find(str(QName(ns1, "PrefixStr"))).text
+    for lointf in lointfs.findall(qname(ns1, "LoopbackIPInterface")):
+        intfname = lointf.find(qname(ns, "AttachTo")).text
+        ipprefix = lointf.find(qname(ns1, "PrefixStr")).text
         lo_intfs[(intfname, ipprefix)] = {}
     return lo_intfs
 
@@ -488,91 +494,91 @@ def parse_dpg(dpg, hname):
             There is just one aclintf node in the minigraph
             Get the aclintfs node first.
         """
-        if not aclintfs and child.find(str(QName(ns, "AclInterfaces"))) is not None and child.find(str(QName(ns, "AclInterfaces"))).findall(str(QName(ns, "AclInterface"))):
-            aclintfs = child.find(str(QName(ns, "AclInterfaces"))).findall(str(QName(ns, "AclInterface")))
+        if not aclintfs and child.find(qname(ns, "AclInterfaces")) is not None and child.find(qname(ns, "AclInterfaces")).findall(qname(ns, "AclInterface")):
+            aclintfs = child.find(qname(ns, "AclInterfaces")).findall(qname(ns, "AclInterface"))
         """
             In Multi-NPU platforms the mgmt intfs are defined only for the host not for individual asic
             There is just one mgmtintf node in the minigraph
             Get the mgmtintfs node first. We need mgmt intf to get mgmt ip in per asic dockers.
         """
-        if not mgmtintfs and child.find(str(QName(ns, "ManagementIPInterfaces"))) is not None and  child.find(str(QName(ns, "ManagementIPInterfaces"))).findall(str(QName(ns1, "ManagementIPInterface"))):
-            mgmtintfs = child.find(str(QName(ns, "ManagementIPInterfaces"))).findall(str(QName(ns1, "ManagementIPInterface")))
-        hostname = child.find(str(QName(ns, "Hostname")))
+        if not mgmtintfs and child.find(qname(ns, "ManagementIPInterfaces")) is not None and  child.find(qname(ns, "ManagementIPInterfaces")).findall(qname(ns1, "ManagementIPInterface")):
+            mgmtintfs = child.find(qname(ns, "ManagementIPInterfaces")).findall(qname(ns1, "ManagementIPInterface"))
+        hostname = child.find(qname(ns, "Hostname"))
         if hostname.text.lower() != hname.lower():
             continue
 
         vni = vni_default
-        vni_element = child.find(str(QName(ns, "VNI")))
+        vni_element = child.find(qname(ns, "VNI"))
         if vni_element != None:
             if vni_element.text.isdigit():
                 vni = int(vni_element.text)
             else:
                 print("VNI must be an integer (use default VNI %d instead)" % vni_default, file=sys.stderr)
 
-        ipintfs = child.find(str(QName(ns, "IPInterfaces")))
+        ipintfs = child.find(qname(ns, "IPInterfaces"))
         intfs = {}
         ip_intfs_map = {}
-        for ipintf in ipintfs.findall(str(QName(ns, "IPInterface"))):
-            intfalias = ipintf.find(str(QName(ns, "AttachTo"))).text
+        for ipintf in ipintfs.findall(qname(ns, "IPInterface")):
+            intfalias = ipintf.find(qname(ns, "AttachTo")).text
             intfname = port_alias_map.get(intfalias, intfalias)
-            ipprefix = ipintf.find(str(QName(ns, "Prefix"))).text
+            ipprefix = ipintf.find(qname(ns, "Prefix")).text
             intfs[(intfname, ipprefix)] = {}
             ip_intfs_map[ipprefix] = intfalias
         lo_intfs = parse_loopback_intf(child)
 
-        subintfs = child.find(str(QName(ns, "SubInterfaces")))
+        subintfs = child.find(qname(ns, "SubInterfaces"))
         if subintfs is not None:
-            for subintf in subintfs.findall(str(QName(ns, "SubInterface"))):
-                intfalias = subintf.find(str(QName(ns, "AttachTo"))).text
+            for subintf in subintfs.findall(qname(ns, "SubInterface")):
+                intfalias = subintf.find(qname(ns, "AttachTo")).text
                 intfname = port_alias_map.get(intfalias, intfalias)
-                ipprefix = subintf.find(str(QName(ns, "Prefix"))).text
-                subintfvlan = subintf.find(str(QName(ns, "Vlan"))).text
+                ipprefix = subintf.find(qname(ns, "Prefix")).text
+                subintfvlan = subintf.find(qname(ns, "Vlan")).text
                 subintfname = intfname + VLAN_SUB_INTERFACE_SEPARATOR + subintfvlan
                 intfs[(subintfname, ipprefix)] = {}
 
-        mvrfConfigs = child.find(str(QName(ns, "MgmtVrfConfigs")))
+        mvrfConfigs = child.find(qname(ns, "MgmtVrfConfigs"))
         mvrf = {}
         if mvrfConfigs != None:
-            mv = mvrfConfigs.find(str(QName(ns1, "MgmtVrfGlobal")))
+            mv = mvrfConfigs.find(qname(ns1, "MgmtVrfGlobal"))
             if mv != None:
-                mvrf_en_flag = mv.find(str(QName(ns, "mgmtVrfEnabled"))).text
+                mvrf_en_flag = mv.find(qname(ns, "mgmtVrfEnabled")).text
                 mvrf["vrf_global"] = {"mgmtVrfEnabled": mvrf_en_flag}
 
         mgmt_intf = {}
         for mgmtintf in mgmtintfs:
-            intfname = mgmtintf.find(str(QName(ns, "AttachTo"))).text
-            ipprefix = mgmtintf.find(str(QName(ns1, "PrefixStr"))).text
+            intfname = mgmtintf.find(qname(ns, "AttachTo")).text
+            ipprefix = mgmtintf.find(qname(ns1, "PrefixStr")).text
             mgmtipn = ipaddress.ip_network(UNICODE_TYPE(ipprefix), False)
             gwaddr = ipaddress.ip_address(next(mgmtipn.hosts()))
             mgmt_intf[(intfname, ipprefix)] = {'gwaddr': gwaddr}
 
-        voqinbandintfs = child.find(str(QName(ns, "VoqInbandInterfaces")))
+        voqinbandintfs = child.find(qname(ns, "VoqInbandInterfaces"))
         voq_inband_intfs = {}
         if voqinbandintfs:
-            for voqintf in voqinbandintfs.findall(str(QName(ns1, "VoqInbandInterface"))):
-                intfname = voqintf.find(str(QName(ns, "Name"))).text
-                intftype = voqintf.find(str(QName(ns, "Type"))).text
-                ipprefix = voqintf.find(str(QName(ns1, "PrefixStr"))).text
+            for voqintf in voqinbandintfs.findall(qname(ns1, "VoqInbandInterface")):
+                intfname = voqintf.find(qname(ns, "Name")).text
+                intftype = voqintf.find(qname(ns, "Type")).text
+                ipprefix = voqintf.find(qname(ns1, "PrefixStr")).text
                 if intfname not in voq_inband_intfs:
                    voq_inband_intfs[intfname] = {'inband_type': intftype}
                 voq_inband_intfs["%s|%s" % (intfname, ipprefix)] = {}
 
-        pcintfs = child.find(str(QName(ns, "PortChannelInterfaces")))
+        pcintfs = child.find(qname(ns, "PortChannelInterfaces"))
         pc_intfs = []
         pcs = {}
         pc_members = {}
         intfs_inpc = [] # List to hold all the LAG member interfaces
-        for pcintf in pcintfs.findall(str(QName(ns, "PortChannel"))):
-            pcintfname = pcintf.find(str(QName(ns, "Name"))).text
-            pcintfmbr = pcintf.find(str(QName(ns, "AttachTo"))).text
+        for pcintf in pcintfs.findall(qname(ns, "PortChannel")):
+            pcintfname = pcintf.find(qname(ns, "Name")).text
+            pcintfmbr = pcintf.find(qname(ns, "AttachTo")).text
             pcmbr_list = pcintfmbr.split(';')
             pc_intfs.append(pcintfname)
             for i, member in enumerate(pcmbr_list):
                 pcmbr_list[i] = port_alias_map.get(member, member)
                 intfs_inpc.append(pcmbr_list[i])
                 pc_members[(pcintfname, pcmbr_list[i])] = {}
-            if pcintf.find(str(QName(ns, "Fallback"))) != None:
-                pcs[pcintfname] = {'fallback': pcintf.find(str(QName(ns, "Fallback"))).text, 'min_links': str(int(math.ceil(len() * 0.75))), 'lacp_key': 'auto'}
+            if pcintf.find(qname(ns, "Fallback")) != None:
+                pcs[pcintfname] = {'fallback': pcintf.find(qname(ns, "Fallback")).text, 'min_links': str(int(math.ceil(len() * 0.75))), 'lacp_key': 'auto'}
             else:
                 pcs[pcintfname] = {'min_links': str(int(math.ceil(len(pcmbr_list) * 0.75))), 'lacp_key': 'auto' }
         port_nhipv4_map = {}
@@ -581,26 +587,26 @@ def parse_dpg(dpg, hname):
         nhportlist = []
         dpg_ecmp_content = {}
         static_routes = {}
-        ipnhs = child.find(str(QName(ns, "IPNextHops")))
+        ipnhs = child.find(qname(ns, "IPNextHops"))
         if ipnhs is not None:
-            for ipnh in ipnhs.findall(str(QName(ns, "IPNextHop"))):
-                if ipnh.find(str(QName(ns, "Type"))).text == 'FineGrainedECMPGroupMember':
-                    ipnhfmbr = ipnh.find(str(QName(ns, "AttachTo"))).text
-                    ipnhaddr = ipnh.find(str(QName(ns, "Address"))).text
+            for ipnh in ipnhs.findall(qname(ns, "IPNextHop")):
+                if ipnh.find(qname(ns, "Type")).text == 'FineGrainedECMPGroupMember':
+                    ipnhfmbr = ipnh.find(qname(ns, "AttachTo")).text
+                    ipnhaddr = ipnh.find(qname(ns, "Address")).text
                     nhportlist.append(ipnhfmbr)
                     if "." in ipnhaddr:
                         port_nhipv4_map[ipnhfmbr] = ipnhaddr
                     elif ":" in ipnhaddr:
                         port_nhipv6_map[ipnhfmbr] = ipnhaddr
-                elif ipnh.find(str(QName(ns, "Type"))).text == 'StaticRoute':
-                    prefix = ipnh.find(str(QName(ns, "Address"))).text
+                elif ipnh.find(qname(ns, "Type")).text == 'StaticRoute':
+                    prefix = ipnh.find(qname(ns, "Address")).text
                     ifname = []
                     nexthop = []
-                    for nexthop_tuple in ipnh.find(str(QName(ns, "AttachTo"))).text.split(";"):
+                    for nexthop_tuple in ipnh.find(qname(ns, "AttachTo")).text.split(";"):
                         ifname.append(nexthop_tuple.split(",")[0])
                         nexthop.append(nexthop_tuple.split(",")[1])
-                    if ipnh.find(str(QName(ns, "Advertise"))):
-                       advertise = ipnh.find(str(QName(ns, "Advertise"))).text
+                    if ipnh.find(qname(ns, "Advertise")):
+                       advertise = ipnh.find(qname(ns, "Advertise")).text
                     else:
                         advertise = "false"
                     if '/' not in prefix:
@@ -624,30 +630,30 @@ def parse_dpg(dpg, hname):
                 dpg_ecmp_content['ipv4'] = ipv4_content
                 dpg_ecmp_content['ipv6'] = ipv6_content
 
-        vlanintfs = child.find(str(QName(ns, "VlanInterfaces")))
+        vlanintfs = child.find(qname(ns, "VlanInterfaces"))
         vlans = {}
         vlan_members = {}
         vlan_member_list = {}
         dhcp_relay_table = {}
         # Dict: vlan member (port/PortChannel) -> set of VlanID, in which the member if an untagged vlan member
         untagged_vlan_mbr = defaultdict(set)
-        for vintf in vlanintfs.findall(str(QName(ns, "VlanInterface"))):
-            vlanid = vintf.find(str(QName(ns, "VlanID"))).text
-            vlantype = vintf.find(str(QName(ns, "Type")))
+        for vintf in vlanintfs.findall(qname(ns, "VlanInterface")):
+            vlanid = vintf.find(qname(ns, "VlanID")).text
+            vlantype = vintf.find(qname(ns, "Type"))
             if vlantype is None:
                 vlantype_name = ""
             else:
                 vlantype_name = vlantype.text
-            vintfmbr = vintf.find(str(QName(ns, "AttachTo"))).text
+            vintfmbr = vintf.find(qname(ns, "AttachTo")).text
             vmbr_list = vintfmbr.split(';')
             if vlantype_name != "Tagged":
                 for member in vmbr_list:
                     untagged_vlan_mbr[member].add(vlanid)
-        for vintf in vlanintfs.findall(str(QName(ns, "VlanInterface"))):
-            vintfname = vintf.find(str(QName(ns, "Name"))).text
-            vlanid = vintf.find(str(QName(ns, "VlanID"))).text
-            vintfmbr = vintf.find(str(QName(ns, "AttachTo"))).text
-            vlantype = vintf.find(str(QName(ns, "Type")))
+        for vintf in vlanintfs.findall(qname(ns, "VlanInterface")):
+            vintfname = vintf.find(qname(ns, "Name")).text
+            vlanid = vintf.find(qname(ns, "VlanID")).text
+            vintfmbr = vintf.find(qname(ns, "AttachTo")).text
+            vlantype = vintf.find(qname(ns, "Type"))
             if vlantype is None:
                 vlantype_name = ""
             else:
@@ -668,13 +674,13 @@ def parse_dpg(dpg, hname):
 
             # If this VLAN requires a DHCP relay agent, it will contain a <DhcpRelays> element
             # containing a list of DHCP server IPs
-            vintf_node = vintf.find(str(QName(ns, "DhcpRelays")))
+            vintf_node = vintf.find(qname(ns, "DhcpRelays"))
             if vintf_node is not None and vintf_node.text is not None:
                 vintfdhcpservers = vintf_node.text
                 vdhcpserver_list = vintfdhcpservers.split(';')
                 vlan_attributes['dhcp_servers'] = vdhcpserver_list
 
-            vintf_node = vintf.find(str(QName(ns, "Dhcpv6Relays")))
+            vintf_node = vintf.find(qname(ns, "Dhcpv6Relays"))
             if vintf_node is not None and vintf_node.text is not None:
                 vintfdhcpservers = vintf_node.text
                 vdhcpserver_list = vintfdhcpservers.split(';')
@@ -683,11 +689,11 @@ def parse_dpg(dpg, hname):
                 sonic_vlan_member_name = "Vlan%s" % (vlanid)
                 dhcp_relay_table[sonic_vlan_member_name] = dhcp_attributes
 
-            vlanmac = vintf.find(str(QName(ns, "MacAddress")))
+            vlanmac = vintf.find(qname(ns, "MacAddress"))
             if vlanmac is not None and vlanmac.text is not None:
                 vlan_attributes['mac'] = vlanmac.text
 
-            vintf_node = vintf.find(str(QName(ns, "SecondarySubnets")))
+            vintf_node = vintf.find(qname(ns, "SecondarySubnets"))
             if vintf_node is not None and vintf_node.text is not None:
                 subnets = vintf_node.text.split(';')
                 for subnet in subnets:
@@ -705,15 +711,15 @@ def parse_dpg(dpg, hname):
             vlan_member_list[sonic_vlan_name] = vmbr_list
 
         for aclintf in aclintfs:
-            if aclintf.find(str(QName(ns, "InAcl"))) is not None:
-                aclname = aclintf.find(str(QName(ns, "InAcl"))).text.upper().replace(" ", "_").replace("-", "_")
+            if aclintf.find(qname(ns, "InAcl")) is not None:
+                aclname = aclintf.find(qname(ns, "InAcl")).text.upper().replace(" ", "_").replace("-", "_")
                 stage = "ingress"
-            elif aclintf.find(str(QName(ns, "OutAcl"))) is not None:
-                aclname = aclintf.find(str(QName(ns, "OutAcl"))).text.upper().replace(" ", "_").replace("-", "_")
+            elif aclintf.find(qname(ns, "OutAcl")) is not None:
+                aclname = aclintf.find(qname(ns, "OutAcl")).text.upper().replace(" ", "_").replace("-", "_")
                 stage = "egress"
             else:
                 sys.exit("Error: 'AclInterface' must contain either an 'InAcl' or 'OutAcl' subelement.")
-            aclattach = aclintf.find(str(QName(ns, "AttachTo"))).text.split(';')
+            aclattach = aclintf.find(qname(ns, "AttachTo")).text.split(';')
             acl_intfs = []
             is_bmc_data = False
             is_bmc_data_v6 = False
@@ -799,7 +805,7 @@ def parse_dpg(dpg, hname):
                         if panel_port not in intfs_inpc and panel_port not in acl_intfs:
                             acl_intfs.append(panel_port)
                     break
-            if aclintf.find(str(QName(ns, "Type"))) is not None and aclintf.find(str(QName(ns, "Type"))).text.upper() == "BMCDATA":
+            if aclintf.find(qname(ns, "Type")) is not None and aclintf.find(qname(ns, "Type")).text.upper() == "BMCDATA":
                 if 'v6' in aclname.lower():
                     is_bmc_data_v6 = True
                     acl_table_types['BMCDATAV6'] = acl_table_type_defination['BMCDATAV6']
@@ -835,7 +841,7 @@ def parse_dpg(dpg, hname):
             else:
                 # This ACL has no interfaces to attach to -- consider this a control plane ACL
                 try:
-                    aclservice = aclintf.find(str(QName(ns, "Type"))).text
+                    aclservice = aclintf.find(qname(ns, "Type")).text
 
                     # If we already have an ACL with this name and this ACL is bound to a different service,
                     # append the service to our list of services
@@ -855,7 +861,7 @@ def parse_dpg(dpg, hname):
                     print("Warning: Ignoring Control Plane ACL %s without type" % aclname, file=sys.stderr)
 
 
-        mg_tunnels = child.find(str(QName(ns, "TunnelInterfaces")))
+        mg_tunnels = child.find(qname(ns, "TunnelInterfaces"))
         if mg_tunnels is not None:
             table_key_to_mg_key_map = {"encap_ecn_mode": "EcnEncapsulationMode",
                                        "ecn_mode": "EcnDecapsulationMode",
@@ -868,7 +874,7 @@ def parse_dpg(dpg, hname):
                                        "encap_tc_to_queue_map": "EncapTcToQueueMap",
                                        "encap_tc_to_dscp_map": "EncapTcToDscpMap"}
 
-            for mg_tunnel in mg_tunnels.findall(str(QName(ns, "TunnelInterface"))):
+            for mg_tunnel in mg_tunnels.findall(qname(ns, "TunnelInterface")):
                 tunnel_type = mg_tunnel.attrib["Type"]
                 tunnel_name = mg_tunnel.attrib["Name"]
                 tunnelintfs[tunnel_type][tunnel_name] = {
@@ -893,7 +899,7 @@ def parse_dpg(dpg, hname):
 
 def parse_host_loopback(dpg, hname):
     for child in dpg:
-        hostname = child.find(str(QName(ns, "Hostname")))
+        hostname = child.find(qname(ns, "Hostname"))
         if hostname.text.lower() != hname.lower():
             continue
         lo_intfs = parse_loopback_intf(child)
@@ -909,25 +915,25 @@ def parse_cpg(cpg, hname, local_devices=[]):
     bgp_sentinel_sessions = {}
     for child in cpg:
         tag = child.tag
-        if tag == str(QName(ns, "PeeringSessions")):
-            for session in child.findall(str(QName(ns, "BGPSession"))):
-                start_router = session.find(str(QName(ns, "StartRouter"))).text
-                start_peer = session.find(str(QName(ns, "StartPeer"))).text
-                end_router = session.find(str(QName(ns, "EndRouter"))).text
-                end_peer = session.find(str(QName(ns, "EndPeer"))).text
-                rrclient = 1 if session.find(str(QName(ns, "RRClient"))) is not None else 0
-                if session.find(str(QName(ns, "HoldTime"))) is not None:
-                    holdtime = session.find(str(QName(ns, "HoldTime"))).text
+        if tag == qname(ns, "PeeringSessions"):
+            for session in child.findall(qname(ns, "BGPSession")):
+                start_router = session.find(qname(ns, "StartRouter")).text
+                start_peer = session.find(qname(ns, "StartPeer")).text
+                end_router = session.find(qname(ns, "EndRouter")).text
+                end_peer = session.find(qname(ns, "EndPeer")).text
+                rrclient = 1 if session.find(qname(ns, "RRClient")) is not None else 0
+                if session.find(qname(ns, "HoldTime")) is not None:
+                    holdtime = session.find(qname(ns, "HoldTime")).text
                 else:
                     holdtime = 180
-                if session.find(str(QName(ns, "KeepAliveTime"))) is not None:
-                    keepalive = session.find(str(QName(ns, "KeepAliveTime"))).text
+                if session.find(qname(ns, "KeepAliveTime")) is not None:
+                    keepalive = session.find(qname(ns, "KeepAliveTime")).text
                 else:
                     keepalive = 60
-                nhopself = 1 if session.find(str(QName(ns, "NextHopSelf"))) is not None else 0
+                nhopself = 1 if session.find(qname(ns, "NextHopSelf")) is not None else 0
 
                 # choose the right table and admin_status for the peer
-                chassis_internal_ibgp = session.find(str(QName(ns, "ChassisInternal")))
+                chassis_internal_ibgp = session.find(qname(ns, "ChassisInternal"))
                 if chassis_internal_ibgp is not None and chassis_internal_ibgp.text == "voq":
                     table = bgp_voq_chassis_sessions
                     admin_status = 'up'
@@ -963,35 +969,35 @@ def parse_cpg(cpg, hname, local_devices=[]):
                     }
                     if admin_status:
                         table[end_peer.lower()]['admin_status'] = admin_status
-        elif child.tag == str(QName(ns, "Routers")):
-            for router in child.findall(str(QName(ns1, "BGPRouterDeclaration"))):
-                asn = router.find(str(QName(ns1, "ASN"))).text
-                hostname = router.find(str(QName(ns1, "Hostname"))).text
+        elif child.tag == qname(ns, "Routers"):
+            for router in child.findall(qname(ns1, "BGPRouterDeclaration")):
+                asn = router.find(qname(ns1, "ASN")).text
+                hostname = router.find(qname(ns1, "Hostname")).text
                 if hostname.lower() == hname.lower():
                     myasn = asn
-                    peers = router.find(str(QName(ns1, "Peers")))
-                    for bgpPeer in peers.findall(str(QName(ns, "BGPPeer"))):
-                        addr = bgpPeer.find(str(QName(ns, "Address"))).text
-                        if bgpPeer.find(str(QName(ns1, "PeersRange"))) is not None: # FIXME: is better to check for type BGPPeerPassive
-                            name = bgpPeer.find(str(QName(ns1, "Name"))).text
-                            ip_range = bgpPeer.find(str(QName(ns1, "PeersRange"))).text
+                    peers = router.find(qname(ns1, "Peers"))
+                    for bgpPeer in peers.findall(qname(ns, "BGPPeer")):
+                        addr = bgpPeer.find(qname(ns, "Address")).text
+                        if bgpPeer.find(qname(ns1, "PeersRange")) is not None: # FIXME: is better to check for type BGPPeerPassive
+                            name = bgpPeer.find(qname(ns1, "Name")).text
+                            ip_range = bgpPeer.find(qname(ns1, "PeersRange")).text
                             ip_range_group = ip_range.split(';') if ip_range and ip_range != "" else []
                             if name == "BGPSentinel" or name == "BGPSentinelV6":
                                 bgp_sentinel_sessions[name] = {
                                     'name': name,
                                     'ip_range': ip_range_group
                                 }
-                                if bgpPeer.find(str(QName(ns, "Address"))) is not None:
-                                    bgp_sentinel_sessions[name]['src_address'] = bgpPeer.find(str(QName(ns, "Address"))).text
+                                if bgpPeer.find(qname(ns, "Address")) is not None:
+                                    bgp_sentinel_sessions[name]['src_address'] = bgpPeer.find(qname(ns, "Address")).text
                             else:
                                 bgp_peers_with_range[name] = {
                                     'name': name,
                                     'ip_range': ip_range_group
                                 }
-                                if bgpPeer.find(str(QName(ns, "Address"))) is not None:
-                                    bgp_peers_with_range[name]['src_address'] = bgpPeer.find(str(QName(ns, "Address"))).text
-                                if bgpPeer.find(str(QName(ns1, "PeerAsn"))) is not None:
-                                    bgp_peers_with_range[name]['peer_asn'] = bgpPeer.find(str(QName(ns1, "PeerAsn"))).text
+                                if bgpPeer.find(qname(ns, "Address")) is not None:
+                                    bgp_peers_with_range[name]['src_address'] = bgpPeer.find(qname(ns, "Address")).text
+                                if bgpPeer.find(qname(ns1, "PeerAsn")) is not None:
+                                    bgp_peers_with_range[name]['peer_asn'] = bgpPeer.find(qname(ns1, "PeerAsn")).text
                 else:
                     for peer in bgp_sessions:
                         bgp_session = bgp_sessions[peer]
@@ -1039,13 +1045,13 @@ def parse_meta(meta, hname):
     qos_profile = None
     rack_mgmt_map = None
 
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
+    device_metas = meta.find(qname(ns, "Devices"))
+    for device in device_metas.findall(qname(ns1, "DeviceMetadata")):
+        if device.find(qname(ns1, "Name")).text.lower() == hname.lower():
+            properties = device.find(qname(ns1, "Properties"))
+            for device_property in properties.findall(qname(ns1, "DeviceProperty")):
+                name = device_property.find(qname(ns1, "Name")).text
+                value = device_property.find(qname(ns1, "Value")).text
                 value_group = value.strip().split(';') if value and value != "" else []
                 if name == "DhcpResources":
                     dhcp_servers = value_group
@@ -1093,14 +1099,14 @@ def parse_meta(meta, hname):
 
 
 def parse_linkmeta(meta, hname):
-    link = meta.find(str(QName(ns, "Link")))
+    link = meta.find(qname(ns, "Link"))
     linkmetas = {}
-    for linkmeta in link.findall(str(QName(ns1, "LinkMetadata"))):
+    for linkmeta in link.findall(qname(ns1, "LinkMetadata")):
         port = None
         fec_disabled = None
 
         # Sample: ARISTA05T1:Ethernet1/33;switch-t0:fortyGigE0/4
-        key = linkmeta.find(str(QName(ns1, "Key"))).text
+        key = linkmeta.find(qname(ns1, "Key")).text
         endpoints = key.split(';')
         for endpoint in endpoints:
             t = endpoint.split(':')
@@ -1118,10 +1124,10 @@ def parse_linkmeta(meta, hname):
         macsec_enabled = False
         tx_power = None
         laser_freq = None
-        properties = linkmeta.find(str(QName(ns1, "Properties")))
-        for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-            name = device_property.find(str(QName(ns1, "Name"))).text
-            value = device_property.find(str(QName(ns1, "Value"))).text
+        properties = linkmeta.find(qname(ns1, "Properties"))
+        for device_property in properties.findall(qname(ns1, "DeviceProperty")):
+            name = device_property.find(qname(ns1, "Name")).text
+            value = device_property.find(qname(ns1, "Value")).text
             if name == "FECDisabled":
                 fec_disabled = value
             elif name in [ "GeminiPeeringLink", "LibraPeeringLink" ]:
@@ -1177,13 +1183,13 @@ def parse_asic_meta(meta, hname):
     max_cores = None
     deployment_id = None
     macsec_profile = {}
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
+    device_metas = meta.find(qname(ns, "Devices"))
+    for device in device_metas.findall(qname(ns1, "DeviceMetadata")):
+        if device.find(qname(ns1, "Name")).text.lower() == hname.lower():
+            properties = device.find(qname(ns1, "Properties"))
+            for device_property in properties.findall(qname(ns1, "DeviceProperty")):
+                name = device_property.find(qname(ns1, "Name")).text
+                value = device_property.find(qname(ns1, "Value")).text
                 if name == "SubRole":
                     sub_role = value
                 elif name == "SwitchId":
@@ -1203,31 +1209,31 @@ def parse_deviceinfo(meta, hwsku):
     port_speeds = {}
     port_descriptions = {}
     sys_ports = {}
-    for device_info in meta.findall(str(QName(ns, "DeviceInfo"))):
-        dev_sku = device_info.find(str(QName(ns, "HwSku"))).text
+    for device_info in meta.findall(qname(ns, "DeviceInfo")):
+        dev_sku = device_info.find(qname(ns, "HwSku")).text
         if dev_sku == hwsku:
-            interfaces = device_info.find(str(QName(ns, "EthernetInterfaces"))).findall(str(QName(ns1, "EthernetInterface")))
-            interfaces = interfaces + device_info.find(str(QName(ns, "ManagementInterfaces"))).findall(str(QName(ns1, "ManagementInterface")))
+            interfaces = device_info.find(qname(ns, "EthernetInterfaces")).findall(qname(ns1, "EthernetInterface"))
+            interfaces = interfaces + device_info.find(qname(ns, "ManagementInterfaces")).findall(qname(ns1, "ManagementInterface"))
             for interface in interfaces:
-                alias = interface.find(str(QName(ns, "InterfaceName"))).text
-                speed = interface.find(str(QName(ns, "Speed"))).text
-                desc  = interface.find(str(QName(ns, "Description")))
+                alias = interface.find(qname(ns, "InterfaceName")).text
+                speed = interface.find(qname(ns, "Speed")).text
+                desc  = interface.find(qname(ns, "Description"))
                 if desc != None:
                     port_descriptions[port_alias_map.get(alias, alias)] = desc.text
                 port_speeds[port_alias_map.get(alias, alias)] = speed
 
-            sysports = device_info.find(str(QName(ns, "SystemPorts")))
+            sysports = device_info.find(qname(ns, "SystemPorts"))
             if sysports is not None:
-                for sysport in sysports.findall(str(QName(ns, "SystemPort"))):
-                    portname = sysport.find(str(QName(ns, "Name"))).text
-                    hostname = sysport.find(str(QName(ns, "Hostname")))
-                    asic_name = sysport.find(str(QName(ns, "AsicName")))
-                    system_port_id = sysport.find(str(QName(ns, "SystemPortId"))).text
-                    switch_id = sysport.find(str(QName(ns, "SwitchId"))).text
-                    core_id = sysport.find(str(QName(ns, "CoreId"))).text
-                    core_port_id = sysport.find(str(QName(ns, "CorePortId"))).text
-                    speed = sysport.find(str(QName(ns, "Speed"))).text
-                    num_voq = sysport.find(str(QName(ns, "NumVoq"))).text
+                for sysport in sysports.findall(qname(ns, "SystemPort")):
+                    portname = sysport.find(qname(ns, "Name")).text
+                    hostname = sysport.find(qname(ns, "Hostname"))
+                    asic_name = sysport.find(qname(ns, "AsicName"))
+                    system_port_id = sysport.find(qname(ns, "SystemPortId")).text
+                    switch_id = sysport.find(qname(ns, "SwitchId")).text
+                    core_id = sysport.find(qname(ns, "CoreId")).text
+                    core_port_id = sysport.find(qname(ns, "CorePortId")).text
+                    speed = sysport.find(qname(ns, "Speed")).text
+                    num_voq = sysport.find(qname(ns, "NumVoq")).text
                     key = portname
                     if asic_name is not None:
                        key = "%s|%s" % (asic_name.text, key)
@@ -1486,12 +1492,254 @@ def update_forced_mgmt_route(mgmt_intf, mgmt_routes):
         if len(forced_mgmt_routes) > 0:
             mgmt_intf[mgmt_intf_key]['forced_mgmt_routes'] = forced_mgmt_routes
 
+###############################################################################
+#
+# Minigraph document cache
+#
+###############################################################################
+
+# Parsed minigraph trees, keyed by real path. Each entry remembers the file
+# signature it was parsed from so a modified file is parsed again.
+_minigraph_root_cache = {}
+
+def _file_signature(filename):
+    """ Return (path, mtime_ns, size) of a file, or None if it does not exist """
+    if filename is None:
+        return None
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return (os.path.realpath(filename), st.st_mtime_ns, st.st_size)
+
+def get_minigraph_root(filename):
+    """ Return the root element of a minigraph file.
+
+    The tree is parsed once per process and shared by parse_xml, parse_hostname,
+    parse_asic_sub_role and parse_asic_switch_type. It is parsed again only when
+    the file path, mtime or size changes.
+    """
+    signature = _file_signature(filename)
+    if signature is None:
+        return ET.parse(filename).getroot()
+
+    cached = _minigraph_root_cache.get(signature[0])
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    root = ET.parse(filename).getroot()
+    _minigraph_root_cache[signature[0]] = (signature, root)
+    return root
+
+def clear_minigraph_cache():
+    """ Drop all parsed minigraph trees held by this process """
+    _minigraph_root_cache.clear()
+
+class StreamedElement(object):
+    """ Stand-in for a minigraph container element which is still being parsed.
+
+    Iterating over it, or over findall(), yields its children as soon as they
+    are parsed and frees each of them when the iteration moves on, so every
+    child can be visited only once. items maps the tags of the children which
+    are containers themselves to the tag of their own items; when it is a tag
+    the children are leaf items which are yielded as complete elements.
+    """
+
+    def __init__(self, elem, events, items):
+        self.tag = elem.tag
+        self.attrib = elem.attrib
+        self._elem = elem
+        self._events = events
+        self._items = items
+        self._done = False
+
+    def __iter__(self):
+        if self._done:
+            return
+        for event, elem in self._events:
+            if elem is self._elem:
+                break
+            if elem.getparent() is not self._elem:
+                continue
+            if isinstance(self._items, dict):
+                if event != 'start' or elem.tag not in self._items:
+                    continue
+                child = StreamedElement(elem, self._events, self._items[elem.tag])
+                yield child
+                child.drain()
+            else:
+                if event != 'end' or elem.tag != self._items:
+                    continue
+                yield elem
+            elem.clear()
+            while elem.getprevious() is not None:
+                del self._elem[0]
+        self._done = True
+
+    def findall(self, tag):
+        return (child for child in self if child.tag == tag)
+
+    def drain(self):
+        """ Skip whatever the caller did not consume up to the end of the element """
+        for _ in self:
+            pass
+
+def _streamed_tags(items):
+    tags = []
+    for container, item in items.items():
+        tags.append(container)
+        tags.extend(_streamed_tags(item) if isinstance(item, dict) else [item])
+    return tags
+
+def iter_minigraph_sections(filename, tags, streamed_sections=None):
+    """ Stream the top level elements of a minigraph file whose tag is in tags.
+
+    Each element is yielded once it is completely parsed and is freed, with
+    everything below it and the top level elements before it, as soon as the
+    caller moves on. Tag filtering is done by lxml, so the elements nested in
+    a section cost no Python work until the section is handed out.
+
+    streamed_sections maps the tags of sections too large to be held at once
+    to their containers, see StreamedElement. These sections are yielded as
+    soon as they start and are parsed while the caller walks through them;
+    they are never held as a whole even when their tag is not in tags.
+    """
+    streamed_sections = streamed_sections or {}
+    filter_tags = list(tags)
+    for section, items in streamed_sections.items():
+        filter_tags.append(section)
+        filter_tags.extend(_streamed_tags(items))
+    events = ET.iterparse(filename, events=('start', 'end'), tag=filter_tags)
+    for event, elem in events:
+        parent = elem.getparent()
+        if parent is None or parent.getparent() is not None:
+            # Not a top level element
+            continue
+        if elem.tag in streamed_sections:
+            if event != 'start':
+                continue
+            section = StreamedElement(elem, events, streamed_sections[elem.tag])
+            if elem.tag in tags:
+                yield section
+            section.drain()
+        elif event == 'end' and elem.tag in tags:
+            yield elem
+        else:
+            continue
+        elem.clear()
+        while elem.getprevious() is not None:
+            del parent[0]
+
+def get_parsed_minigraph_cache_file(filename, asic_name=None):
+    """ Return the path of the persisted parse_xml result stored next to the minigraph """
+    dirname, basename = os.path.split(os.path.abspath(filename))
+    return os.path.join(dirname, '.{}.{}.cache'.format(basename, asic_name if asic_name else 'host'))
+
+def get_dns_conf_file():
+    """ Return the path of the template of the default DNS nameservers """
+    if os.environ.get("CFGGEN_UNIT_TESTING", "0") == "2":
+        return os.path.join(os.path.dirname(__file__), "tests/", "dns.j2")
+    return "/usr/share/sonic/templates/dns.j2"
+
+def _parsed_minigraph_cache_key(filename, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file):
+    # The parser modules are part of the key so that an image upgrade, which
+    # also ships new port configs and templates, never reuses a stale result.
+    return (MINIGRAPH_CACHE_VERSION,
+            _file_signature(filename),
+            platform,
+            asic_name,
+            _file_signature(port_config_file),
+            _file_signature(hwsku_config_file),
+            _file_signature(fabric_port_config_file),
+            _file_signature(__file__),
+            _file_signature(sys.modules['portconfig'].__file__))
+
+def _parsed_minigraph_dependencies(hwsku, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file):
+    # What parse_xml reads besides the minigraph. The port and fabric configs
+    # are found from the hwsku, which is only known once the minigraph has
+    # been parsed, hence they can't be part of the key.
+    files, tables = get_port_config_sources(hwsku=hwsku, platform=platform, port_config_file=port_config_file,
+                                            hwsku_config_file=hwsku_config_file,
+                                            fabric_port_config_file=fabric_port_config_file, asic_name=asic_name)
+    files.append(get_dns_conf_file())
+    return ([(f, _file_signature(f)) for f in files], tables, is_multi_asic())
+
+def load_parsed_minigraph(cache_file, key):
+    """ Return the cache entry stored in cache_file if it matches key, otherwise None """
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_key, entry = pickle.load(f)
+    except Exception:
+        return None
+    if cached_key != key:
+        return None
+    return entry
+
+def save_parsed_minigraph(cache_file, key, entry):
+    """ Atomically persist a cache entry: the hwsku, the dependencies and the
+    parse_xml result. Failures are not fatal, the cache is best effort """
+    try:
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file), prefix='.minigraph-cache-')
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((key, entry), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_file, cache_file)
+    except Exception:
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+        return False
+    return True
+
+def parse_xml_cached(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None, fabric_port_config_file=None, streaming=False, cache_file=None):
+    """ Same as parse_xml, but reuse the result persisted by a previous run.
+
+    The persisted result is keyed by the path, mtime and size of the minigraph,
+    the port/hwsku/fabric config files, the platform, the asic name and the
+    parser modules themselves. It is only reused if the files parse_xml finds
+    by itself (port, hwsku and fabric configs of the hwsku, dns.j2) and the
+    CONFIG_DB tables it prefers to them are still the same. Any change makes
+    the next call parse the XML again and refresh the cache file.
+
+    Keyword arguments:
+    cache_file -- where to persist the result; defaults to a hidden file
+    next to the minigraph (see get_parsed_minigraph_cache_file)
+    """
+    if cache_file is None:
+        cache_file = get_parsed_minigraph_cache_file(filename, asic_name)
+
+    key = _parsed_minigraph_cache_key(filename, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file)
+    cached = load_parsed_minigraph(cache_file, key)
+    if cached is not None:
+        hwsku, dependencies, results = cached
+        if dependencies == _parsed_minigraph_dependencies(hwsku, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file):
+            return results
+
+    results = parse_xml(filename, platform, port_config_file, asic_name=asic_name, hwsku_config_file=hwsku_config_file, fabric_port_config_file=fabric_port_config_file, streaming=streaming)
+    hwsku = results.get('DEVICE_METADATA', {}).get('localhost', {}).get('hwsku')
+    dependencies = _parsed_minigraph_dependencies(hwsku, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file)
+    save_parsed_minigraph(cache_file, key, (hwsku, dependencies, results))
+    return results
+
+def reset_port_maps():
+    """ Forget the ports of the previous parse_xml call.
+
+    The port maps are module level and only ever updated by parse_xml, the
+    ports of one asic or port config must not leak into the next parse.
+    """
+    port_names_map.clear()
+    port_alias_map.clear()
+    port_alias_asic_map.clear()
+
 ###############################################################################
 #
 # Main functions
 #
 ###############################################################################
-def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None, fabric_port_config_file=None ):
+def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None, fabric_port_config_file=None, streaming=False):
     """ Parse minigraph xml file.
 
     Keyword arguments:
@@ -1501,9 +1749,13 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     asic_name -- asic name; to parse multi-asic device minigraph to
     generate asic specific configuration.
     fabric_port_config_file -- fabric port config file name
+    streaming -- parse the file with iterparse, one top level section at a
+    time and one link or device at a time in the PNG, instead of loading the
+    whole tree. Peak memory no longer grows with the size of the PNG, at the
+    cost of reading the file twice.
      """
 
-    root = ET.parse(filename).getroot()
+    root = None if streaming else get_minigraph_root(filename)
 
     u_neighbors = None
     u_devices = None
@@ -1567,16 +1819,31 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     qos_profile = None
     rack_mgmt_map = None
 
-    hwsku_qn = QName(ns, "HwSku")
-    hostname_qn = QName(ns, "Hostname")
-    docker_routing_config_mode_qn = QName(ns, "DockerRoutingConfigMode")
-    for child in root:
-        if child.tag == str(hwsku_qn):
+    dpg_loopbacks = None
+
+    # The PNG holds a couple of elements per link and per device, which makes
+    # it by far the largest section, so it is never held as a whole.
+    png_items = {qname(ns, "DeviceInterfaceLinks"): qname(ns, "DeviceLinkBase"),
+                 qname(ns, "Devices"): qname(ns, "Device")}
+    streamed_sections = {qname(ns, "PngDec"): png_items}
+
+    # Hostname and HwSku usually come last in the document but every section
+    # parser needs them, so they are read in a first pass over the top level.
+    hwsku_qn = qname(ns, "HwSku")
+    hostname_qn = qname(ns, "Hostname")
+    docker_routing_config_mode_qn = qname(ns, "DockerRoutingConfigMode")
+    metadata_qn = qname(ns, "MetadataDeclaration")
+    header_tags = [hwsku_qn, hostname_qn, docker_routing_config_mode_qn, metadata_qn]
+    for child in (iter_minigraph_sections(filename, header_tags, streamed_sections) if streaming else root):
+        if child.tag == hwsku_qn:
             hwsku = child.text
-        if child.tag == str(hostname_qn):
+        if child.tag == hostname_qn:
             hostname = child.text
-        if child.tag == str(docker_routing_config_mode_qn):
+        if child.tag == docker_routing_config_mode_qn:
             docker_routing_config_mode = child.text
+        # Get the local device node from DeviceMetadata
+        if child.tag == metadata_qn:
+            local_devices.extend(parse_meta_devices(child))
 
     (ports, alias_map, alias_asic_map) = get_port_config(hwsku=hwsku, platform=platform, port_config_file=port_config_file, asic_name=asic_name, hwsku_config_file=hwsku_config_file)
 
@@ -1584,38 +1851,38 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     port_alias_map.update(alias_map)
     port_alias_asic_map.update(alias_asic_map)
 
-    # Get the local device node from DeviceMetadata
-    local_devices = parse_asic_meta_get_devices(root)
-
-    for child in root:
+    section_tags = [qname(ns, tag) for tag in ("DpgDec", "CpgDec", "PngDec", "UngDec", "MetadataDeclaration", "LinkMetadataDeclaration", "DeviceInfos")]
+    for child in (iter_minigraph_sections(filename, section_tags, streamed_sections) if streaming else root):
+        if child.tag == qname(ns, "DpgDec") and dpg_loopbacks is None:
+            dpg_loopbacks = parse_dpg_loopbacks(child)
         if asic_name is None:
-            if child.tag == str(QName(ns, "DpgDec")):
+            if child.tag == qname(ns, "DpgDec"):
                 (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_dpg(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
+            elif child.tag == qname(ns, "CpgDec"):
                 (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_cpg(child, hostname)
-            elif child.tag == str(QName(ns, "PngDec")):
+            elif child.tag == qname(ns, "PngDec"):
                 (neighbors, devices, console_dev, console_port, mgmt_dev, mgmt_port, port_speed_png, console_ports, mux_cable_ports, png_ecmp_content) = parse_png(child, hostname, dpg_ecmp_content)
-            elif child.tag == str(QName(ns, "UngDec")):
+            elif child.tag == qname(ns, "UngDec"):
                 (u_neighbors, u_devices, _, _, _, _, _, _) = parse_png(child, hostname, None)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
+            elif child.tag == qname(ns, "MetadataDeclaration"):
                 (syslog_servers, dhcp_servers, dhcpv6_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, cloudtype, resource_type, downstream_subrole, switch_id, switch_type, max_cores, kube_data, macsec_profile, downstream_redundancy_types, redundancy_type, qos_profile, rack_mgmt_map) = parse_meta(child, hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
+            elif child.tag == qname(ns, "LinkMetadataDeclaration"):
                 linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
+            elif child.tag == qname(ns, "DeviceInfos"):
                 (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
         else:
-            if child.tag == str(QName(ns, "DpgDec")):
+            if child.tag == qname(ns, "DpgDec"):
                 (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_dpg(child, asic_name)
                 host_lo_intfs = parse_host_loopback(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
+            elif child.tag == qname(ns, "CpgDec"):
                 (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_cpg(child, asic_name, local_devices)
-            elif child.tag == str(QName(ns, "PngDec")):
+            elif child.tag == qname(ns, "PngDec"):
                 (neighbors, devices, port_speed_png) = parse_asic_png(child, asic_name, hostname)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
+            elif child.tag == qname(ns, "MetadataDeclaration"):
                 (sub_role, switch_id, switch_type, max_cores, deployment_id, macsec_profile) = parse_asic_meta(child, asic_name)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
+            elif child.tag == qname(ns, "LinkMetadataDeclaration"):
                 linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
+            elif child.tag == qname(ns, "DeviceInfos"):
                 (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
 
     select_mmu_profiles(qos_profile, platform, hwsku)
@@ -2049,7 +2316,7 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     # Add src_ip and qos remapping config into TUNNEL table if tunnel_qos_remap is enabled
     results['TUNNEL'] = get_tunnel_entries(tunnel_intfs, tunnel_intfs_qos_remap_config, lo_intfs, system_defaults.get('tunnel_qos_remap', {}), mux_tunnel_name, peer_switch_ip)
 
-    active_active_ports = get_ports_in_active_active(root, devices, neighbors)
+    active_active_ports = get_active_active_ports(dpg_loopbacks, devices, neighbors)
     results['MUX_CABLE'] = get_mux_cable_entries(ports, mux_cable_ports, active_active_ports, neighbors, devices, redundancy_type)
 
     # If connected to a smart cable, get the connection position
@@ -2081,10 +2348,7 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     results['NTP_SERVER'] = dict((item, {}) for item in ntp_servers)
     # Set default DNS nameserver from dns.j2
     results['DNS_NAMESERVER'] = {}
-    if os.environ.get("CFGGEN_UNIT_TESTING", "0") == "2":
-        dns_conf = os.path.join(os.path.dirname(__file__), "tests/", "dns.j2")
-    else:
-        dns_conf = "/usr/share/sonic/templates/dns.j2"
+    dns_conf = get_dns_conf_file()
     if os.path.isfile(dns_conf):
         text = ""
         with open(dns_conf) as template_file:
@@ -2218,21 +2482,31 @@ def get_tunnel_entries(tunnel_intfs, tunnel_intfs_qos_remap_config, lo_intfs, tu
     return tunnels
 
 
+def parse_dpg_loopbacks(dpg):
+    """Return the loopback interfaces of every device in the DPG section, keyed by lower case hostname."""
+    dpg_loopbacks = {}
+    for child in dpg:
+        hostname = child.find(qname(ns, "Hostname"))
+        if hostname is None or child.find(qname(ns, "LoopbackIPInterfaces")) is None:
+            continue
+        dpg_loopbacks[hostname.text.lower()] = parse_loopback_intf(child)
+    return dpg_loopbacks
+
 def get_ports_in_active_active(root, devices, neighbors):
     """Parse out ports in active-active cable type."""
+    dpg_section = root.find(qname(ns, "DpgDec"))
+    dpg_loopbacks = parse_dpg_loopbacks(dpg_section) if dpg_section is not None else None
+    return get_active_active_ports(dpg_loopbacks, devices, neighbors)
+
+def get_active_active_ports(dpg_loopbacks, devices, neighbors):
+    """Parse out ports in active-active cable type from the loopbacks returned by parse_dpg_loopbacks."""
     servers = {hostname.lower(): device_data for hostname, device_data in devices.items() if device_data["type"] == "Server"}
     ports_in_active_active = {}
-    dpg_section = root.find(str(QName(ns, "DpgDec")))
     neighbor_to_port_mapping = {neighbor["name"].lower(): port for port, neighbor in neighbors.items()}
-    if dpg_section is not None:
-        for child in dpg_section:
-            hostname = child.find(str(QName(ns, "Hostname")))
-            if hostname is None:
-                continue
-            hostname = hostname.text.lower()
+    if dpg_loopbacks is not None:
+        for hostname, lo_intfs in dpg_loopbacks.items():
             if hostname not in servers:
                 continue
-            lo_intfs = parse_loopback_intf(child)
             soc_intfs = {}
             for intfname, ipprefix in lo_intfs.keys():
                 intfname_lower = intfname.lower()
@@ -2320,10 +2594,10 @@ def parse_hostname(filename):
     hostName = None
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
-    hostname_qn = QName(ns, "Hostname")
+    root = get_minigraph_root(filename)
+    hostname_qn = qname(ns, "Hostname")
     for child in root:
-        if child.tag == str(hostname_qn):
+        if child.tag == hostname_qn:
             hostName = child.text
             break
 
@@ -2332,30 +2606,36 @@ def parse_hostname(filename):
 def parse_asic_sub_role(filename, asic_name):
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
+    root = get_minigraph_root(filename)
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
+        if child.tag == qname(ns, "MetadataDeclaration"):
             sub_role, _, _, _, _, _= parse_asic_meta(child, asic_name)
             return sub_role
 
 def parse_asic_switch_type(filename, asic_name):
     if os.path.isfile(filename):
-        root = ET.parse(filename).getroot()
+        root = get_minigraph_root(filename)
         for child in root:
-            if child.tag == str(QName(ns, "MetadataDeclaration")):
+            if child.tag == qname(ns, "MetadataDeclaration"):
                 _, _, switch_type, _, _, _ = parse_asic_meta(child, asic_name)
                 return switch_type
     return None
 
+def parse_meta_devices(meta):
+    local_devices = []
+    device_metas = meta.find(qname(ns, "Devices"))
+    for device in device_metas.findall(qname(ns1, "DeviceMetadata")):
+        name = device.find(qname(ns1, "Name")).text.lower()
+        local_devices.append(name)
+
+    return local_devices
+
 def parse_asic_meta_get_devices(root):
     local_devices = []
 
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            device_metas = child.find(str(QName(ns, "Devices")))
-            for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-                name = device.find(str(QName(ns1, "Name"))).text.lower()
-                local_devices.append(name)
+        if child.tag == qname(ns, "MetadataDeclaration"):
+            local_devices.extend(parse_meta_devices(child))
 
     return local_devices
 
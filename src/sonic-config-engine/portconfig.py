@@ -168,6 +168,42 @@ def get_fabric_port_config(hwsku=None, platform=None, fabric_port_config_file=No
             ports[name] = data
     return ports
 
+def get_port_config_sources(hwsku=None, platform=None, port_config_file=None, hwsku_config_file=None, fabric_port_config_file=None, asic_name=None):
+    """
+    Find what get_port_config, get_fabric_port_config and get_fabric_monitor_config read their data from,
+    the same way they do.
+    Returns:
+        A tuple of the list of files, None for files which are not found, and the dict of CONFIG_DB tables
+        which are not empty
+    """
+    tables = {}
+    config_db = db_connect_configdb(asic_name)
+    if config_db is not None:
+        table_names = ["FABRIC_MONITOR"]
+        if port_config_file is None:
+            table_names.append("PORT")
+        if fabric_port_config_file is None:
+            table_names.append("FABRIC_PORT")
+        for table_name in table_names:
+            table = config_db.get_table(table_name)
+            if bool(table):
+                tables[table_name] = table
+
+    if asic_name is not None:
+        asic_id = str(get_asic_id_from_name(asic_name))
+    else:
+        asic_id = None
+
+    files = []
+    if not port_config_file:
+        port_config_file = device_info.get_path_to_port_config_file(hwsku, asic_id)
+    files.append(port_config_file)
+    if port_config_file and port_config_file.endswith('.json'):
+        files.append(hwsku_config_file or get_hwsku_file_name(hwsku, platform))
+    files.append(fabric_port_config_file or device_info.get_path_to_fabric_port_config_file(hwsku, asic_id))
+    files.append(device_info.get_path_to_fabric_monitor_config_file(hwsku, asic_id))
+    return (files, tables)
+
 def get_port_config(hwsku=None, platform=None, port_config_file=None, hwsku_config_file=None, asic_name=None):
     config_db = db_connect_configdb(asic_name)
     # If available, Read from CONFIG DB first
@@ -49,6 +49,7 @@ else:
 # Common modules for python2 and python3
 py_modules = [
     'config_samples',
+    'jinja2_cache',
     'minigraph',
     'openconfig_acl',
     'portconfig',
@@ -23,9 +23,10 @@ DEFAULT_YANG_DATA_FILE = "/etc/sonic/config_yang.json"
 
 class SonicYangCfgDbGenerator:
 
-    def __init__(self, yang_models_dir=YANG_MODELS_DIR):
+    def __init__(self, yang_models_dir=YANG_MODELS_DIR, schema_cache_dir=None):
         self.yang_models_dir = yang_models_dir
-        self.yang_parser = sonic_yang.SonicYang(self.yang_models_dir)
+        self.yang_parser = sonic_yang.SonicYang(self.yang_models_dir,
+                                                schema_cache_dir=schema_cache_dir)
         self.yang_parser.loadYangModel()
 
     def get_config_db_from_yang_data(self,
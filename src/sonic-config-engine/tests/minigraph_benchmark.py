@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Compare the tree based and the streaming (iterparse) minigraph parsers.
+
+A synthetic minigraph is generated from simple-sample-graph.xml by adding
+N device interface links and 2*N devices to the PNG section. Each parser runs
+in its own process, so the reported peak RSS only accounts for that parser.
+
+Usage:
+    python3 tests/minigraph_benchmark.py [--links 10000] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+SAMPLE_GRAPH = os.path.join(TEST_DIR, 'simple-sample-graph.xml')
+PORT_CONFIG = os.path.join(TEST_DIR, 't0-sample-port-config.ini')
+
+LINK_TEMPLATE = '''      <DeviceLinkBase i:type="DeviceInterfaceLink">
+        <ElementType>DeviceInterfaceLink</ElementType>
+        <Bandwidth>100000</Bandwidth>
+        <EndDevice>SYNTH{0}T1</EndDevice>
+        <EndPort>Ethernet{1}</EndPort>
+        <FlowControl>true</FlowControl>
+        <StartDevice>SYNTH{0}T0</StartDevice>
+        <StartPort>Ethernet{1}</StartPort>
+        <Validate>true</Validate>
+      </DeviceLinkBase>
+'''
+
+DEVICE_TEMPLATE = '''      <Device i:type="{1}">
+        <Hostname>{0}</Hostname>
+        <HwSku>Arista</HwSku>
+      </Device>
+'''
+
+
+def generate_minigraph(filename, links):
+    with open(SAMPLE_GRAPH) as f:
+        graph = f.read()
+
+    png_start = graph.index('<PngDec>')
+    links_end = graph.index('</DeviceInterfaceLinks>', png_start)
+    synthetic_links = ''.join(LINK_TEMPLATE.format(i, i % 512) for i in range(links))
+    graph = graph[:links_end] + synthetic_links + graph[links_end:]
+
+    devices_end = graph.index('</Devices>', png_start)
+    synthetic_devices = ''.join(DEVICE_TEMPLATE.format('SYNTH{}T0'.format(i), 'ToRRouter') +
+                                DEVICE_TEMPLATE.format('SYNTH{}T1'.format(i), 'LeafRouter') for i in range(links))
+    graph = graph[:devices_end] + synthetic_devices + graph[devices_end:]
+
+    with open(filename, 'w') as f:
+        f.write(graph)
+
+
+def run_parser(filename, streaming):
+    sys.path.insert(0, os.path.dirname(TEST_DIR))
+    import minigraph
+
+    start = time.time()
+    minigraph.parse_xml(filename, port_config_file=PORT_CONFIG, streaming=streaming)
+    wall = time.time() - start
+    # ru_maxrss is reported in kilobytes on Linux
+    print(json.dumps({'wall': wall, 'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+
+
+def measure(filename, streaming):
+    cmd = [sys.executable, __file__, '--run', filename]
+    if streaming:
+        cmd.append('--streaming')
+    output = subprocess.check_output(cmd, stderr=subprocess.DEVNULL, universal_newlines=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--links', type=int, default=10000, help='number of synthetic links')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per parser, the best one is reported')
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    parser.add_argument('--streaming', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_parser(args.run, args.streaming)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'minigraph.xml')
+        generate_minigraph(filename, args.links)
+        print('Synthetic minigraph: {} links, {:.1f} MB'.format(args.links, os.path.getsize(filename) / 1024.0 / 1024.0))
+        print('{:<10} {:>12} {:>16}'.format('parser', 'wall (s)', 'peak RSS (MB)'))
+        for name, streaming in (('tree', False), ('streaming', True)):
+            runs = [measure(filename, streaming) for _ in range(args.repeat)]
+            print('{:<10} {:>12.3f} {:>16.1f}'.format(name, min(r['wall'] for r in runs),
+                                                       min(r['maxrss_kb'] for r in runs) / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -213,6 +213,66 @@ class TestCfgGen(TestCase):
         for key, value in data.items():
             self.assertEqual(output_data[key.replace("key", "jk")], value)
 
+    def test_batch_file(self):
+        batch_file = os.path.join(self.test_dir, 'batch')
+        yml = os.path.join(self.test_dir, 'test.yml')
+        with open(batch_file, 'w') as f:
+            f.write('# rendered in one sonic-cfggen process\n')
+            f.write('-y {} -t {},{}\n'.format(yml, os.path.join(self.test_dir, 'test.j2'), self.output_file))
+            f.write('\n')
+            f.write('-y {} -a \'{{"key1":"value"}}\' -t {},{}\n'.format(yml, os.path.join(self.test_dir, 'test2.j2'), self.output2_file))
+            f.write('-y {} -v yml_item\n'.format(yml))
+        try:
+            output = self.run_script(['--batch', batch_file])
+        finally:
+            os.remove(batch_file)
+        self.assertEqual(output.strip(), "['value1', 'value2']")
+        with open(self.output_file) as tf:
+            self.assertEqual(tf.read().strip(), 'value1\nvalue2')
+        with open(self.output2_file) as tf:
+            self.assertEqual(tf.read().strip(), 'value')
+
+    def test_batch_file_port_configs(self):
+        graph = os.path.join(self.test_dir, 'simple-sample-graph-case.xml')
+        batch_file = os.path.join(self.test_dir, 'batch')
+        # Same ports with other aliases, the neighbors of the minigraph are not found by their aliases
+        port_config = os.path.join(self.test_dir, 'batch-port-config.ini')
+        with open(self.port_config) as f:
+            lines = f.readlines()
+        with open(port_config, 'w') as f:
+            f.write(lines[0])
+            for line in lines[1:]:
+                f.write(line.replace('fortyGigE0/', 'etp'))
+        with open(batch_file, 'w') as f:
+            f.write('-m {} -p {} -v "DEVICE_NEIGHBOR.keys()|list"\n'.format(graph, self.port_config))
+            f.write('-m {} -p {} -v "DEVICE_NEIGHBOR.keys()|list"\n'.format(graph, port_config))
+        try:
+            output = self.run_script(['--batch', batch_file])
+            expected = self.run_script(['-m', graph, '-p', self.port_config, '-v', 'DEVICE_NEIGHBOR.keys()|list'])
+            expected += self.run_script(['-m', graph, '-p', port_config, '-v', 'DEVICE_NEIGHBOR.keys()|list'])
+        finally:
+            os.remove(batch_file)
+            os.remove(port_config)
+        # Aliases of the first port config are not used for the second entry
+        self.assertEqual(output, expected)
+        self.assertEqual(output.strip().split('\n')[1], '[]')
+
+    def test_batch_file_failed_entry(self):
+        batch_file = os.path.join(self.test_dir, 'batch')
+        with open(batch_file, 'w') as f:
+            f.write('-y {} -t {}\n'.format(os.path.join(self.test_dir, 'test.yml'), os.path.join(self.test_dir, 'test.j2')))
+            f.write('-y {}\n'.format(os.path.join(self.test_dir, 'nonexistent.yml')))
+            f.write('-a \'{"key1":"value1"}\' -v key1\n')
+        try:
+            p = subprocess.Popen(self.script_file + ['--batch', batch_file], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            output, error = p.communicate()
+        finally:
+            os.remove(batch_file)
+        # The failing entry is reported, the other entries are still rendered
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(output.decode().strip(), 'value1\nvalue2\n\nvalue1')
+        self.assertIn('line 2', error.decode())
+
     # FIXME: This test depends heavily on the ordering of the interfaces and
     # it is not at all intuitive what that ordering should be. Could make it
     # more robust by adding better parsing logic.
@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+from importlib.machinery import SourceFileLoader
+from unittest import TestCase, mock
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+cfggen = SourceFileLoader('sonic_cfggen', os.path.join(modules_path, 'sonic-cfggen')).load_module()
+
+
+class TestAllNamespaces(TestCase):
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp()
+        self.args = argparse.Namespace(namespace=None, minigraph=None, write_to_db=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def _load_data(self, args, platform):
+        return {'namespace': args.namespace, 'platform': platform}
+
+    def _process_outputs(self, args, data):
+        # Runs in the worker processes, report through the file system
+        if data['namespace'] == 'asic2':
+            raise ValueError('asic2 failed')
+        with open(os.path.join(self.out_dir, data['namespace']), 'w') as f:
+            f.write('{} {}'.format(os.getpid(), data['platform']))
+
+    def test_all_namespaces(self):
+        with mock.patch.object(cfggen, 'is_multi_asic', return_value=True), \
+             mock.patch.object(cfggen, 'get_num_asics', return_value=4), \
+             mock.patch.object(cfggen, 'load_namespace_config'), \
+             mock.patch.object(cfggen, '_load_data', side_effect=self._load_data), \
+             mock.patch.object(cfggen, '_process_outputs', side_effect=self._process_outputs):
+            failures = cfggen._process_all_namespaces(self.args, 'x86_64-sample-r0')
+
+        self.assertEqual(failures, 1)
+        self.assertEqual(sorted(os.listdir(self.out_dir)), ['asic0', 'asic1', 'asic3'])
+        pids = set()
+        for namespace in ('asic0', 'asic1', 'asic3'):
+            with open(os.path.join(self.out_dir, namespace)) as f:
+                pid, platform = f.read().split()
+            self.assertEqual(platform, 'x86_64-sample-r0')
+            pids.add(int(pid))
+        # Every namespace is handled by its own worker process
+        self.assertEqual(len(pids), 3)
+        self.assertNotIn(os.getpid(), pids)
+        # The arguments of the caller are left untouched
+        self.assertIsNone(self.args.namespace)
+
+    def test_all_namespaces_minigraph(self):
+        graph = os.path.join(test_path, 'multi_npu_data', 'sample-minigraph.xml')
+        args = cfggen._get_argument_parser().parse_args(['-m', graph, '-w', '--all-namespaces'])
+
+        def process_outputs(args, data):
+            with open(os.path.join(self.out_dir, args.namespace), 'w') as f:
+                json.dump(cfggen.FormatConverter.to_serialized(data), f, cls=cfggen.minigraph_encoder, sort_keys=True)
+
+        with mock.patch.object(cfggen, 'is_multi_asic', return_value=True), \
+             mock.patch.object(cfggen, 'get_num_asics', return_value=4), \
+             mock.patch.object(cfggen, 'load_namespace_config'), \
+             mock.patch.object(cfggen, '_process_outputs', side_effect=process_outputs):
+            self.assertEqual(cfggen._process_all_namespaces(args, None), 0)
+            # Workers derive the config of their asic from the minigraph parsed before they were forked,
+            # the same as a run in that namespace alone
+            for asic_id in range(4):
+                namespace = 'asic{}'.format(asic_id)
+                cfggen.reset_port_maps()
+                ns_args = cfggen._get_argument_parser().parse_args(['-m', graph, '-n', namespace])
+                expected = cfggen.FormatConverter.to_serialized(cfggen._load_data(ns_args, None))
+                with open(os.path.join(self.out_dir, namespace)) as f:
+                    self.assertEqual(json.load(f), json.loads(json.dumps(expected, cls=cfggen.minigraph_encoder)))
+
+    def test_single_asic(self):
+        with mock.patch.object(cfggen, 'is_multi_asic', return_value=False), \
+             mock.patch.object(cfggen, '_load_data', side_effect=self._load_data) as mock_load_data, \
+             mock.patch.object(cfggen, '_process_outputs') as mock_process_outputs:
+            self.assertEqual(cfggen._process_all_namespaces(self.args, None), 0)
+
+        mock_load_data.assert_called_once_with(self.args, None)
+        mock_process_outputs.assert_called_once_with(self.args, {'namespace': None, 'platform': None})
@@ -0,0 +1,61 @@
+import os
+import tempfile
+
+from importlib.machinery import SourceFileLoader
+from unittest import TestCase, mock
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+cfggen = SourceFileLoader('sonic_cfggen', os.path.join(modules_path, 'sonic-cfggen')).load_module()
+
+
+class TestBatch(TestCase):
+    def setUp(self):
+        fd, self.batch_file = tempfile.mkstemp()
+        os.close(fd)
+        self.loads = []
+        self.outputs = []
+
+    def tearDown(self):
+        os.remove(self.batch_file)
+
+    def _load_data(self, args, platform):
+        self.loads.append(args.from_db)
+        return {'load': len(self.loads)}
+
+    def _process_outputs(self, args, data, env_cache):
+        self.outputs.append(data['load'])
+
+    def _run_batch(self, lines):
+        with open(self.batch_file, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        with mock.patch.object(cfggen, '_load_data', side_effect=self._load_data), \
+             mock.patch.object(cfggen, '_process_outputs', side_effect=self._process_outputs):
+            return cfggen._process_batch(cfggen._get_argument_parser(), self.batch_file, 'x86_64-sample-r0')
+
+    def test_batch_data_cache(self):
+        json_file = os.path.join(test_path, 'sample-port-data.json')
+        failures = self._run_batch([
+            '-d -v DEVICE_METADATA',
+            '-j {} -v key1'.format(json_file),
+            '-d -v DEVICE_METADATA',
+            '-j {} -v key1'.format(json_file),
+        ])
+        self.assertEqual(failures, 0)
+        # Data of the same sources is loaded once
+        self.assertEqual(self.loads, [True, False])
+        self.assertEqual(self.outputs, [1, 2, 1, 2])
+
+    def test_batch_data_cache_write_to_db(self):
+        json_file = os.path.join(test_path, 'sample-port-data.json')
+        failures = self._run_batch([
+            '-d -v DEVICE_METADATA',
+            '-j {} -v key1'.format(json_file),
+            '-j {} --write-to-db'.format(json_file),
+            '-d -v DEVICE_METADATA',
+            '-j {} -v key1'.format(json_file),
+        ])
+        self.assertEqual(failures, 0)
+        # CONFIG_DB is read again after it is written, other data sources are not
+        self.assertEqual(self.loads, [True, False, True])
+        self.assertEqual(self.outputs, [1, 2, 2, 3, 2])
@@ -0,0 +1,82 @@
+import os
+
+from importlib.machinery import SourceFileLoader
+from unittest import TestCase, mock
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+cfggen = SourceFileLoader('sonic_cfggen', os.path.join(modules_path, 'sonic-cfggen')).load_module()
+
+
+class TestWriteConfigDiff(TestCase):
+    def setUp(self):
+        self.current = {
+            'PORT': {
+                'Ethernet0': {'speed': '100000', 'lanes': '0,1,2,3'},
+                'Ethernet4': {'speed': '100000', 'lanes': '4,5,6,7'},
+            },
+            'VLAN_MEMBER': {
+                ('Vlan1000', 'Ethernet0'): {'tagging_mode': 'untagged'},
+            },
+            'ACL_TABLE': {
+                'DATAACL': {'type': 'L3', 'ports': ['Ethernet0', 'Ethernet4']},
+            },
+            'FEATURE': {
+                'bgp': {'state': 'enabled'},
+            },
+        }
+
+    def test_no_change(self):
+        data = {
+            'PORT': {
+                'Ethernet0': {'speed': 100000, 'lanes': '0,1,2,3'},
+            },
+            'VLAN_MEMBER': {
+                ('Vlan1000', 'Ethernet0'): {'tagging_mode': 'untagged'},
+            },
+            'ACL_TABLE': {
+                'DATAACL': {'ports': ['Ethernet0', 'Ethernet4']},
+            },
+        }
+        delta, stats = cfggen.get_config_diff(self.current, data)
+        self.assertEqual(delta, {})
+        self.assertEqual(stats, {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 3})
+
+    def test_changed_fields_only(self):
+        data = {
+            'PORT': {
+                'Ethernet0': {'speed': '40000', 'lanes': '0,1,2,3'},
+                'Ethernet8': {'speed': '100000', 'lanes': '8,9,10,11'},
+                'Ethernet4': None,
+            },
+            'ACL_TABLE': {
+                'DATAACL': {'type': 'L3', 'ports': ['Ethernet0']},
+            },
+            'FEATURE': None,
+        }
+        delta, stats = cfggen.get_config_diff(self.current, data)
+        self.assertEqual(delta, {
+            'PORT': {
+                'Ethernet0': {'speed': '40000'},
+                'Ethernet8': {'speed': '100000', 'lanes': '8,9,10,11'},
+                'Ethernet4': None,
+            },
+            'ACL_TABLE': {
+                'DATAACL': {'ports': ['Ethernet0']},
+            },
+            'FEATURE': None,
+        })
+        self.assertEqual(stats, {'added': 1, 'changed': 2, 'removed': 2, 'unchanged': 0})
+
+    def test_write_config_diff_batches(self):
+        configdb = mock.MagicMock()
+        configdb.get_config.return_value = self.current
+        data = {'PORT': {'Ethernet{}'.format(i): {'speed': '10000'} for i in range(8, 16)}}
+        stats = cfggen.write_config_diff(configdb, data, batch_size=3)
+        self.assertEqual(stats['added'], 8)
+        configdb.get_config.assert_called_once()
+        self.assertEqual(configdb.mod_config.call_count, 3)
+        written = {}
+        for call in configdb.mod_config.call_args_list:
+            written.update(call[0][0]['PORT'])
+        self.assertEqual(written, data['PORT'])
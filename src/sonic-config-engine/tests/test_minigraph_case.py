@@ -1,11 +1,13 @@
 import json
 import os
+import shutil
 import subprocess
+import tempfile
 import ipaddress
 import tests.common_utils as utils
 import minigraph
 
-from unittest import TestCase
+from unittest import TestCase, mock
 
 TOR_ROUTER = 'ToRRouter'
 BACKEND_TOR_ROUTER = 'BackEndToRRouter'
@@ -575,3 +577,103 @@ class TestCfgGenCaseInsensitive(TestCase):
         # TC2: For other minigraph, result should not contain FLEX_COUNTER_TABLE
         result = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
         self.assertNotIn('FLEX_COUNTER_TABLE', result)
+
+    def test_minigraph_root_shared_per_process(self):
+        minigraph.clear_minigraph_cache()
+        root = minigraph.get_minigraph_root(self.sample_graph)
+        self.assertIs(minigraph.get_minigraph_root(self.sample_graph), root)
+        self.assertEqual(minigraph.parse_hostname(self.sample_graph), 'switch-t0')
+        self.assertIs(minigraph.get_minigraph_root(self.sample_graph), root)
+
+    def test_minigraph_root_reparsed_on_change(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            graph = os.path.join(tmp_dir, 'minigraph.xml')
+            shutil.copy(self.sample_graph, graph)
+            root = minigraph.get_minigraph_root(graph)
+            with open(graph, 'a') as f:
+                f.write('\n')
+            self.assertIsNot(minigraph.get_minigraph_root(graph), root)
+
+    def test_parse_xml_cached(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            graph = os.path.join(tmp_dir, 'minigraph.xml')
+            shutil.copy(self.sample_graph, graph)
+            cache_file = minigraph.get_parsed_minigraph_cache_file(graph)
+            self.assertEqual(cache_file, os.path.join(tmp_dir, '.minigraph.xml.host.cache'))
+
+            expected = minigraph.parse_xml(graph, port_config_file=self.port_config)
+            result = minigraph.parse_xml_cached(graph, port_config_file=self.port_config)
+            self.assertEqual(result, expected)
+            self.assertTrue(os.path.isfile(cache_file))
+
+            # A warm call must not touch the XML at all
+            with mock.patch('minigraph.parse_xml') as mock_parse_xml:
+                result = minigraph.parse_xml_cached(graph, port_config_file=self.port_config)
+                mock_parse_xml.assert_not_called()
+            self.assertEqual(result, expected)
+
+            # Any change to the minigraph invalidates the persisted result
+            with open(graph, 'a') as f:
+                f.write('\n')
+            with mock.patch('minigraph.parse_xml', return_value={}) as mock_parse_xml:
+                self.assertEqual(minigraph.parse_xml_cached(graph, port_config_file=self.port_config), {})
+                mock_parse_xml.assert_called_once()
+
+    def test_parse_xml_cached_dependencies(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            graph = os.path.join(tmp_dir, 'minigraph.xml')
+            shutil.copy(self.sample_graph, graph)
+            port_config = os.path.join(tmp_dir, 'port_config.ini')
+            shutil.copy(self.port_config, port_config)
+            dns_conf = os.path.join(tmp_dir, 'dns.j2')
+            with open(dns_conf, 'w') as f:
+                f.write('{}')
+
+            # The port config is found from the hwsku of the minigraph, it is not passed
+            with mock.patch('portconfig.device_info.get_path_to_port_config_file', return_value=port_config), \
+                 mock.patch('minigraph.get_dns_conf_file', return_value=dns_conf):
+                expected = minigraph.parse_xml(graph)
+                self.assertNotEqual(expected['PORT'], {})
+                self.assertEqual(minigraph.parse_xml_cached(graph), expected)
+                with mock.patch('minigraph.parse_xml') as mock_parse_xml:
+                    self.assertEqual(minigraph.parse_xml_cached(graph), expected)
+                    mock_parse_xml.assert_not_called()
+
+                # Changes to the port config found from the hwsku invalidate the persisted result, so do changes
+                # to dns.j2
+                for changed_file in (port_config, dns_conf):
+                    with open(changed_file, 'a') as f:
+                        f.write('\n')
+                    with mock.patch('minigraph.parse_xml', wraps=minigraph.parse_xml) as mock_parse_xml:
+                        self.assertEqual(minigraph.parse_xml_cached(graph), expected)
+                        self.assertEqual(minigraph.parse_xml_cached(graph), expected)
+                        mock_parse_xml.assert_called_once()
+
+    def test_parse_xml_streaming(self):
+        for graph in (self.sample_graph, self.sample_simple_graph, self.sample_subintf_graph):
+            expected = minigraph.parse_xml(graph, port_config_file=self.port_config)
+            result = minigraph.parse_xml(graph, port_config_file=self.port_config, streaming=True)
+            self.assertEqual(result, expected)
+
+    def test_iter_minigraph_sections_streamed(self):
+        ns = minigraph.ns
+        links_qn = minigraph.qname(ns, 'DeviceInterfaceLinks')
+        link_qn = minigraph.qname(ns, 'DeviceLinkBase')
+        streamed_sections = {minigraph.qname(ns, 'PngDec'): {links_qn: link_qn}}
+        hostname_qn = minigraph.qname(ns, 'Hostname')
+        tags = [hostname_qn, minigraph.qname(ns, 'PngDec')]
+
+        expected = minigraph.get_minigraph_root(self.sample_graph).find(minigraph.qname(ns, 'PngDec'))
+        expected_ports = [link.find(minigraph.qname(ns, 'EndPort')).text for link in expected.iter(link_qn)]
+        ports = []
+        hostname = None
+        for section in minigraph.iter_minigraph_sections(self.sample_graph, tags, streamed_sections):
+            if section.tag == hostname_qn:
+                hostname = section.text
+                continue
+            for child in section:
+                self.assertEqual(child.tag, links_qn)
+                for link in child.findall(link_qn):
+                    ports.append(link.find(minigraph.qname(ns, 'EndPort')).text)
+        self.assertEqual(hostname, 'switch-t0')
+        self.assertEqual(ports, expected_ports)
@@ -2,6 +2,7 @@ import ipaddress
 import sys
 import syslog
 from abc import abstractmethod
+from collections import deque
 from swsscommon import swsscommon
 
 DEFAULT_SELECT_TIMEOUT = 5000  # millisecond
@@ -21,6 +22,8 @@ class ConfigDbEventChecker(object):
     table_name = ""
     subscriber_state_table = None
     enabled = False
+    table_cache = None
+    pending_events = None
 
     def __init__(self, sel, db):
         """
@@ -33,6 +36,9 @@ class ConfigDbEventChecker(object):
         self.db = db
         self.subscriber_state_table = None
         self.enabled = False
+        self.table_cache = None
+        # Events fetched by table cache before this checker has checked them
+        self.pending_events = deque()
 
     @classmethod
     def get_parameter_by_name(cls, db_snapshot, param_name):
@@ -69,6 +75,8 @@ class ConfigDbEventChecker(object):
         self.subscriber_state_table = swsscommon.SubscriberStateTable(self.db, self.table_name)
         self.sel.addSelectable(self.subscriber_state_table)
         self.enabled = True
+        if self.table_cache is not None:
+            self.table_cache.subscribe(self.table_name, self)
 
     def disable(self):
         """
@@ -80,6 +88,9 @@ class ConfigDbEventChecker(object):
             sys.exit(1)
         self.sel.removeSelectable(self.subscriber_state_table)
         self.enabled = False
+        self.pending_events.clear()
+        if self.table_cache is not None:
+            self.table_cache.unsubscribe(self.table_name, self)
 
     def clear_event(self):
         """
@@ -89,8 +100,50 @@ class ConfigDbEventChecker(object):
             syslog.syslog(syslog.LOG_ERR, "Cannot clear event for table {} due to it is disabled"
                           .format(self.table_name))
             sys.exit(1)
+        while self._has_event():
+            _, _, _ = self._pop_event()
+
+    def has_pending_events(self):
+        """
+        Check whether there are events fetched by table cache but not checked yet
+        Returns:
+            If there are, return True, else return False
+        """
+        return len(self.pending_events) != 0
+
+    def fetch_events(self):
+        """
+        Pop events which have been read by subscribe table, apply them to table cache and keep them to be checked
+        later, so that snapshot of table is up to date before it is served
+        """
+        if not self.enabled:
+            return
         while self.subscriber_state_table.hasData():
-            _, _, _ = self.subscriber_state_table.pop()
+            self.pending_events.append(self._pop_table_event())
+
+    def _has_event(self):
+        return self.has_pending_events() or self.subscriber_state_table.hasData()
+
+    def _pop_event(self):
+        """
+        Pop update event, events fetched by table cache first
+        Returns:
+            Tuple of key, operation and entry of event
+        """
+        if self.pending_events:
+            return self.pending_events.popleft()
+        return self._pop_table_event()
+
+    def _pop_table_event(self):
+        """
+        Pop update event of subscribe table, and apply it to table cache
+        Returns:
+            Tuple of key, operation and entry of event
+        """
+        key, op, entry = self.subscriber_state_table.pop()
+        if self.table_cache is not None:
+            self.table_cache.apply_event(self.table_name, key, op)
+        return key, op, entry
 
     @abstractmethod
     def _get_parameter(self, db_snapshot):
@@ -127,8 +180,8 @@ class ConfigDbEventChecker(object):
         if not res:
             return True
         need_refresh = False
-        while self.subscriber_state_table.hasData():
-            key, op, entry = self.subscriber_state_table.pop()
+        while self._has_event():
+            key, op, entry = self._pop_event()
             need_refresh |= self._process_check(key, op, entry, parameter)
             if need_refresh:
                 self.clear_event()
@@ -411,6 +464,45 @@ class DhcpServerFeatureStateChecker(ConfigDbEventChecker):
         return False
 
 
+def _init_monitor_checkers(checkers, db_connector):
+    """
+    Get checker_dict of checkers, and let checkers keep table cache of db_connector up to date
+    Args:
+        checkers: list of checkers
+        db_connector: db connector obj
+    Returns:
+        Dict of checker name to checker
+    """
+    checker_dict = {}
+    table_cache = getattr(db_connector, "table_cache", None)
+    for checker in checkers:
+        checker.table_cache = table_cache
+        checker_dict[checker.get_class_name()] = checker
+    return checker_dict
+
+
+def _publish_table_cache_stats(db_connector):
+    """
+    Publish statistics of table cache of db_connector if it has one
+    Args:
+        db_connector: db connector obj
+    """
+    table_cache = getattr(db_connector, "table_cache", None)
+    if table_cache is not None:
+        table_cache.publish_stats()
+
+
+def _has_pending_events(checker_dict):
+    """
+    Check whether any enabled checker has events fetched by table cache, which select wouldn't report again
+    Args:
+        checker_dict: Dict of checker name to checker
+    Returns:
+        If any, return True, else return False
+    """
+    return any(checker.is_enabled() and checker.has_pending_events() for checker in checker_dict.values())
+
+
 def _enable_monitor_checkers(checker_names, checker_dict):
     """
     Enable checkers
@@ -446,9 +538,7 @@ class DhcpRelaydDbMonitor(object):
         self.db_connector = db_connector
         self.sel = sel
         self.select_timeout = select_timeout
-        self.checker_dict = {}
-        for checker in checkers:
-            self.checker_dict[checker.get_class_name()] = checker
+        self.checker_dict = _init_monitor_checkers(checkers, db_connector)
 
     def enable_checkers(self, checker_names):
         """
@@ -474,14 +564,16 @@ class DhcpRelaydDbMonitor(object):
         Returns:
             Tuple of dhcp_server table result, vlan table result, vlan_intf table result
         """
-        state, _ = self.sel.select(self.select_timeout)
-        if state == swsscommon.Select.TIMEOUT or state != swsscommon.Select.OBJECT:
-            return {}
+        if not _has_pending_events(self.checker_dict):
+            state, _ = self.sel.select(self.select_timeout)
+            if state == swsscommon.Select.TIMEOUT or state != swsscommon.Select.OBJECT:
+                return {}
         check_res = {}
         for name, checker in self.checker_dict.items():
             if not checker.is_enabled():
                 continue
             check_res[name] = checker.check_update_event(db_snapshot)
+        _publish_table_cache_stats(self.db_connector)
         return check_res
 
 
@@ -492,9 +584,7 @@ class DhcpServdDbMonitor(object):
         self.db_connector = db_connector
         self.sel = sel
         self.select_timeout = select_timeout
-        self.checker_dict = {}
-        for checker in checkers:
-            self.checker_dict[checker.get_class_name()] = checker
+        self.checker_dict = _init_monitor_checkers(checkers, db_connector)
 
     def disable_checkers(self, checker_names):
         """
@@ -520,9 +610,10 @@ class DhcpServdDbMonitor(object):
         Returns:
             Whether need to refresh config file for kea-dhcp-server
         """
-        state, _ = self.sel.select(self.select_timeout)
-        if state == swsscommon.Select.TIMEOUT or state != swsscommon.Select.OBJECT:
-            return False
+        if not _has_pending_events(self.checker_dict):
+            state, _ = self.sel.select(self.select_timeout)
+            if state == swsscommon.Select.TIMEOUT or state != swsscommon.Select.OBJECT:
+                return False
         need_refresh = False
         for checker in self.checker_dict.values():
             if not checker.is_enabled():
@@ -531,4 +622,5 @@ class DhcpServdDbMonitor(object):
                 checker.clear_event()
             else:
                 need_refresh |= checker.check_update_event(db_snapshot)
+        _publish_table_cache_stats(self.db_connector)
         return need_refresh
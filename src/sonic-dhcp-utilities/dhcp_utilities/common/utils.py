@@ -1,3 +1,4 @@
+import bisect
 import ipaddress
 import psutil
 import string
@@ -6,6 +7,7 @@ from swsscommon import swsscommon
 DEFAULT_REDIS_HOST = "127.0.0.1"
 DEFAULT_REDIS_PORT = 6379
 SUPPORT_TYPE = ["binary", "boolean", "ipv4-address", "string", "uint8", "uint16", "uint32"]
+DHCP_DB_CACHE_STATS = "DHCP_DB_CACHE_STATS"
 
 
 class DhcpDbConnector(object):
@@ -17,6 +19,15 @@ class DhcpDbConnector(object):
         else:
             self.config_db = swsscommon.DBConnector(swsscommon.CONFIG_DB, redis_host, redis_port, 0)
             self.state_db = swsscommon.DBConnector(swsscommon.STATE_DB, redis_host, redis_port, 0)
+        self.table_cache = None
+
+    def enable_table_cache(self, name):
+        """
+        Serve tables watched by event checkers from snapshots updated by their events instead of reading them again
+        Args:
+            name: Name of daemon, key of cache statistics in STATE_DB
+        """
+        self.table_cache = DhcpDbTableCache(self, name)
 
     def get_config_db_table(self, table_name):
         """
@@ -26,6 +37,8 @@ class DhcpDbConnector(object):
         Return:
             Table objects.
         """
+        if self.table_cache is not None:
+            return self.table_cache.get_table(table_name)
         return _parse_table_to_dict(swsscommon.Table(self.config_db, table_name))
 
     def get_state_db_table(self, table_name):
@@ -39,6 +52,110 @@ class DhcpDbConnector(object):
         return _parse_table_to_dict(swsscommon.Table(self.state_db, table_name))
 
 
+class DhcpDbTableCache(object):
+    """
+    Snapshots of CONFIG_DB tables which are subscribed by enabled event checkers. Events popped by the checkers are
+    applied to the snapshots, so each event costs reading its own entry instead of reading whole tables again.
+    Tables which are not subscribed are read from db each time.
+    """
+    def __init__(self, db_connector, name):
+        self.db_connector = db_connector
+        self.name = name
+        # Table name -> list of enabled checkers subscribing it
+        self.subscribed = {}
+        # Table name -> snapshot, only for subscribed tables which have been read
+        self.tables = {}
+        self.stats = {
+            "events": 0,
+            "table_reads": 0,
+            "cache_hits": 0
+        }
+
+    def subscribe(self, table_name, checker):
+        """
+        Start applying events of table, called once subscriber of checker has been created
+        """
+        self.subscribed.setdefault(table_name, []).append(checker)
+
+    def unsubscribe(self, table_name, checker):
+        """
+        Stop applying events of table, its snapshot can't be kept up to date any more
+        """
+        checkers = self.subscribed.get(table_name, [])
+        if checker in checkers:
+            checkers.remove(checker)
+        if not checkers:
+            self.subscribed.pop(table_name, None)
+            self.tables.pop(table_name, None)
+
+    def _drain_events(self):
+        """
+        Apply events of all subscribed tables which are pending in db. Checkers only pop events of a table after select
+        reports it, hence when refresh is triggered by one table, events of other tables may not have been applied.
+        Events fetched here are kept by checkers and still checked by them later.
+        """
+        checkers = [checker for checkers in self.subscribed.values() for checker in checkers]
+        sels = []
+        for checker in checkers:
+            if checker.sel not in sels:
+                sels.append(checker.sel)
+        for sel in sels:
+            while True:
+                for checker in checkers:
+                    checker.fetch_events()
+                # Select with timeout 0 reads data arrived on subscribe tables without blocking
+                state, _ = sel.select(0)
+                if state != swsscommon.Select.OBJECT:
+                    break
+
+    def get_table(self, table_name):
+        """
+        Get table from snapshot, or from config_db if there is no snapshot of it.
+        Args:
+            table_name: Name of table want to get.
+        Return:
+            Dict of table, must not be modified.
+        """
+        if table_name in self.tables:
+            self._drain_events()
+            self.stats["cache_hits"] += 1
+            return self.tables[table_name]
+        self.stats["table_reads"] += 1
+        table = _parse_table_to_dict(swsscommon.Table(self.db_connector.config_db, table_name))
+        if table_name in self.subscribed:
+            self.tables[table_name] = table
+        return table
+
+    def apply_event(self, table_name, key, op):
+        """
+        Update snapshot of table with an event of its subscriber. Fields of list type can't be told in event, hence
+        entry is read from db the same way as the whole table is.
+        Args:
+            table_name: Name of table.
+            key: Key of event.
+            op: Operation of event.
+        """
+        self.stats["events"] += 1
+        table = self.tables.get(table_name)
+        if table is None:
+            return
+        entry = None
+        if op == "SET":
+            entry = _parse_entry(swsscommon.Table(self.db_connector.config_db, table_name), key)
+        if entry is None:
+            table.pop(key, None)
+        else:
+            table[key] = entry
+
+    def publish_stats(self):
+        """
+        Write statistics of cache to STATE_DB
+        """
+        stats_table = swsscommon.Table(self.db_connector.state_db, DHCP_DB_CACHE_STATS)
+        stats_table.set(self.name, swsscommon.FieldValuePairs([(name, str(value))
+                                                               for name, value in self.stats.items()]))
+
+
 def get_entry(table, entry_name):
     """
     Get dict entry from Table object.
@@ -97,6 +214,84 @@ def merge_intervals(intervals):
     return ret
 
 
+class IntervalIndex(object):
+    """
+    Closed ip intervals sorted by start address, each with a value, i.e. ip ranges of ports or networks of a vlan.
+    An interval overlapping with a queried one starts at most max_length before it, hence lookups only need to check
+    intervals between two bisect positions instead of all of them.
+    """
+    def __init__(self, intervals=None):
+        """
+        Args:
+            intervals: Optional list of (start, end, value), start and end are ip addresses
+        """
+        self.intervals = []
+        self.starts = []
+        self.max_length = 0
+        for start, end, value in intervals or []:
+            self.add(start, end, value)
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def add(self, start, end, value):
+        """
+        Add interval
+        Args:
+            start: Start ip address of interval
+            end: End ip address of interval, not less than start
+            value: Value of interval
+        """
+        start, end = int(start), int(end)
+        pos = bisect.bisect_left(self.starts, start)
+        self.starts.insert(pos, start)
+        self.intervals.insert(pos, (start, end, value))
+        self.max_length = max(self.max_length, end - start)
+
+    def find_overlaps(self, start, end):
+        """
+        Find intervals overlapping with [start, end]
+        Returns:
+            List of (start, end, value) sorted by start, start and end are int
+        """
+        start, end = int(start), int(end)
+        lo = bisect.bisect_left(self.starts, start - self.max_length)
+        hi = bisect.bisect_right(self.starts, end)
+        return [interval for interval in self.intervals[lo:hi] if interval[1] >= start]
+
+    def find_containing(self, start, end):
+        """
+        Find the interval containing [start, end], the one starting last if several do, i.e. the longest prefix
+        network of an ip range. Of intervals starting at the same address, the one added first is found
+        Returns:
+            Value of interval found, None if not found
+        """
+        start, end = int(start), int(end)
+        lo = bisect.bisect_left(self.starts, start - self.max_length)
+        for pos in range(bisect.bisect_right(self.starts, start) - 1, lo - 1, -1):
+            if self.intervals[pos][1] >= end:
+                return self.intervals[pos][2]
+        return None
+
+    def find_conflicts(self):
+        """
+        Find overlapping intervals which have different values, i.e. one ip assigned to different ports
+        Returns:
+            List of (value1, value2, first overlapping ip address, last overlapping ip address)
+        """
+        conflicts = []
+        for pos, (start, end, value) in enumerate(self.intervals):
+            # Intervals starting after this one and before its end overlap with it
+            for other_pos in range(pos + 1, len(self.intervals)):
+                other_start, other_end, other_value = self.intervals[other_pos]
+                if other_start > end:
+                    break
+                if other_value != value:
+                    conflicts.append((value, other_value, ipaddress.ip_address(other_start),
+                                      ipaddress.ip_address(min(end, other_end))))
+        return conflicts
+
+
 def validate_str_type(type, value):
     """
     To validate whether type is consistent with string value
@@ -137,19 +332,28 @@ def validate_str_type(type, value):
 def _parse_table_to_dict(table):
     ret = {}
     for key in table.getKeys():
-        entry = get_entry(table, key)
-        new_entry = {}
-
-        for field, value in entry.items():
-            # if value of this field is list, field end with @, so cannot found by hget
-            if table.hget(key, field)[0]:
-                new_entry[field] = value
-            else:
-                new_entry[field] = value.split(",")
-        ret[key] = new_entry
+        ret[key] = _parse_fields(table, key, get_entry(table, key))
     return ret
 
 
+def _parse_entry(table, key):
+    exists, entry = table.get(key)
+    if not exists:
+        return None
+    return _parse_fields(table, key, dict(entry))
+
+
+def _parse_fields(table, key, entry):
+    new_entry = {}
+    for field, value in entry.items():
+        # if value of this field is list, field end with @, so cannot found by hget
+        if table.hget(key, field)[0]:
+            new_entry[field] = value
+        else:
+            new_entry[field] = value.split(",")
+    return new_entry
+
+
 def get_target_process_cmds(process_name):
     """
     Get running process cmds
@@ -356,6 +356,7 @@ class DhcpRelayd(object):
 
 def main():
     dhcp_db_connector = DhcpDbConnector(redis_sock=REDIS_SOCK_PATH)
+    dhcp_db_connector.enable_table_cache("dhcprelayd")
     sel = swsscommon.Select()
     checkers = []
     checkers.append(DhcpServerTableIntfEnablementEventChecker(sel, dhcp_db_connector.config_db))
@@ -5,7 +5,7 @@ import os
 import syslog
 
 from jinja2 import Environment, FileSystemLoader
-from dhcp_utilities.common.utils import merge_intervals, validate_str_type, is_smart_switch
+from dhcp_utilities.common.utils import merge_intervals, validate_str_type, is_smart_switch, IntervalIndex
 
 UNICODE_TYPE = str
 DHCP_SERVER_IPV4 = "DHCP_SERVER_IPV4"
@@ -42,6 +42,10 @@ class DhcpServCfgGenerator(object):
         self.lease_path = lease_path
         self.lease_update_script_path = lease_update_script_path
         self.hook_lib_path = hook_lib_path
+        # Results of previous generation, only the dhcp interfaces and ports whose config changed are parsed again
+        self.network_index_cache = {}
+        self.port_cache = {}
+        self.render_cache = None
         # Read port alias map file, this file is render after container start, so it would not change any more
         self._parse_port_map_alias()
         # Get kea config template
@@ -95,7 +99,10 @@ class DhcpServCfgGenerator(object):
         if smart_switch:
             subscribe_table |= set(SMART_SWITCH_CHECKER)
 
-        return self._render_config(render_obj), used_ranges, enabled_dhcp_interfaces, used_options, subscribe_table
+        # Config only needs to be rendered again if anything in it changed
+        if self.render_cache is None or self.render_cache[0] != render_obj:
+            self.render_cache = (render_obj, self._render_config(render_obj))
+        return self.render_cache[1], used_ranges, enabled_dhcp_interfaces, used_options, subscribe_table
 
     def _parse_dpu(self, dpus_table, mid_plane_table):
         """
@@ -316,45 +323,87 @@ class DhcpServCfgGenerator(object):
 
         return ranges
 
-    def _match_range_network(self, dhcp_interface, dhcp_interface_name, port, range, port_ips):
+    def _get_network_index(self, dhcp_interface_name, dhcp_interface):
         """
-        Loop the IP of the dhcp interface and find the network that target range is in this network. And to construct
-        below data to record range - port map
-        {
-            'Vlan1000': {
-                '192.168.0.1/24': {
-                    'etp2': [
-                        [IPv4Address('192.168.0.7'), IPv4Address('192.168.0.7')]
-                    ]
-                }
-            }
-        }
+        Get index of networks of the dhcp interface, it is only built again if ips of the interface changed
         Args:
+            dhcp_interface_name: Name of DHCP interface.
             dhcp_interface: Ip and network information of current DHCP interface, sample:
                 [{
                     'network': IPv4Network('192.168.0.0/24'),
                     'ip': '192.168.0.1/24'
                 }]
-            dhcp_interface_name: Name of DHCP interface.
-            port: Name of DHCP member port.
-            range: Ip Range, sample:
-                [IPv4Address('192.168.0.2'), IPv4Address('192.168.0.5')]
+        Returns:
+            IntervalIndex of networks, value of each network is ip of the interface in it
         """
-        for dhcp_interface_ip in dhcp_interface:
-            if not range[0] in dhcp_interface_ip["network"] or \
-               not range[1] in dhcp_interface_ip["network"]:
+        interface_ips = tuple(dhcp_interface_ip["ip"] for dhcp_interface_ip in dhcp_interface)
+        cached = self.network_index_cache.get(dhcp_interface_name)
+        if cached is not None and cached[0] == interface_ips:
+            return cached[1]
+        network_index = IntervalIndex([(dhcp_interface_ip["network"].network_address,
+                                        dhcp_interface_ip["network"].broadcast_address, dhcp_interface_ip["ip"])
+                                       for dhcp_interface_ip in dhcp_interface])
+        self.network_index_cache[dhcp_interface_name] = (interface_ips, network_index)
+        return network_index
+
+    def _match_range_network(self, network_index, ip_ranges):
+        """
+        Find the network of dhcp interface that each range is in, and merge ranges in the same network to below
+        format
+        {
+            '192.168.0.1/24': [
+                ['192.168.0.2', '192.168.0.6'],
+                ['192.168.0.10', '192.168.0.10']
+            ]
+        }
+        Args:
+            network_index: IntervalIndex of networks of DHCP interface.
+            ip_ranges: Ip Ranges, sample:
+                [
+                    [IPv4Address('192.168.0.2'), IPv4Address('192.168.0.5')],
+                    [IPv4Address('192.168.0.3'), IPv4Address('192.168.0.6')]
+                ]
+        """
+        interface_ranges = {}
+        for ip_range in ip_ranges:
+            dhcp_interface_ip_str = network_index.find_containing(ip_range[0], ip_range[1])
+            if dhcp_interface_ip_str is None:
                 continue
-            dhcp_interface_ip_str = dhcp_interface_ip["ip"]
-            if dhcp_interface_ip_str not in port_ips[dhcp_interface_name]:
-                port_ips[dhcp_interface_name][dhcp_interface_ip_str] = {}
-            if port not in port_ips[dhcp_interface_name][dhcp_interface_ip_str]:
-                port_ips[dhcp_interface_name][dhcp_interface_ip_str][port] = []
-            port_ips[dhcp_interface_name][dhcp_interface_ip_str][port].append([range[0], range[1]])
-            break
+            if dhcp_interface_ip_str not in interface_ranges:
+                interface_ranges[dhcp_interface_ip_str] = []
+            interface_ranges[dhcp_interface_ip_str].append([ip_range[0], ip_range[1]])
+        # Merge ranges to avoid overlap
+        for dhcp_interface_ip_str, ip_range in interface_ranges.items():
+            interface_ranges[dhcp_interface_ip_str] = [[str(range[0]), str(range[1])]
+                                                       for range in merge_intervals(ip_range)]
+        return interface_ranges
+
+    def _check_range_conflict(self, dhcp_interface_name, interface_port_ips):
+        """
+        Log ips which are assigned to more than one port of dhcp interface
+        Args:
+            dhcp_interface_name: Name of DHCP interface.
+            interface_port_ips: Ranges of ports in each network of DHCP interface, sample:
+                {
+                    '192.168.0.1/24': {
+                        'etp2': [
+                            ['192.168.0.7', '192.168.0.7']
+                        ]
+                    }
+                }
+        """
+        for dhcp_interface_ip, port_range in interface_port_ips.items():
+            range_index = IntervalIndex([(ipaddress.ip_address(ip_range[0]), ipaddress.ip_address(ip_range[1]),
+                                          port_name)
+                                         for port_name, ip_ranges in port_range.items() for ip_range in ip_ranges])
+            for port1, port2, first_ip, last_ip in range_index.find_conflicts():
+                syslog.syslog(syslog.LOG_WARNING, f"Ips {first_ip} - {last_ip} of {dhcp_interface_name} "
+                              f"{dhcp_interface_ip} are assigned to both {port1} and {port2}")
 
     def _parse_port(self, port_ipv4, dhcp_interfaces, dhcp_members, ranges):
         """
         Parse content in DHCP_SERVER_IPV4_PORT table to below format, which indicate ip ranges assign to interface.
+        Ports whose config, ranges and dhcp interface ips are the same as in previous parsing are not parsed again.
         Args:
             port_ipv4: Table object.
             dhcp_interfaces: DHCP interfaces information, sample:
@@ -384,8 +433,9 @@ class DhcpServCfgGenerator(object):
             Set of used ranges.
         """
         port_ips = {}
-        ip_ports = {}
         used_ranges = set()
+        port_cache = {}
+        changed_interfaces = set()
         for port_key in list(port_ipv4.keys()):
             port_config = port_ipv4.get(port_key, {})
             # Cannot specify both 'ips' and 'ranges'
@@ -409,33 +459,39 @@ class DhcpServCfgGenerator(object):
             if dhcp_interface_name not in port_ips:
                 port_ips[dhcp_interface_name] = {}
             # Get ip information of Vlan
-            dhcp_interface = dhcp_interfaces[dhcp_interface_name]
+            network_index = self._get_network_index(dhcp_interface_name, dhcp_interfaces[dhcp_interface_name])
 
-            for dhcp_interface_ip in dhcp_interface:
-                ip_ports[str(dhcp_interface_ip["network"])] = dhcp_interface_name
-
-            if "ips" in port_config and len(port_config["ips"]) != 0:
-                for ip in set(port_config["ips"]):
+            port_ip_list = sorted(set(port_config["ips"])) if "ips" in port_config else []
+            port_range_names = list(port_config["ranges"]) if "ranges" in port_config else []
+            used_ranges.update(port_range_names)
+            port_ranges = tuple((range_name, tuple(ranges[range_name]) if range_name in ranges else None)
+                                for range_name in port_range_names)
+            port_inputs = (network_index, port, tuple(port_ip_list), port_ranges)
+            cached = self.port_cache.get(port_key)
+            if cached is not None and cached[0] == port_inputs:
+                interface_ranges = cached[1]
+            else:
+                ip_ranges = []
+                for ip in port_ip_list:
                     ip_address = ipaddress.ip_address(ip)
-                    # Loop the IP of the dhcp interface and find the network that target ip is in this network.
-                    self._match_range_network(dhcp_interface, dhcp_interface_name, port, [ip_address, ip_address],
-                                              port_ips)
-            if "ranges" in port_config and len(port_config["ranges"]) != 0:
-                for range_name in list(port_config["ranges"]):
-                    used_ranges.add(range_name)
-                    if range_name not in ranges:
+                    ip_ranges.append([ip_address, ip_address])
+                for range_name, range in port_ranges:
+                    if range is None:
                         syslog.syslog(syslog.LOG_WARNING, f"Range {range_name} is not in range table, skip")
                         continue
-                    range = ranges[range_name]
-                    # Loop the IP of the dhcp interface and find the network that target range is in this network.
-                    self._match_range_network(dhcp_interface, dhcp_interface_name, port, range, port_ips)
-        # Merge ranges to avoid overlap
-        for dhcp_interface_name, value in port_ips.items():
-            for dhcp_interface_ip, port_range in value.items():
-                for port_name, ip_range in port_range.items():
-                    ranges = merge_intervals(ip_range)
-                    ranges = [[str(range[0]), str(range[1])] for range in ranges]
-                    port_ips[dhcp_interface_name][dhcp_interface_ip][port_name] = ranges
+                    ip_ranges.append(list(range))
+                # Find the network of the dhcp interface that target range is in
+                interface_ranges = self._match_range_network(network_index, ip_ranges)
+                changed_interfaces.add(dhcp_interface_name)
+            port_cache[port_key] = (port_inputs, interface_ranges)
+
+            for dhcp_interface_ip, ip_range in interface_ranges.items():
+                if dhcp_interface_ip not in port_ips[dhcp_interface_name]:
+                    port_ips[dhcp_interface_name][dhcp_interface_ip] = {}
+                port_ips[dhcp_interface_name][dhcp_interface_ip][port] = ip_range
+        self.port_cache = port_cache
+        for dhcp_interface_name in changed_interfaces:
+            self._check_range_conflict(dhcp_interface_name, port_ips[dhcp_interface_name])
         return port_ips, used_ranges
 
     def _read_dhcp_option(self, file_path):
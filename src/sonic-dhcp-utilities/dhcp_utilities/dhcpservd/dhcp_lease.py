@@ -1,14 +1,13 @@
+import os
 import signal
 import syslog
 import threading
-import time
 from abc import abstractmethod
-from collections import deque
 from datetime import datetime
+from swsscommon import swsscommon
 
 DHCP_SERVER_IPV4_LEASE = "DHCP_SERVER_IPV4_LEASE"
 KEA_LEASE_FILE_PATH = "/tmp/kea-lease.csv"
-DEFAULE_LEASE_UPDATE_INTERVAL = 2  # unit: sec
 
 
 class LeaseManager(object):
@@ -24,16 +23,20 @@ class LeaseManager(object):
 
 
 class LeaseHanlder(object):
-    def __init__(self, db_connector, lease_update_interval=DEFAULE_LEASE_UPDATE_INTERVAL):
+    def __init__(self, db_connector):
         self.db_connector = db_connector
-        self.lease_update_interval = lease_update_interval
-        self.last_update_time = None
         self.lock = threading.Lock()
+        self.pending = False
+        # Newest lease information of each client which is not known to be released or expired
+        self.leases = {}
+        # Leases in STATE_DB, None before the lease table has been read
+        self.published = None
+        self.pipeline = None
 
     @abstractmethod
     def _read(self):
         """
-        Read lease file to get newest lease information
+        Read lease information changed since the last read
         """
         raise NotImplementedError
 
@@ -48,48 +51,63 @@ class LeaseHanlder(object):
         """
         Update lease table in STATE_DB
         """
-        last_update_time = self.last_update_time
-        curr_time = datetime.now()
-        # If the time since the last update is less than self.lease_update_interval, then wait for a
-        # self.lease_update_interval
-        if last_update_time is not None and (curr_time - last_update_time).seconds < self.lease_update_interval:
-            time.sleep(self.lease_update_interval)
-            if self.last_update_time != last_update_time:
-                # Means lease has been updated during sleep, no need to update this lease
-                return
         if not self.lock.acquire(False):
+            # An update is running, i.e. the signal handler interrupted it. Let it read the file once more
+            self.pending = True
             return
-        new_lease = self._read()
-        # Store old lease key
-        old_lease_table = self.db_connector.get_state_db_table(DHCP_SERVER_IPV4_LEASE)
-        old_lease_key = set(old_lease_table.keys())
-
+        try:
+            self.pending = True
+            while self.pending:
+                self.pending = False
+                self.leases.update(self._read())
+                self._sync_lease()
+        finally:
+            self.lock.release()
+
+    def _sync_lease(self):
+        """
+        Write the difference between lease information and lease table in STATE_DB through one redis pipeline
+        """
+        if self.published is None:
+            self.published = self.db_connector.get_state_db_table(DHCP_SERVER_IPV4_LEASE)
+        if self.pipeline is None:
+            self.pipeline = swsscommon.RedisPipeline(self.db_connector.state_db)
+        unix_time = datetime.now().timestamp()
+        commands = []
         # 1.1 If start time equal to end time or lease expired, means lease has been released
         #     1.1.1 If current lease table has this old lease, delete it
         #     1.1.2 Else skip
-        # 1.2 Else, means lease valid, save it.
-        for key, value in new_lease.items():
-            unix_time = datetime.now().timestamp()
+        # 1.2 Else, means lease valid, save it if it changed.
+        for key, value in list(self.leases.items()):
             if value["lease_start"] == value["lease_end"] or unix_time >= int(value["lease_end"]):
-                if key in old_lease_key:
-                    self.db_connector.state_db.delete("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key))
+                del self.leases[key]
                 continue
-            new_key = "{}|{}".format(DHCP_SERVER_IPV4_LEASE, key)
-            for k, v in new_lease[key].items():
-                self.db_connector.state_db.hset(new_key, k, v)
-        # Delete old lease not in new lease set
-        for key in old_lease_key:
-            if key not in new_lease.keys():
-                # Delete entry
-                self.db_connector.state_db.delete("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key))
-        self.last_update_time = datetime.now()
-        self.lock.release()
+            if self.published.get(key) != value:
+                command = swsscommon.RedisCommand()
+                command.formatHSET("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key), value)
+                commands.append(command)
+                self.published[key] = value
+        # Delete old lease not in lease set
+        for key in [key for key in self.published if key not in self.leases]:
+            command = swsscommon.RedisCommand()
+            command.formatDEL("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key))
+            commands.append(command)
+            del self.published[key]
+        if not commands:
+            return
+        for command in commands:
+            self.pipeline.push(command)
+        self.pipeline.flush()
 
 
 class KeaDhcp4LeaseHandler(LeaseHanlder):
     def __init__(self, db_connector, lease_file=KEA_LEASE_FILE_PATH):
         LeaseHanlder.__init__(self, db_connector)
         self.lease_file = lease_file
+        self.lease_fb = None
+        self.inode = None
+        # Last line of lease file which hasn't been completely written yet
+        self.partial_line = b""
 
     def register(self):
         """
@@ -97,38 +115,73 @@ class KeaDhcp4LeaseHandler(LeaseHanlder):
         """
         signal.signal(signal.SIGUSR1, self._update_lease)
 
-    def _read(self):
-        # Read lease file generated by kea-dhcp4
+    def _open(self):
+        """
+        Open lease file generated by kea-dhcp4 to read it from the beginning
+        """
         try:
-            with open(self.lease_file, "r", encoding="utf-8") as fb:
-                dq = deque(fb)
+            fb = open(self.lease_file, "rb")
         except FileNotFoundError as err:
             syslog.syslog(syslog.LOG_ERR, "Cannot find lease file: {}".format(self.lease_file))
             raise err
+        if self.lease_fb is not None:
+            self.lease_fb.close()
+        self.lease_fb = fb
+        self.inode = os.fstat(fb.fileno()).st_ino
+        self.partial_line = b""
 
+    def _read(self):
+        """
+        Read lease lines appended to lease file since the last read. Lease file cleanup of kea-dhcp4 moves
+        lease file away and starts a new one, the moved file is read to its end before reading the new one.
+        Returns:
+            Newest lease information of each client in the new lines, sample:
+                {
+                    "Vlan1000|10:70:fd:b6:13:17": {
+                        "lease_start": "1693997315",
+                        "lease_end": "1694000915",
+                        "ip": "192.168.0.131"
+                    }
+                }
+        """
         new_lease = {}
-        # Get newest lease information of each client
-        while dq:
-            last_row = dq.pop()
-            splits = last_row.split(",")
+        if self.lease_fb is None:
+            self._open()
+        else:
+            self._read_lines(new_lease)
+            try:
+                stat = os.stat(self.lease_file)
+            except FileNotFoundError:
+                # New lease file hasn't been created yet, it would be read in next update
+                return new_lease
+            if stat.st_ino == self.inode and stat.st_size >= self.lease_fb.tell():
+                return new_lease
+            # Lease file has been replaced or truncated
+            self._open()
+        self._read_lines(new_lease)
+        return new_lease
+
+    def _read_lines(self, new_lease):
+        lines = (self.partial_line + self.lease_fb.read()).split(b"\n")
+        self.partial_line = lines.pop()
+        for line in lines:
+            splits = line.decode("utf-8", "replace").strip().split(",")
             # Skip header
-            if splits[0] == "address":
-                break
+            if splits[0] == "address" or len(splits) < 6:
+                continue
             ip_str = splits[0]
             mac_address = splits[1]
             valid_lifetime = splits[3]
             lease_end = splits[4]
             subnet_id = splits[5]
 
+            # Lines are in time order, the last one of each client is the newest
             new_key = "{}|{}".format("Vlan" + subnet_id, mac_address)
-            if new_key in new_lease:
-                continue
             new_lease[new_key] = {
                 "lease_start": str(int(lease_end) - int(valid_lifetime)),
                 "lease_end": lease_end,
                 "ip": ip_str
             }
-        return new_lease
 
     def _update_lease(self, signum, frame):
         self.update_lease()
@@ -33,6 +33,7 @@ class DhcpServd(object):
         self.kea_dhcp4_config_path = kea_dhcp4_config_path
         self.dhcp_servd_monitor = monitor
         self.enabled_checker = None
+        self.kea_dhcp4_config = None
 
     def _notify_kea_dhcp4_proc(self):
         """
@@ -57,8 +58,12 @@ class DhcpServd(object):
         self.used_range = used_ranges
         self.enabled_dhcp_interfaces = enabled_dhcp_interfaces
         self.used_options = used_options
+        if kea_dhcp4_config == self.kea_dhcp4_config:
+            # Config change doesn't affect kea-dhcp4 config, no need to reload it
+            return
         with open(self.kea_dhcp4_config_path, "w") as write_file:
             write_file.write(kea_dhcp4_config)
+        self.kea_dhcp4_config = kea_dhcp4_config
         # After refresh kea-config, we need to SIGHUP kea-dhcp4 process to read new config
         self._notify_kea_dhcp4_proc()
 
@@ -101,6 +106,7 @@ class DhcpServd(object):
 
 def main():
     dhcp_db_connector = DhcpDbConnector(redis_sock=REDIS_SOCK_PATH)
+    dhcp_db_connector.enable_table_cache("dhcpservd")
     hook_lib_path_res = subprocess.run(["find", "/", "-name", "libdhcp_run_script.so"],
                                        capture_output=True).stdout.decode().strip()
     if len(hook_lib_path_res) == 0:
@@ -2,10 +2,11 @@ import copy
 import ipaddress
 import json
 import pytest
+import syslog
 from common_utils import MockConfigDb, mock_get_config_db_table, PORT_MODE_CHECKER
 from dhcp_utilities.common.utils import DhcpDbConnector
 from dhcp_utilities.dhcpservd.dhcp_cfggen import DhcpServCfgGenerator
-from unittest.mock import patch
+from unittest.mock import patch, call
 
 expected_dhcp_config = {
     "Dhcp4": {
@@ -318,6 +319,62 @@ def test_parse_port(test_config_db, mock_swsscommon_dbconnector_init, mock_get_r
                            if test_config_db == "mock_config_db.json" else set())
 
 
+def test_parse_port_incremental(mock_swsscommon_dbconnector_init, mock_get_render_template,
+                                mock_parse_port_map_alias):
+    mock_config_db = MockConfigDb(config_db_path="tests/test_data/mock_config_db.json")
+    dhcp_db_connector = DhcpDbConnector()
+    dhcp_cfg_generator = DhcpServCfgGenerator(dhcp_db_connector, "/usr/local/lib/kea/hooks/libdhcp_run_script.so")
+    ipv4_port = copy.deepcopy(mock_config_db.config_db.get("DHCP_SERVER_IPV4_PORT"))
+    vlan_members = mock_config_db.config_db.get("VLAN_MEMBER").keys()
+    with patch.object(DhcpServCfgGenerator, "_match_range_network",
+                      side_effect=dhcp_cfg_generator._match_range_network) as mock_match, \
+         patch("syslog.syslog") as mock_syslog:
+        parsed_port, _ = dhcp_cfg_generator._parse_port(ipv4_port, expected_vlan_ipv4_interface, vlan_members,
+                                                        expected_parsed_range)
+        assert parsed_port == expected_parsed_port
+        assert mock_match.call_count == 3
+        # 192.168.0.10 is assigned to both etp8 and Ethernet40
+        mock_syslog.assert_any_call(syslog.LOG_WARNING, "Ips 192.168.0.10 - 192.168.0.10 of Vlan1000 192.168.0.1/21 "
+                                    "are assigned to both Ethernet40 and etp8")
+
+        # Nothing changed, nothing parsed again
+        mock_match.reset_mock()
+        mock_syslog.reset_mock()
+        parsed_port, _ = dhcp_cfg_generator._parse_port(ipv4_port, expected_vlan_ipv4_interface, vlan_members,
+                                                        expected_parsed_range)
+        assert parsed_port == expected_parsed_port
+        mock_match.assert_not_called()
+        assert call(syslog.LOG_WARNING, "Range range2 is not in range table, skip") not in mock_syslog.mock_calls
+
+        # Only changed port is parsed again
+        ipv4_port["Vlan1000|Ethernet40"]["ips"] = ["192.168.0.11"]
+        parsed_port, _ = dhcp_cfg_generator._parse_port(ipv4_port, expected_vlan_ipv4_interface, vlan_members,
+                                                        expected_parsed_range)
+        assert parsed_port["Vlan1000"]["192.168.0.1/21"]["Ethernet40"] == [["192.168.0.11", "192.168.0.11"]]
+        mock_match.assert_called_once()
+
+        # Ranges in port are parsed again once range changed
+        mock_match.reset_mock()
+        tested_ranges = copy.deepcopy(expected_parsed_range)
+        tested_ranges["range3"] = [ipaddress.IPv4Address("192.168.0.20"), ipaddress.IPv4Address("192.168.0.21")]
+        parsed_port, _ = dhcp_cfg_generator._parse_port(ipv4_port, expected_vlan_ipv4_interface, vlan_members,
+                                                        tested_ranges)
+        assert parsed_port["Vlan1000"]["192.168.0.1/21"]["etp8"] == [["192.168.0.2", "192.168.0.5"],
+                                                                     ["192.168.0.20", "192.168.0.21"]]
+        mock_match.assert_called_once()
+
+
+def test_generate_render_once(mock_swsscommon_dbconnector_init, mock_parse_port_map_alias, mock_get_render_template):
+    with patch.object(DhcpServCfgGenerator, "_render_config", return_value="dummy_config") as mock_render, \
+         patch.object(DhcpDbConnector, "get_config_db_table", side_effect=mock_get_config_db_table), \
+         patch("dhcp_utilities.dhcpservd.dhcp_cfggen.is_smart_switch", return_value=False):
+        dhcp_db_connector = DhcpDbConnector()
+        dhcp_cfg_generator = DhcpServCfgGenerator(dhcp_db_connector, "/usr/local/lib/kea/hooks/libdhcp_run_script.so")
+        assert dhcp_cfg_generator.generate()[0] == "dummy_config"
+        assert dhcp_cfg_generator.generate()[0] == "dummy_config"
+        mock_render.assert_called_once()
+
+
 def test_generate(mock_swsscommon_dbconnector_init, mock_parse_port_map_alias, mock_get_render_template):
     with patch.object(DhcpServCfgGenerator, "_parse_hostname"), \
          patch.object(DhcpServCfgGenerator, "_parse_vlan", return_value=({}, set(["Ethernet0"]))), \
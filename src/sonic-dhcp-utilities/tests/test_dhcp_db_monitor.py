@@ -9,7 +9,7 @@ from dhcp_utilities.common.dhcp_db_monitor import DhcpRelaydDbMonitor, DhcpServd
     MidPlaneTableEventChecker, DpusTableEventChecker
 from dhcp_utilities.common.utils import DhcpDbConnector
 from swsscommon import swsscommon
-from unittest.mock import patch, ANY, PropertyMock, MagicMock
+from unittest.mock import patch, ANY, PropertyMock, MagicMock, call
 
 
 @pytest.mark.parametrize("checker_enabled", [True, False])
@@ -397,3 +397,66 @@ def test_dpus_table_checker(mock_swsscommon_dbconnector_init, tested_data):
         expected_res = tested_data["exp_res"]
         check_res = db_event_checker.check_update_event({})
         assert expected_res == check_res
+
+
+def test_checker_update_table_cache(mock_swsscommon_dbconnector_init):
+    with patch.object(swsscommon, "SubscriberStateTable", return_value=MockSubscribeTable([
+             ("Vlan1000", "SET", (("vlanid", "1000"),)),
+             ("Vlan2000", "DEL", ())
+         ])), \
+         patch.object(DhcpDbConnector, "get_config_db_table"):
+        db_connector = DhcpDbConnector()
+        db_connector.table_cache = MagicMock()
+        checker = VlanTableEventChecker(MagicMock(), None)
+        DhcpRelaydDbMonitor(db_connector, None, [checker])
+        checker.enable()
+        db_connector.table_cache.subscribe.assert_called_once_with("VLAN", checker)
+        assert not checker.check_update_event({"enabled_dhcp_interfaces": set()})
+        db_connector.table_cache.apply_event.assert_has_calls([call("VLAN", "Vlan1000", "SET"),
+                                                               call("VLAN", "Vlan2000", "DEL")])
+        checker.disable()
+        db_connector.table_cache.unsubscribe.assert_called_once_with("VLAN", checker)
+
+
+def test_table_cache_drain_events(mock_swsscommon_dbconnector_init):
+    vlan_table = MockSubscribeTable([])
+    vlan_intf_table = MockSubscribeTable([("Vlan1000|192.168.0.1/24", "SET", ())])
+    sel = MagicMock()
+    sel.select.return_value = (swsscommon.Select.TIMEOUT, None)
+    with patch.object(swsscommon, "SubscriberStateTable", side_effect=[vlan_table, vlan_intf_table]), \
+         patch.object(swsscommon.Table, "getKeys", return_value=["Vlan1000"]) as mock_get_keys, \
+         patch.object(swsscommon.Table, "get", return_value=(True, (("vlanid", "1000"),))), \
+         patch.object(swsscommon.Table, "hget", return_value=(True, "")):
+        db_connector = DhcpDbConnector()
+        db_connector.enable_table_cache("dhcpservd")
+        vlan_checker = VlanTableEventChecker(sel, None)
+        vlan_intf_checker = VlanIntfTableEventChecker(sel, None)
+        db_monitor = DhcpServdDbMonitor(db_connector, sel, [vlan_intf_checker, vlan_checker])
+        db_monitor.enable_checkers(["VlanTableEventChecker", "VlanIntfTableEventChecker"])
+        assert db_connector.get_config_db_table("VLAN") == {"Vlan1000": {"vlanid": "1000"}}
+
+        # Refresh is triggered by VLAN_INTERFACE table
+        db_snapshot = {"enabled_dhcp_interfaces": {"Vlan1000"}, "used_range": set(), "used_options": set()}
+        sel.select.return_value = (swsscommon.Select.OBJECT, None)
+        assert db_monitor.check_db_update(db_snapshot)
+
+        # Event of VLAN table arrives, but hasn't been read by select yet
+        new_events = [("Vlan2000", "SET", (("vlanid", "1000"),))]
+
+        def mock_select(timeout):
+            if timeout == 0 and new_events:
+                vlan_table.stack.append(new_events.pop())
+                return swsscommon.Select.OBJECT, None
+            return swsscommon.Select.TIMEOUT, None
+        sel.select.side_effect = mock_select
+        assert db_connector.get_config_db_table("VLAN") == {"Vlan1000": {"vlanid": "1000"},
+                                                           "Vlan2000": {"vlanid": "1000"}}
+        assert mock_get_keys.call_count == 1
+
+        # Drained event is still checked, without waiting for select
+        assert vlan_checker.has_pending_events()
+        sel.select.reset_mock()
+        db_snapshot["enabled_dhcp_interfaces"] = {"Vlan2000"}
+        assert db_monitor.check_db_update(db_snapshot)
+        sel.select.assert_not_called()
+        assert not vlan_checker.has_pending_events()
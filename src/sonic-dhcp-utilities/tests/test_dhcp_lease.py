@@ -1,8 +1,12 @@
+import os
 from dhcp_utilities.common.utils import DhcpDbConnector
 from dhcp_utilities.dhcpservd.dhcp_lease import KeaDhcp4LeaseHandler, LeaseHanlder
 from freezegun import freeze_time
 from swsscommon import swsscommon
-from unittest.mock import patch, call, MagicMock
+from unittest.mock import patch, MagicMock
+
+KEA_LEASE_HEADER = "address,hwaddr,client_id,valid_lifetime,expire,subnet_id,fqdn_fwd,fqdn_rev,hostname,state," + \
+    "user_context,pool_id\n"
 
 expected_lease = {
     "Vlan1000|10:70:fd:b6:13:00": {
@@ -50,9 +54,62 @@ def test_read_kea_lease(mock_swsscommon_dbconnector_init):
     assert lease == expected_lease
 
 
+def test_read_kea_lease_incremental(mock_swsscommon_dbconnector_init, tmp_path):
+    lease_file = str(tmp_path / "kea-lease.csv")
+    with open(lease_file, "w") as f:
+        f.write(KEA_LEASE_HEADER)
+        f.write("192.168.0.2,10:70:fd:b6:13:00,,3600,1694000905,1000,0,0,7626dced293e,0,,0\n")
+    db_connector = DhcpDbConnector()
+    kea_lease_handler = KeaDhcp4LeaseHandler(db_connector, lease_file=lease_file)
+    assert kea_lease_handler._read() == {
+        "Vlan1000|10:70:fd:b6:13:00": {"lease_start": "1693997305", "lease_end": "1694000905", "ip": "192.168.0.2"}
+    }
+    # Nothing appended
+    assert kea_lease_handler._read() == {}
+    # Line being written is read once it has been completed
+    with open(lease_file, "a") as f:
+        f.write("192.168.0.3,10:70:fd:b6:13:01,,3600,16940")
+    assert kea_lease_handler._read() == {}
+    with open(lease_file, "a") as f:
+        f.write("00905,1000,0,0,7626dced293e,0,,0\n")
+    assert kea_lease_handler._read() == {
+        "Vlan1000|10:70:fd:b6:13:01": {"lease_start": "1693997305", "lease_end": "1694000905", "ip": "192.168.0.3"}
+    }
+    # Lease file cleanup moves the file away after one more line has been appended, and starts a new file
+    with open(lease_file, "a") as f:
+        f.write("192.168.0.4,10:70:fd:b6:13:02,,3600,1694000905,1000,0,0,7626dced293e,0,,0\n")
+    os.rename(lease_file, lease_file + ".2")
+    assert kea_lease_handler._read() == {
+        "Vlan1000|10:70:fd:b6:13:02": {"lease_start": "1693997305", "lease_end": "1694000905", "ip": "192.168.0.4"}
+    }
+    with open(lease_file, "w") as f:
+        f.write(KEA_LEASE_HEADER)
+        f.write("192.168.0.3,10:70:fd:b6:13:01,,0,1693998000,1000,0,0,7626dced293e,0,,0\n")
+    assert kea_lease_handler._read() == {
+        "Vlan1000|10:70:fd:b6:13:01": {"lease_start": "1693998000", "lease_end": "1693998000", "ip": "192.168.0.3"}
+    }
+    # Truncated file is read from the beginning
+    with open(lease_file, "w") as f:
+        f.write(KEA_LEASE_HEADER)
+    assert kea_lease_handler._read() == {}
+
+
+class MockRedisCommand(object):
+    def formatHSET(self, key, values):
+        self.op = ("HSET", key, values)
+
+    def formatDEL(self, key):
+        self.op = ("DEL", key)
+
+
+def get_pipeline_ops(mock_pipeline):
+    ops = [args[0].op for args, _ in mock_pipeline.push.call_args_list]
+    mock_pipeline.reset_mock()
+    return sorted(ops)
+
+
 # Cannot mock built-in/extension type function(datetime.datetime.timestamp), need to free time
-@freeze_time("2023-09-08")
-def test_update_kea_lease(mock_swsscommon_dbconnector_init, mock_swsscommon_table_init):
+def test_update_kea_lease(mock_swsscommon_dbconnector_init):
     tested_lease = expected_lease
     mock_lease_table = {
         "Vlan1000|aa:bb:cc:dd:ee:ff": {},
@@ -60,31 +117,55 @@ def test_update_kea_lease(mock_swsscommon_dbconnector_init, mock_swsscommon_tabl
         "Vlan1000|10:70:fd:b6:13:17": {},
         "Vlan1000|10:70:fd:b6:13:18": {}
     }
-    with patch.object(swsscommon.Table, "getKeys"), \
-         patch.object(swsscommon.DBConnector, "hset") as mock_hset, \
-         patch.object(KeaDhcp4LeaseHandler, "_read", MagicMock(return_value=tested_lease)), \
-         patch.object(DhcpDbConnector, "get_state_db_table",
-                      return_value=mock_lease_table), \
-         patch.object(swsscommon.DBConnector, "delete") as mock_delete, \
-         patch("time.sleep", return_value=None) as mock_sleep:
+    with freeze_time("2023-09-08") as frozen_time, \
+         patch.object(swsscommon, "RedisPipeline") as mock_pipeline, \
+         patch.object(swsscommon, "RedisCommand", MockRedisCommand), \
+         patch.object(KeaDhcp4LeaseHandler, "_read", MagicMock(side_effect=[tested_lease, {}, {}])), \
+         patch.object(DhcpDbConnector, "get_state_db_table", return_value=mock_lease_table) as mock_get_table:
         db_connector = DhcpDbConnector()
         kea_lease_handler = KeaDhcp4LeaseHandler(db_connector)
         kea_lease_handler.update_lease()
-        # Verify that old key was deleted
-        mock_delete.assert_has_calls([
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:00"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:17"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|aa:bb:cc:dd:ee:ff")
-        ])
-        # Verify that lease has been updated, to be noted that lease for "192.168.0.2" didn't been updated because
-        # lease_start equals to lease_end
-        mock_hset.assert_has_calls([
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "lease_start", "1697607205"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "lease_end", "1697610805"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "ip", "193.168.0.132")
-        ])
+        # Verify that old key was deleted and that lease has been updated, to be noted that lease for "192.168.0.2"
+        # didn't been updated because lease_start equals to lease_end
+        assert get_pipeline_ops(mock_pipeline.return_value) == [
+            ("DEL", "DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:00"),
+            ("DEL", "DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:17"),
+            ("DEL", "DHCP_SERVER_IPV4_LEASE|Vlan1000|aa:bb:cc:dd:ee:ff"),
+            ("HSET", "DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18",
+             {"lease_start": "1697607205", "lease_end": "1697610805", "ip": "193.168.0.132"})
+        ]
+        # Nothing changed, nothing written
+        kea_lease_handler.update_lease()
+        assert get_pipeline_ops(mock_pipeline.return_value) == []
+        mock_pipeline.return_value.flush.assert_not_called()
+        # Lease expired
+        frozen_time.move_to("2023-10-19")
+        kea_lease_handler.update_lease()
+        mock_pipeline.return_value.flush.assert_called_once_with()
+        assert get_pipeline_ops(mock_pipeline.return_value) == [
+            ("DEL", "DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18")
+        ]
+        # Lease table is only read once
+        mock_get_table.assert_called_once_with("DHCP_SERVER_IPV4_LEASE")
+
+
+def test_update_kea_lease_during_update(mock_swsscommon_dbconnector_init):
+    db_connector = DhcpDbConnector()
+    kea_lease_handler = KeaDhcp4LeaseHandler(db_connector)
+    read_count = []
+
+    def mock_read():
+        if not read_count:
+            # Signal received while reading lease file
+            kea_lease_handler.update_lease()
+        read_count.append(1)
+        return {}
+    with patch.object(swsscommon, "RedisPipeline"), \
+         patch.object(DhcpDbConnector, "get_state_db_table", return_value={}), \
+         patch.object(kea_lease_handler, "_read", side_effect=mock_read):
         kea_lease_handler.update_lease()
-        mock_sleep.assert_called_once_with(2)
+    assert len(read_count) == 2
+    assert not kea_lease_handler.lock.locked()
 
 
 def test_no_implement(mock_swsscommon_dbconnector_init):
@@ -1,5 +1,6 @@
 import pytest
 import json
+import os
 import psutil
 import signal
 import sys
@@ -62,6 +63,27 @@ def test_dump_dhcp4_config(mock_swsscommon_dbconnector_init, enabled_checker):
             mock_subscribe.assert_called_once_with(new_enabled_checker - enabled_checker)
 
 
+def test_dump_dhcp4_config_unchanged(mock_swsscommon_dbconnector_init, tmp_path):
+    enabled_checker = set(["VlanTableEventChecker"])
+    with patch("dhcp_utilities.dhcpservd.dhcp_cfggen.DhcpServCfgGenerator.generate",
+               return_value=(tested_config, set(), set(), set(), enabled_checker)) as mock_generate, \
+         patch("dhcp_utilities.dhcpservd.dhcpservd.DhcpServd._notify_kea_dhcp4_proc",
+               MagicMock()) as mock_notify_kea_dhcp4_proc, \
+         patch.object(DhcpServCfgGenerator, "_parse_port_map_alias"):
+        dhcp_db_connector = DhcpDbConnector()
+        dhcp_cfg_generator = DhcpServCfgGenerator(dhcp_db_connector, "/usr/local/lib/kea/hooks/libdhcp_run_script.so",
+                                                  kea_conf_template_path="tests/test_data/kea-dhcp4.conf.j2")
+        dhcpservd = DhcpServd(dhcp_cfg_generator, dhcp_db_connector, None,
+                              kea_dhcp4_config_path=str(tmp_path / "kea-dhcp4.conf"))
+        dhcpservd.dump_dhcp4_config()
+        os.remove(str(tmp_path / "kea-dhcp4.conf"))
+        dhcpservd.dump_dhcp4_config()
+        # Same config is neither written nor reloaded again
+        assert mock_generate.call_count == 2
+        assert not os.path.exists(str(tmp_path / "kea-dhcp4.conf"))
+        mock_notify_kea_dhcp4_proc.assert_called_once_with()
+
+
 @pytest.mark.parametrize("process_list", [["proc1", "proc2", "kea-dhcp4"], ["proc1", "proc2"]])
 def test_notify_kea_dhcp4_proc(process_list, mock_swsscommon_dbconnector_init, mock_get_render_template,
                                mock_parse_port_map_alias):
@@ -4,7 +4,7 @@ import psutil
 import pytest
 from swsscommon import swsscommon
 from common_utils import MockProc
-from unittest.mock import patch, call, PropertyMock
+from unittest.mock import patch, call, PropertyMock, MagicMock
 
 interval_test_data = {
     "ordered_with_overlap": {
@@ -105,6 +105,56 @@ def test_get_db_table(mock_swsscommon_dbconnector_init, mock_swsscommon_table_in
         }
 
 
+def test_table_cache(mock_swsscommon_dbconnector_init, mock_swsscommon_table_init):
+    dhcp_db_connector = utils.DhcpDbConnector()
+    dhcp_db_connector.enable_table_cache("dhcpservd")
+    table_cache = dhcp_db_connector.table_cache
+    checker = MagicMock()
+    checker.sel.select.return_value = (swsscommon.Select.TIMEOUT, None)
+    with patch.object(swsscommon.Table, "getKeys", return_value=["Vlan1000"]) as mock_get_keys, \
+         patch.object(swsscommon.Table, "get", return_value=(True, (("list", "1,2"), ("value", "3,4")))), \
+         patch.object(swsscommon.Table, "hget", side_effect=mock_hget):
+        # Table isn't subscribed, read it each time
+        dhcp_db_connector.get_config_db_table("VLAN")
+        dhcp_db_connector.get_config_db_table("VLAN")
+        assert mock_get_keys.call_count == 2
+        table_cache.apply_event("VLAN", "Vlan1000", "DEL")
+
+        table_cache.subscribe("VLAN", checker)
+        assert dhcp_db_connector.get_config_db_table("VLAN") == {"Vlan1000": {"list": ["1", "2"], "value": "3,4"}}
+        checker.fetch_events.assert_not_called()
+        assert dhcp_db_connector.get_config_db_table("VLAN") == {"Vlan1000": {"list": ["1", "2"], "value": "3,4"}}
+        assert mock_get_keys.call_count == 3
+        # Pending events are drained before snapshot is served
+        checker.fetch_events.assert_called_once_with()
+        checker.sel.select.assert_called_once_with(0)
+
+        # Events are applied without reading whole table again
+        table_cache.apply_event("VLAN", "Vlan1000", "DEL")
+        assert dhcp_db_connector.get_config_db_table("VLAN") == {}
+        table_cache.apply_event("VLAN", "Vlan2000", "SET")
+        assert dhcp_db_connector.get_config_db_table("VLAN") == {"Vlan2000": {"list": ["1", "2"], "value": "3,4"}}
+        # Entry has been deleted after SET event
+        with patch.object(swsscommon.Table, "get", return_value=(False, ())):
+            table_cache.apply_event("VLAN", "Vlan2000", "SET")
+        assert dhcp_db_connector.get_config_db_table("VLAN") == {}
+        assert mock_get_keys.call_count == 3
+
+        # Snapshot is dropped once table isn't subscribed any more
+        table_cache.unsubscribe("VLAN", checker)
+        dhcp_db_connector.get_config_db_table("VLAN")
+        assert mock_get_keys.call_count == 4
+        assert table_cache.stats == {"events": 4, "table_reads": 4, "cache_hits": 4}
+
+    with patch.object(swsscommon.Table, "set") as mock_set:
+        table_cache.publish_stats()
+        mock_set.assert_called_once()
+        key, fvs = mock_set.call_args[0]
+        assert key == "dhcpservd"
+        assert list(fvs) == [("events", "4"), ("table_reads", "4"), ("cache_hits", "4")]
+        mock_swsscommon_table_init.assert_called_with(dhcp_db_connector.state_db, "DHCP_DB_CACHE_STATS")
+
+
 def test_get_entry(mock_swsscommon_dbconnector_init, mock_swsscommon_table_init):
     tested_entry = {"key": "value"}
     dhcp_db_connector = utils.DhcpDbConnector()
@@ -121,6 +171,35 @@ def test_merge_intervals(test_type):
     assert utils.merge_intervals(intervals) == expected_res
 
 
+def test_interval_index():
+    ip = ipaddress.ip_address
+    index = utils.IntervalIndex([(ip("192.168.0.2"), ip("192.168.0.5"), "etp1"),
+                                 (ip("192.168.0.10"), ip("192.168.0.10"), "etp2"),
+                                 (ip("192.168.0.4"), ip("192.168.0.6"), "etp2")])
+    assert len(index) == 3
+    assert [interval[2] for interval in index.find_overlaps(ip("192.168.0.6"), ip("192.168.0.10"))] == \
+        ["etp2", "etp2"]
+    assert index.find_overlaps(ip("192.168.0.7"), ip("192.168.0.9")) == []
+    assert index.find_conflicts() == [("etp1", "etp2", ip("192.168.0.4"), ip("192.168.0.5"))]
+    index.add(ip("192.168.0.10"), ip("192.168.0.10"), "etp3")
+    assert index.find_conflicts() == [("etp1", "etp2", ip("192.168.0.4"), ip("192.168.0.5")),
+                                      ("etp3", "etp2", ip("192.168.0.10"), ip("192.168.0.10"))]
+
+
+def test_interval_index_find_containing():
+    networks = [ipaddress.ip_network("192.168.0.0/21"), ipaddress.ip_network("192.168.2.0/24"),
+                ipaddress.ip_network("10.0.0.0/24")]
+    index = utils.IntervalIndex([(network.network_address, network.broadcast_address, str(network))
+                                 for network in networks])
+    ip = ipaddress.ip_address
+    assert index.find_containing(ip("192.168.0.2"), ip("192.168.0.5")) == "192.168.0.0/21"
+    # Longest prefix network
+    assert index.find_containing(ip("192.168.2.2"), ip("192.168.2.5")) == "192.168.2.0/24"
+    assert index.find_containing(ip("192.168.1.2"), ip("192.168.2.5")) == "192.168.0.0/21"
+    assert index.find_containing(ip("10.0.0.2"), ip("10.0.1.5")) is None
+    assert index.find_containing(ip("172.16.0.2"), ip("172.16.0.2")) is None
+
+
 def mock_hget(_, field):
     if field == "list":
         return False, ""
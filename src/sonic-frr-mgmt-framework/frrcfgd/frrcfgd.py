@@ -5,7 +5,7 @@ import subprocess
 import time
 import syslog
 import os
-from swsscommon.swsscommon import ConfigDBConnector
+from swsscommon.swsscommon import ConfigDBConnector, DBConnector, Table, FieldValuePairs
 import socket
 import threading
 import queue
@@ -145,30 +145,32 @@ class BgpdClientMgr(threading.Thread):
         sock.listen(1)
         return sock
     @staticmethod
-    def __get_reply(sock):
-        reply_msg = None
-        ret_code = None
-        msg_buf = io.StringIO()
-        while True:
+    def __get_replies(sock, count):
+        # replies of commands sent at once come in order, each one ends with 3 zero bytes and the return code
+        replies = []
+        msg_buf = b''
+        while len(replies) < count:
+            msg_end = msg_buf.find(b'\0\0\0')
+            if msg_end >= 0 and len(msg_buf) > msg_end + 3:
+                replies.append((msg_buf[msg_end + 3], msg_buf[:msg_end].decode()))
+                msg_buf = msg_buf[msg_end + 4:]
+                continue
             try:
                 rd_msg = sock.recv(16384)
-                msg_buf.write(rd_msg.decode())
             except socket.timeout:
                 syslog.syslog(syslog.LOG_ERR, 'socket reading timeout')
                 break
-            if len(rd_msg) < 4:
-                rd_msg = msg_buf.getvalue()
-                if len(rd_msg) < 4:
-                    continue
-            msg_tail = rd_msg[-4:]
-            if isinstance(msg_tail, str):
-                msg_tail = bytes(msg_tail, 'utf-8')
-            if msg_tail[0] == 0 and msg_tail[1] == 0 and msg_tail[2] == 0:
-                ret_code = msg_tail[3]
-                reply_msg = msg_buf.getvalue()[:-4]
+            if len(rd_msg) == 0:
+                syslog.syslog(syslog.LOG_ERR, 'socket closed by frr daemon')
                 break
-        msg_buf.close()
-        return (ret_code, reply_msg)
+            msg_buf += rd_msg
+        return replies
+    @staticmethod
+    def __get_reply(sock):
+        replies = BgpdClientMgr.__get_replies(sock, 1)
+        if len(replies) == 0:
+            return (None, None)
+        return replies[0]
     @staticmethod
     def __send_data(sock, data):
         if isinstance(data, str):
@@ -197,21 +199,54 @@ class BgpdClientMgr(threading.Thread):
             sock.settimeout(120)
             self.client_socks[daemon] = sock
         for daemon, sock in self.client_socks.items():
-            syslog.syslog(syslog.LOG_DEBUG, 'send initial enable command to %s' % daemon)
-            try:
-                self.__send_data(sock, 'enable\0')
-            except socket.error as msg:
-                syslog.syslog(syslog.LOG_ERR, 'failed to send initial enable command to %s' % daemon)
-                return False
-            ret_code, reply = self.__get_reply(sock)
-            if ret_code is None:
-                syslog.syslog(syslog.LOG_ERR, 'failed to get command response for enable command from %s' % daemon)
-                return False
-            if ret_code != 0:
-                syslog.syslog(syslog.LOG_ERR, 'enable command failed: ret_code=%d' % ret_code)
-                syslog.syslog(syslog.LOG_ERR, reply)
+            if not self.__enable_client(daemon, sock):
                 return False
         return True
+    def __enable_client(self, daemon, sock):
+        syslog.syslog(syslog.LOG_DEBUG, 'send initial enable command to %s' % daemon)
+        try:
+            self.__send_data(sock, 'enable\0')
+        except socket.error as msg:
+            syslog.syslog(syslog.LOG_ERR, 'failed to send initial enable command to %s' % daemon)
+            return False
+        ret_code, reply = self.__get_reply(sock)
+        if ret_code is None:
+            syslog.syslog(syslog.LOG_ERR, 'failed to get command response for enable command from %s' % daemon)
+            return False
+        if ret_code != 0:
+            syslog.syslog(syslog.LOG_ERR, 'enable command failed: ret_code=%d' % ret_code)
+            syslog.syslog(syslog.LOG_ERR, reply)
+            return False
+        return True
+    def __reconnect_client(self, daemon):
+        # replies not read from the socket would be taken for the replies of next commands,
+        # so the socket is replaced by a new connection after a missing reply
+        syslog.syslog(syslog.LOG_WARNING, 'reconnect to frr daemon %s' % daemon)
+        sock = self.client_socks.get(daemon, None)
+        if sock is not None:
+            sock.close()
+        self.client_socks[daemon] = None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect('/run/frr/%s.vty' % daemon)
+        except socket.error as msg:
+            syslog.syslog(syslog.LOG_ERR, 'failed to connect to frr daemon %s: %s' % (daemon, msg))
+            sock.close()
+            return None
+        sock.settimeout(120)
+        if not self.__enable_client(daemon, sock):
+            sock.close()
+            return None
+        self.client_socks[daemon] = sock
+        return sock
+    def __get_client_sock(self, daemon):
+        if daemon not in self.client_socks:
+            return None
+        sock = self.client_socks[daemon]
+        if sock is None:
+            # connection was lost by a previous command
+            sock = self.__reconnect_client(daemon)
+        return sock
     def __init__(self):
         super(BgpdClientMgr, self).__init__(name = 'VTYSH sub-process manager')
         if not self.__create_frr_client():
@@ -219,6 +254,13 @@ class BgpdClientMgr(threading.Thread):
             raise RuntimeError('connect to FRR daemon failed')
         self.proxy_running = True
         self.lock = threading.Lock()
+        self.stats = {
+            'transactions': 0,
+            'commands': 0,
+            'failures': 0,
+            'last_transaction_ms': 0,
+            'max_transaction_ms': 0,
+        }
         self.proxy_sock = self.__create_proxy_socket()
         self.cmd_to_daemon = []
         for pat, daemons in self.VTYSH_CMD_DAEMON:
@@ -250,7 +292,7 @@ class BgpdClientMgr(threading.Thread):
         resp = ''
         ret_val = False
         for daemon in daemons:
-            sock = self.client_socks.get(daemon, None)
+            sock = self.__get_client_sock(daemon)
             if sock is None:
                 syslog.syslog(syslog.LOG_ERR, 'daemon %s is not connected' % daemon)
                 continue
@@ -258,11 +300,13 @@ class BgpdClientMgr(threading.Thread):
                 self.__send_data(sock, command + '\0')
             except socket.error as msg:
                 syslog.syslog(syslog.LOG_ERR, 'failed to send command to frr daemon: %s' % msg)
+                self.__reconnect_client(daemon)
                 return (False, None)
             ret_code, reply = self.__get_reply(sock)
             if ret_code is None or ret_code != 0:
                 if ret_code is None:
                     syslog.syslog(syslog.LOG_ERR, 'failed to get reply from frr daemon')
+                    self.__reconnect_client(daemon)
                     continue
                 else:
                     syslog.syslog(syslog.LOG_DEBUG, '[%s] command return code: %d' % (daemon, ret_code))
@@ -272,6 +316,34 @@ class BgpdClientMgr(threading.Thread):
                 ret_val = True
             resp += reply
         return (ret_val, resp)
+    def __proc_commands(self, cmd_list, daemons):
+        # commands are sent to each daemon at once and their replies read afterwards, instead of
+        # a round trip per command. Each command succeeds if it is run successfully by at least one daemon
+        syslog.syslog(syslog.LOG_DEBUG, 'VTYSH CMDS: %s daemons: %s' % (cmd_list, daemons))
+        succ_list = [False] * len(cmd_list)
+        for daemon in daemons:
+            sock = self.__get_client_sock(daemon)
+            if sock is None:
+                syslog.syslog(syslog.LOG_ERR, 'daemon %s is not connected' % daemon)
+                continue
+            try:
+                self.__send_data(sock, ''.join(cmd + '\0' for cmd in cmd_list))
+            except socket.error as msg:
+                syslog.syslog(syslog.LOG_ERR, 'failed to send command to frr daemon: %s' % msg)
+                self.__reconnect_client(daemon)
+                return False
+            replies = self.__get_replies(sock, len(cmd_list))
+            if len(replies) < len(cmd_list):
+                syslog.syslog(syslog.LOG_ERR, 'failed to get reply from frr daemon %s for command %s' %
+                              (daemon, cmd_list[len(replies)]))
+                self.__reconnect_client(daemon)
+            for idx, (ret_code, reply) in enumerate(replies):
+                if ret_code == 0:
+                    succ_list[idx] = True
+                else:
+                    syslog.syslog(syslog.LOG_DEBUG, '[%s] command %s return code: %d' % (daemon, cmd_list[idx], ret_code))
+                    syslog.syslog(syslog.LOG_DEBUG, reply)
+        return all(succ_list)
     def run_vtysh_command(self, table, command, daemons):
         if not command.startswith(self.VTYSH_MARK):
             syslog.syslog(syslog.LOG_ERR, 'command %s is not for vtysh config' % command)
@@ -286,12 +358,16 @@ class BgpdClientMgr(threading.Thread):
         if daemons is None or len(daemons) == 0:
             syslog.syslog(syslog.LOG_ERR, 'no common daemon list found for given commands')
             return False
-        ret_val = True
         with self.lock:
-            for cmd in cmd_list:
-                succ, _ = self.__proc_command(cmd.strip(), daemons)
-                if not succ:
-                    ret_val = False
+            start = time.time()
+            ret_val = self.__proc_commands([cmd.strip() for cmd in cmd_list], daemons)
+            trans_ms = int((time.time() - start) * 1000)
+            self.stats['transactions'] += 1
+            self.stats['commands'] += len(cmd_list)
+            if not ret_val:
+                self.stats['failures'] += 1
+            self.stats['last_transaction_ms'] = trans_ms
+            self.stats['max_transaction_ms'] = max(self.stats['max_transaction_ms'], trans_ms)
         return ret_val
     @staticmethod
     def __read_all(sock, data_len):
@@ -315,7 +391,8 @@ class BgpdClientMgr(threading.Thread):
                 sock.close()
             self.join()
         for _, sock in self.client_socks.items():
-            sock.close()
+            if sock is not None:
+                sock.close()
     def run(self):
         syslog.syslog(syslog.LOG_DEBUG, 'entering VTYSH proxy thread')
         while self.proxy_running:
@@ -558,6 +635,16 @@ class BGPKeyMapList(list):
                     except ValueError:
                         pass
             super(BGPKeyMapList, self).append((db_field, BGPKeyMapInfo(cmd_str, hdl_func, hdl_data)))
+        # parsed DB field tokens of each key map, and DB field name ==> indexes of key maps using it.
+        # An update only runs the key maps of its changed fields
+        self.field_tokens = []
+        self.field_index = {}
+        for map_idx, (db_field, _) in enumerate(self):
+            field_tokens = self.parse_db_field(db_field)
+            self.field_tokens.append(field_tokens)
+            for fld_list, _ in field_tokens[0]:
+                for fld_name in fld_list:
+                    self.field_index.setdefault(fld_name, []).append(map_idx)
     def __eq__(self, other):
         return super(BGPKeyMapList, self).__eq__(other) and self.table_name == other.table_name and self.table_key == other.table_key
     def __ne__(self, other):
@@ -574,6 +661,29 @@ class BGPKeyMapList(list):
                 return tokens
         return (None, None)
     @staticmethod
+    def parse_db_field(db_field):
+        merge_vals = False
+        if type(db_field) is not list and type(db_field) is not tuple:
+            db_field = [db_field]
+        elif type(db_field) is tuple:
+            merge_vals = True
+        token_list = []
+        req_idx_list = []
+        opt_idx_list = set()
+        for idx, dkey in enumerate(db_field):
+            optional = False
+            if len(dkey) > 0 and dkey[0] == '+':
+                if len(dkey) > 1 and dkey[1] == '+':
+                    opt_idx_list.add(idx)
+                    dkey = dkey[2:]
+                else:
+                    dkey = dkey[1:]
+                optional = True
+            else:
+                req_idx_list.append(idx)
+            token_list.append((dkey.split('&'), optional))
+        return (token_list, req_idx_list, opt_idx_list, merge_vals)
+    @staticmethod
     def get_cmd_data(key_list, req_idx_list, opt_idx_list, data, chg_list, no_chg_list, merge_data, is_del):
         for idx in req_idx_list:
             if idx not in chg_list and idx not in no_chg_list:
@@ -644,32 +754,21 @@ class BGPKeyMapList(list):
         start_idx = len(upper_vals)
         ret_val = False
         run_cmd_cnt = 0
-        for db_field, key_map in self:
-            merge_vals = False
-            if type(db_field) is not list and type(db_field) is not tuple:
-                db_field = [db_field]
-            elif type(db_field) is tuple:
-                db_field = list(db_field)
-                merge_vals = True
+        # key maps without changed fields have no command to run
+        map_idx_set = set()
+        for dkey, dval in data.items():
+            if isinstance(dval, CachedDataWithOp) and dval.op != CachedDataWithOp.OP_NONE:
+                map_idx_set.update(self.field_index.get(dkey, []))
+        for map_idx in sorted(map_idx_set):
+            key_map = self[map_idx][1]
+            token_list, req_idx_list, opt_idx_list, merge_vals = self.field_tokens[map_idx]
 
             idx = 0
-            req_idx_list = []
             key_list_list = []
-            opt_idx_list = set()
             run_cmd = True
-            for dkey in db_field:
-                optional = False
-                if len(dkey) > 0 and dkey[0] == '+':
-                    if len(dkey) > 1 and dkey[1] == '+':
-                        opt_idx_list.add(idx)
-                        dkey = dkey[2:]
-                    else:
-                        dkey = dkey[1:]
-                    optional = True
-                else:
-                    req_idx_list.append(idx)
+            for fld_list, optional in token_list:
                 key_list = []
-                for k in dkey.split('&'):
+                for k in fld_list:
                     if k in data and isinstance(data[k], CachedDataWithOp):
                         key_list.append(k)
                 if not optional and len(key_list) == 0:
@@ -1442,10 +1541,24 @@ def hdl_static_route(daemon, cmd_str, op, st_idx, args, data):
     return cmd_list
 
 class ExtConfigDBConnector(ConfigDBConnector):
+    LISTEN_TIMEOUT = 1.0        # seconds to wait for the first keyspace event of a batch
+    BATCH_MAX_EVENTS = 1000     # stop draining keyspace events once a batch holds that many
+    STATS_TABLE = 'FRRCFGD_STATS'
     def __init__(self, ns_attrs = None):
         super(ExtConfigDBConnector, self).__init__()
         self.nosort_attrs = ns_attrs if ns_attrs is not None else {}
         self.__listen_thread_running = False
+        self.stats = {
+            'batches': 0,
+            'events_received': 0,
+            'events_handled': 0,
+            'last_batch_size': 0,
+            'max_batch_size': 0,
+            'last_batch_ms': 0,
+            'max_batch_ms': 0,
+            'events_per_sec': 0,
+        }
+        self.stats_table = None
     def raw_to_typed(self, raw_data, table = ''):
         if len(raw_data) == 0:
             raw_data = None
@@ -1457,19 +1570,64 @@ class ExtConfigDBConnector(ConfigDBConnector):
                 val.sort()
         return data
     def sub_msg_handler(self, msg_item):
-        if msg_item['type'] == 'pmessage':
+        self.sub_msg_batch_handler([msg_item])
+
+    def sub_msg_batch_handler(self, msg_list):
+        """Handle a batch of keyspace events. Entries are read once however many events they got in the batch,
+        in the order of their first events, so that parents created in the batch are still handled before children.
+        """
+        start = time.time()
+        # redis key ==> (table, row)
+        upd_keys = {}
+        for msg_item in msg_list:
+            if msg_item['type'] != 'pmessage':
+                continue
             key = msg_item['channel'].split(':', 1)[1]
             try:
                 (table, row) = key.split(self.TABLE_NAME_SEPARATOR, 1)
-                if table in self.handlers:
-                    client = self.get_redis_client(self.db_name)
-                    data = self.raw_to_typed(client.hgetall(key), table)
-                    super(ExtConfigDBConnector, self)._ConfigDBConnector__fire(table, row, data)
             except ValueError:
-                pass    #Ignore non table-formated redis entries
+                continue    #Ignore non table-formated redis entries
+            if table in self.handlers:
+                upd_keys[key] = (table, row)
+        if len(upd_keys) == 0:
+            return
+        try:
+            raw_data_list = self.__get_raw_data_list(list(upd_keys))
+        except Exception as e:
+            syslog.syslog(syslog.LOG_ERR, '[bgp cfgd] Failed reading config DB update with exception:' + str(e))
+            logging.exception(e)
+            return
+        for (table, row), raw_data in zip(upd_keys.values(), raw_data_list):
+            try:
+                data = self.raw_to_typed(raw_data, table)
+                super(ExtConfigDBConnector, self)._ConfigDBConnector__fire(table, row, data)
             except Exception as e:
                 syslog.syslog(syslog.LOG_ERR, '[bgp cfgd] Failed handling config DB update with exception:' + str(e))
                 logging.exception(e)
+        self.__update_stats(len(msg_list), len(upd_keys), start)
+
+    def __get_raw_data_list(self, key_list):
+        client = self.get_redis_client(self.db_name)
+        return [client.hgetall(key) for key in key_list]
+
+    def __update_stats(self, received, handled, start):
+        batch_ms = int((time.time() - start) * 1000)
+        self.stats['batches'] += 1
+        self.stats['events_received'] += received
+        self.stats['events_handled'] += handled
+        self.stats['last_batch_size'] = handled
+        self.stats['max_batch_size'] = max(self.stats['max_batch_size'], handled)
+        self.stats['last_batch_ms'] = batch_ms
+        self.stats['max_batch_ms'] = max(self.stats['max_batch_ms'], batch_ms)
+        self.stats['events_per_sec'] = int(handled * 1000 / max(batch_ms, 1))
+        try:
+            if self.stats_table is None:
+                self.stats_table = Table(DBConnector('STATE_DB', 0), self.STATS_TABLE)
+            self.stats_table.set('listener', FieldValuePairs([(name, str(val)) for name, val in sorted(self.stats.items())]))
+            if bgpd_client is not None:
+                self.stats_table.set('vtysh', FieldValuePairs([(name, str(val)) for name, val in sorted(bgpd_client.stats.items())]))
+        except Exception as e:
+            syslog.syslog(syslog.LOG_DEBUG, 'failed to publish statistics: %s' % str(e))
 
     def listen_thread(self, timeout):
         self.__listen_thread_running = True
@@ -1477,8 +1635,16 @@ class ExtConfigDBConnector(ConfigDBConnector):
         self.pubsub.psubscribe(sub_key_space)
         while self.__listen_thread_running:
             msg = self.pubsub.get_message(timeout, True)
-            if msg:
-                self.sub_msg_handler(msg)
+            if not msg:
+                continue
+            # drain events already received without waiting, they are handled as one batch
+            msg_list = [msg]
+            while len(msg_list) < self.BATCH_MAX_EVENTS:
+                msg = self.pubsub.get_message(0, True)
+                if not msg:
+                    break
+                msg_list.append(msg)
+            self.sub_msg_batch_handler(msg_list)
 
         self.pubsub.punsubscribe(sub_key_space)
 
@@ -1486,7 +1652,7 @@ class ExtConfigDBConnector(ConfigDBConnector):
         """Start listen Redis keyspace events and will trigger corresponding handlers when content of a table changes.
         """
         self.pubsub = self.get_redis_client(self.db_name).pubsub()
-        self.sub_thread = threading.Thread(target=self.listen_thread, args=(0.01,))
+        self.sub_thread = threading.Thread(target=self.listen_thread, args=(self.LISTEN_TIMEOUT,))
         self.sub_thread.start()
 
     def stop_listen(self):
@@ -2254,6 +2420,10 @@ class BGPConfigDaemon:
             ('IGMP_INTERFACE_QUERY', self.bgp_table_handler_common)
         ]
         self.bgp_message = queue.Queue(0)
+        # (table, table key) ==> key map list compiled once and used by every update of table
+        self.key_map_cache = {}
+        for table in self.tbl_to_key_map:
+            self.__get_key_map(table, None)
         self.table_data_cache = self.config_db.get_table_data([tbl for tbl, _ in self.table_handler_list])
         syslog.syslog(syslog.LOG_DEBUG, 'Init Cached DB data')
         for key, entry in self.table_data_cache.items():
@@ -2555,6 +2725,14 @@ class BGPConfigDaemon:
 
         return cmd_suffix, None
 
+    def __get_key_map(self, table, tbl_key):
+        cache_key = (table, None if tbl_key is None else tuple(sorted(tbl_key.items())))
+        key_map = self.key_map_cache.get(cache_key, None)
+        if key_map is None:
+            key_map = BGPKeyMapList(self.tbl_to_key_map[table], table, tbl_key)
+            self.key_map_cache[cache_key] = key_map
+        return key_map
+
     def __update_bgp(self, data_list):
         while not self.bgp_message.empty():
             key, del_table, table, data = self.bgp_message.get()
@@ -2597,7 +2775,7 @@ class BGPConfigDaemon:
                     if new_key is not None:
                         key = new_key
                         tbl_key = {'ip_prefix': ('ipv4' if af_id == socket.AF_INET else 'ipv6')}
-                key_map = BGPKeyMapList(self.tbl_to_key_map[table], table, tbl_key)
+                key_map = self.__get_key_map(table, tbl_key)
             else:
                 key_map = None
             if table == 'BGP_GLOBALS':
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Measure BGP_NEIGHBOR_AF updates through the BGPKeyMapList command maps.
+
+Synthetic neighbor AF entries are run through BGPKeyMapList.run_command, with
+FRR commands counted instead of executed. Each scenario is measured with a key
+map list compiled once and used by every update, and with a key map list built
+for each update.
+
+Scenarios:
+    load    every field of the entry is added
+    update  one field of the entry changes, the others are unchanged
+
+Usage:
+    python3 tests/keymap_benchmark.py [--neighbors 10000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest.mock import MagicMock, NonCallableMagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+with patch.dict('sys.modules', **{'swsscommon.swsscommon': MagicMock(ConfigDBConnector = NonCallableMagicMock)}):
+    from frrcfgd import frrcfgd
+
+TABLE = 'BGP_NEIGHBOR_AF'
+TABLE_KEY = {'admin_status': 'ipv4'}
+
+NEIGHBOR_AF_FIELDS = {
+    'admin_status': 'true',
+    'route_map_in': 'rm_in',
+    'route_map_out': 'rm_out',
+    'prefix_list_in': 'pfx_in',
+    'prefix_list_out': 'pfx_out',
+    'filter_list_in': 'fl_in',
+    'filter_list_out': 'fl_out',
+    'unsuppress_map_name': 'unsuppress',
+    'weight': '100',
+    'soft_reconfiguration_in': 'true',
+    'rrclient': 'true',
+    'nhself': 'true',
+    'as_override': 'true',
+}
+
+
+def generate_data(neighbors, changed_field):
+    data_list = []
+    for idx in range(neighbors):
+        nbr = '10.{}.{}.{}'.format(idx >> 16, (idx >> 8) & 0xff, idx & 0xff)
+        data = {}
+        for key, val in NEIGHBOR_AF_FIELDS.items():
+            if changed_field is None:
+                data[key] = frrcfgd.CachedDataWithOp(val, frrcfgd.CachedDataWithOp.OP_ADD)
+            elif key == changed_field:
+                data[key] = frrcfgd.CachedDataWithOp(val + '_new', frrcfgd.CachedDataWithOp.OP_UPDATE)
+            else:
+                data[key] = frrcfgd.CachedDataWithOp(val, frrcfgd.CachedDataWithOp.OP_NONE)
+        data_list.append((nbr, data))
+    return data_list
+
+
+def run_updates(data_list, compiled):
+    key_map_list = frrcfgd.BGPConfigDaemon.tbl_to_key_map[TABLE]
+    key_map = frrcfgd.BGPKeyMapList(key_map_list, TABLE, TABLE_KEY) if compiled else None
+    daemon = MagicMock()
+    cmd_prefix = ['configure terminal', 'router bgp 65100 vrf default', 'address-family ipv4 unicast']
+    start = time.time()
+    for nbr, data in data_list:
+        if not compiled:
+            key_map = frrcfgd.BGPKeyMapList(key_map_list, TABLE, TABLE_KEY)
+        key_map.run_command(daemon, TABLE, data, cmd_prefix, nbr)
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--neighbors', type=int, default=10000, help='number of synthetic neighbors')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per scenario, the best one is reported')
+    args = parser.parse_args()
+
+    run_cnt = [0]
+    def run_command(*_):
+        run_cnt[0] += 1
+        return True
+
+    print('{} entries, {} key maps'.format(args.neighbors, len(frrcfgd.BGPConfigDaemon.tbl_to_key_map[TABLE])))
+    print('{:<8} {:<10} {:>10} {:>14} {:>10}'.format('scenario', 'key map', 'wall (s)', 'us per entry', 'commands'))
+    with patch.object(frrcfgd, 'g_run_command', run_command), patch.object(frrcfgd, 'syslog'):
+        for scenario, changed_field in (('load', None), ('update', 'route_map_in')):
+            for name, compiled in (('compiled', True), ('per-entry', False)):
+                runs = []
+                for _ in range(args.repeat):
+                    data_list = generate_data(args.neighbors, changed_field)
+                    run_cnt[0] = 0
+                    runs.append(run_updates(data_list, compiled))
+                wall = min(runs)
+                print('{:<8} {:<10} {:>10.3f} {:>14.1f} {:>10}'.format(scenario, name, wall,
+                                                                     wall * 1e6 / args.neighbors, run_cnt[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,7 @@ swsscommon_module_mock = MagicMock(ConfigDBConnector = NonCallableMagicMock)
 mockmapping = {'swsscommon.swsscommon': swsscommon_module_mock}
 
 with patch.dict('sys.modules', **mockmapping):
+    from frrcfgd import frrcfgd
     from frrcfgd.frrcfgd import CachedDataWithOp
     from frrcfgd.frrcfgd import BGPPeerGroup
     from frrcfgd.frrcfgd import BGPKeyMapInfo
@@ -18,6 +19,8 @@ with patch.dict('sys.modules', **mockmapping):
     from frrcfgd.frrcfgd import AggregateAddr
     from frrcfgd.frrcfgd import IpNextHop
     from frrcfgd.frrcfgd import IpNextHopSet
+    from frrcfgd.frrcfgd import ExtConfigDBConnector
+    from frrcfgd.frrcfgd import BgpdClientMgr
 
 def test_data_with_op():
     data = CachedDataWithOp()
@@ -83,6 +86,27 @@ def test_command_map_list():
     for idx, cmd_map in enumerate(cmd_map_list):
         assert(chk_map_list[idx] == cmd_map[1])
 
+def test_command_map_index():
+    map_list = [('abc', 'set attribute {}'),
+                (['name', '+desc&remark'], 'description {} {}'),
+                (('+abc', 'xyz'), 'merged {}'),
+                ('ip_cmd|ipv4', 'test on ipv4 {}'),
+                ('ip_cmd|ipv6', 'test on ipv6 {}')]
+    cmd_map_list = BGPKeyMapList(map_list, 'frrcfg', {'ip_cmd': 'ipv6'})
+    assert(cmd_map_list.field_index == {'abc': [0, 2], 'name': [1], 'desc': [1], 'remark': [1],
+                                        'xyz': [2], 'ip_cmd': [3]})
+    assert(cmd_map_list.field_tokens[1] == ([(['name'], False), (['desc', 'remark'], True)], [0], set(), False))
+    assert(cmd_map_list.field_tokens[2] == ([(['abc'], True), (['xyz'], False)], [1], set(), True))
+    data = {'abc': CachedDataWithOp('1', CachedDataWithOp.OP_NONE),
+            'name': CachedDataWithOp('nbr', CachedDataWithOp.OP_NONE),
+            'desc': CachedDataWithOp('uplink', CachedDataWithOp.OP_UPDATE),
+            'ip_cmd': CachedDataWithOp('10', CachedDataWithOp.OP_NONE)}
+    with patch.object(frrcfgd, 'g_run_command', return_value = True) as run_cmd:
+        assert(cmd_map_list.run_command(None, 'frrcfg', data, []))
+    # only the key map of changed field runs
+    run_cmd.assert_called_once_with('frrcfg', "vtysh -c 'description nbr uplink'", True, None, False)
+    assert(data['desc'].status == CachedDataWithOp.STAT_SUCC)
+
 def test_community_list():
     for ext in [False, True]:
         comm_list = CommunityList('comm', ext)
@@ -234,3 +258,78 @@ def test_nexthop_set():
             test_set.add(IpNextHop(af, bkh_list[idx], ip_list[idx] if af == socket.AF_INET else ip6_list[idx],
                                    None, intf_list[idx], tag_list[idx], None, vrf_list[idx]))
         assert(nh_set == test_set)
+
+def test_sub_msg_batch():
+    config_db = ExtConfigDBConnector()
+    config_db.TABLE_NAME_SEPARATOR = '|'
+    config_db.handlers = {'BGP_NEIGHBOR': None, 'PREFIX_SET': None}
+    config_db.raw_to_typed = lambda raw_data, table: raw_data if len(raw_data) > 0 else None
+    client = config_db.get_redis_client.return_value
+    client.hgetall.side_effect = [{'asn': '200'}, {}, {'mode': 'IPv4'}]
+    msg_list = [{'type': 'psubscribe', 'channel': '__keyspace@4__:*'}]
+    for key in ['BGP_NEIGHBOR|default|10.0.0.1', 'BGP_NEIGHBOR|default|10.0.0.2', 'PREFIX_SET|pfx1',
+                'BGP_NEIGHBOR|default|10.0.0.1', 'DEVICE_METADATA|localhost', 'BGP_NEIGHBOR_NO_ROW']:
+        msg_list.append({'type': 'pmessage', 'channel': '__keyspace@4__:' + key})
+    with patch.object(ExtConfigDBConnector.__bases__[0], '_ConfigDBConnector__fire', create = True) as fire:
+        config_db.sub_msg_batch_handler(msg_list)
+    # each entry is read once, in the order of its first event
+    assert([c[0][0] for c in client.hgetall.call_args_list] ==
+           ['BGP_NEIGHBOR|default|10.0.0.1', 'BGP_NEIGHBOR|default|10.0.0.2', 'PREFIX_SET|pfx1'])
+    assert([c[0] for c in fire.call_args_list] ==
+           [('BGP_NEIGHBOR', 'default|10.0.0.1', {'asn': '200'}),
+            ('BGP_NEIGHBOR', 'default|10.0.0.2', None),
+            ('PREFIX_SET', 'pfx1', {'mode': 'IPv4'})])
+    assert(config_db.stats['batches'] == 1)
+    assert(config_db.stats['events_received'] == 7)
+    assert(config_db.stats['events_handled'] == 3)
+
+def test_vtysh_command_pipelined():
+    client_mgr = BgpdClientMgr.__new__(BgpdClientMgr)
+    client_mgr.lock = MagicMock()
+    client_mgr.stats = {'transactions': 0, 'commands': 0, 'failures': 0,
+                        'last_transaction_ms': 0, 'max_transaction_ms': 0}
+    frr_sock, daemon_sock = socket.socketpair()
+    client_mgr.client_socks = {'bgpd': frr_sock}
+    try:
+        # replies of all commands are ready before the first one is read
+        daemon_sock.sendall(b'\0\0\0\0' + b'\0\0\0\0' + b'\0\0\0\0')
+        assert(client_mgr.run_vtysh_command('BGP_GLOBALS', "vtysh -c 'configure terminal' -c 'router bgp 100'", None))
+        assert(daemon_sock.recv(1024) == b'configure terminal\0router bgp 100\0end\0')
+        daemon_sock.sendall(b'\0\0\0\0' + b'% Unknown command\0\0\0\x02' + b'\0\0\0\0')
+        assert(not client_mgr.run_vtysh_command('BGP_GLOBALS', "vtysh -c 'configure terminal' -c 'bad command'", None))
+        assert(daemon_sock.recv(1024) == b'configure terminal\0bad command\0end\0')
+    finally:
+        frr_sock.close()
+        daemon_sock.close()
+    assert(client_mgr.stats['transactions'] == 2)
+    assert(client_mgr.stats['commands'] == 6)
+    assert(client_mgr.stats['failures'] == 1)
+
+def test_vtysh_command_missing_reply():
+    client_mgr = BgpdClientMgr.__new__(BgpdClientMgr)
+    client_mgr.lock = MagicMock()
+    client_mgr.stats = {'transactions': 0, 'commands': 0, 'failures': 0,
+                        'last_transaction_ms': 0, 'max_transaction_ms': 0}
+    frr_sock, daemon_sock = socket.socketpair()
+    frr_sock.settimeout(0.1)
+    new_frr_sock, new_daemon_sock = socket.socketpair()
+    # connection to the daemon is made by the socket pair
+    new_sock = MagicMock(wraps = new_frr_sock)
+    new_sock.connect = MagicMock()
+    client_mgr.client_socks = {'bgpd': frr_sock}
+    try:
+        # reply of the last command doesn't come in time, the connection is replaced so
+        # that the late reply isn't taken for the reply of a next command
+        daemon_sock.sendall(b'\0\0\0\0' + b'\0\0\0\0')
+        with patch('socket.socket', return_value = new_sock):
+            new_daemon_sock.sendall(b'\0\0\0\0')
+            assert(not client_mgr.run_vtysh_command('BGP_GLOBALS', "vtysh -c 'configure terminal' -c 'router bgp 100'", None))
+        new_sock.connect.assert_called_once_with('/run/frr/bgpd.vty')
+        assert(client_mgr.client_socks['bgpd'] is new_sock)
+        assert(new_daemon_sock.recv(1024) == b'enable\0')
+        new_daemon_sock.sendall(b'\0\0\0\0' + b'\0\0\0\0')
+        assert(client_mgr.run_vtysh_command('BGP_GLOBALS', "vtysh -c 'configure terminal'", None))
+        assert(new_daemon_sock.recv(1024) == b'configure terminal\0end\0')
+    finally:
+        for sock in (frr_sock, daemon_sock, new_frr_sock, new_daemon_sock):
+            sock.close()
@@ -1,6 +1,7 @@
 import yang as ly
 import syslog
 
+from collections import OrderedDict
 from json import dump
 from glob import glob
 from sonic_yang_ext import SonicYangExtMixin, SonicYangException
@@ -12,10 +13,19 @@ i.e. it is mixin not parent class.
 """
 class SonicYang(SonicYangExtMixin):
 
-    def __init__(self, yang_dir, debug=False, print_log_enabled=True, sonic_yang_options=0):
+    def __init__(self, yang_dir, debug=False, print_log_enabled=True, sonic_yang_options=0,
+                 schema_cache_dir=None, dependency_index=False):
         self.yang_dir = yang_dir
+        # yang model files to load in libyang on first use of self.ctx
+        self.pendingYangFiles = list()
         self.ctx = None
         self.module = None
+        # reverse leafref index used by find_data_dependencies(), if enabled:
+        # leafref schema xpath -> value -> data xpaths of the leafref nodes
+        self.dependencyIndexEnabled = dependency_index
+        self.dependencyIndex = dict()
+        # data xpath -> (leafref schema xpath, value) of the indexed nodes
+        self.dependencyIndexPaths = dict()
         self.root = None
 
         # logging vars
@@ -47,6 +57,12 @@ class SonicYang(SonicYangExtMixin):
         # element path for CONFIG DB. An example for this list could be:
         # ['PORT', 'Ethernet0', 'speed']
         self.elementPath = []
+        # time in ms spent by the last loadData or loadDataDelta
+        self.loadDataTimings = {'xlate': dict(), 'parse': 0, 'validate': 0}
+        # leaf dicts of yang containers and lists: id(model) -> (model, leafDict)
+        self.leafDictCache = dict()
+        # directory of the schema cache, e.g. SCHEMA_CACHE_DIR, None to disable the cache
+        self.schemaCacheDir = schema_cache_dir
         try:
             self.ctx = ly.Context(yang_dir, sonic_yang_options)
         except Exception as e:
@@ -57,6 +73,41 @@ class SonicYang(SonicYangExtMixin):
     def __del__(self):
         pass
 
+    """
+    libyang context. Yang models of a schema loaded from the cache are loaded
+    in libyang on first use of the context.
+    """
+    @property
+    def ctx(self):
+        if self.pendingYangFiles:
+            yangFiles = self.pendingYangFiles
+            self.pendingYangFiles = list()
+            try:
+                for file in yangFiles:
+                    if self._load_schema_module(file) is None:
+                        raise(Exception("Could not load module {}".format(file)))
+            except Exception as e:
+                self.sysLog(msg="Yang Models Load failed:{}".format(str(e)), \
+                    debug=syslog.LOG_ERR, doPrint=True)
+                raise SonicYangException("Yang Models Load failed\n{}".format(str(e)))
+        return self._ctx
+
+    @ctx.setter
+    def ctx(self, ctx):
+        self._ctx = ctx
+
+    """
+    data tree. A new data tree resets the dependency index.
+    """
+    @property
+    def root(self):
+        return self._root
+
+    @root.setter
+    def root(self, root):
+        self._root = root
+        self._reset_dependency_index()
+
     def sysLog(self, debug=syslog.LOG_INFO, msg=None, doPrint=False):
         # log debug only if enabled
         if self.DEBUG == False and debug == syslog.LOG_DEBUG:
@@ -388,7 +439,8 @@ class SonicYang(SonicYangExtMixin):
     """
     def _add_data_node(self, data_xpath, value):
         try:
-            self._new_data_node(data_xpath, value)
+            data_node = self._new_data_node(data_xpath, value)
+            self._index_data_nodes(data_node)
             #check if the node added to the data tree
             self._find_data_node(data_xpath)
         except Exception as e:
@@ -413,6 +465,7 @@ class SonicYang(SonicYangExtMixin):
 
             #merge
             self.root.merge(source_node, 0)
+            self._reset_dependency_index()
         except Exception as e:
             self.fail(e)
 
@@ -426,6 +479,7 @@ class SonicYang(SonicYangExtMixin):
             node = self._find_data_node(xpath)
 
         if (node):
+            self._unindex_data_nodes(node)
             node.unlink()
             dnode = self._find_data_node(xpath)
             if (dnode is None):
@@ -466,7 +520,8 @@ class SonicYang(SonicYangExtMixin):
     """
     def _set_data_node_value(self, data_xpath, value):
         try:
-            self.root.new_path(self.ctx, data_xpath, str(value), ly.LYD_ANYDATA_STRING, ly.LYD_PATH_OPT_UPDATE)
+            data_node = self.root.new_path(self.ctx, data_xpath, str(value), ly.LYD_ANYDATA_STRING, ly.LYD_PATH_OPT_UPDATE)
+            self._index_data_nodes(data_node)
         except Exception as e:
             self.sysLog(msg="set data node value failed for xpath: " + str(data_xpath), debug=syslog.LOG_ERR, doPrint=True)
             self.fail(e)
@@ -520,6 +575,9 @@ class SonicYang(SonicYangExtMixin):
     input:    data_xpath - xpath of data node. (Public)
     returns:  - list of xpath
               - Exception if error
+    If the dependency index is enabled, the data nodes of each leafref are
+    indexed by value on first lookup, and the index is kept updated when nodes
+    are added, set or deleted.
     """
     def find_data_dependencies(self, data_xpath):
         ref_list = []
@@ -537,6 +595,9 @@ class SonicYang(SonicYangExtMixin):
             backlinks = schema_node.backlinks()
             if backlinks is not None and backlinks.number() > 0:
                 for link in backlinks.schema():
+                     if self.dependencyIndexEnabled:
+                         ref_list.extend(self._find_indexed_dependencies(link.path(), value))
+                         continue
                      node_set = node.find_path(link.path())
                      for data_set in node_set.data():
                           data_set.schema()
@@ -550,6 +611,83 @@ class SonicYang(SonicYangExtMixin):
 
         return ref_list
 
+    """
+    reset_dependency_index(): drop the dependency index, it is rebuilt on the
+    next find_data_dependencies()
+    """
+    def _reset_dependency_index(self):
+        self.dependencyIndex = dict()
+        self.dependencyIndexPaths = dict()
+
+    """
+    build_dependency_index(): index the data nodes of a leafref schema node by value
+    input:    link_xpath - schema xpath of the leafref node
+    returns:  dict of value -> data xpaths of the leafref nodes
+    """
+    def _build_dependency_index(self, link_xpath):
+        index = dict()
+        node_set = self.root.find_path(link_xpath)
+        for data_set in node_set.data():
+            path = data_set.path()
+            value = data_set.subtype().value_str()
+            index.setdefault(value, OrderedDict())[path] = None
+            self.dependencyIndexPaths[path] = (link_xpath, value)
+        self.dependencyIndex[link_xpath] = index
+        return index
+
+    """
+    find_indexed_dependencies(): find the data nodes of a leafref schema node
+    referencing a value, using the dependency index
+    input:    link_xpath - schema xpath of the leafref node
+              value - referenced value
+    returns:  list of xpath
+    """
+    def _find_indexed_dependencies(self, link_xpath, value):
+        index = self.dependencyIndex.get(link_xpath)
+        if index is None:
+            index = self._build_dependency_index(link_xpath)
+        return list(index.get(value, ()))
+
+    """
+    index_data_nodes(): add a data node and its subtree to the dependency index
+    input:    data_node - Data_Node object, may be None
+    """
+    def _index_data_nodes(self, data_node):
+        if data_node is None or not self.dependencyIndex:
+            return
+        for node in data_node.tree_dfs():
+            link_xpath = node.schema().path()
+            index = self.dependencyIndex.get(link_xpath)
+            if index is None:
+                continue
+            path = node.path()
+            self._unindex_path(path)
+            value = node.subtype().value_str()
+            index.setdefault(value, OrderedDict())[path] = None
+            self.dependencyIndexPaths[path] = (link_xpath, value)
+
+    """
+    unindex_data_nodes(): remove a data node and its subtree from the dependency index
+    input:    data_node - Data_Node object
+    """
+    def _unindex_data_nodes(self, data_node):
+        if not self.dependencyIndexPaths:
+            return
+        for node in data_node.tree_dfs():
+            if node.schema().path() in self.dependencyIndex:
+                self._unindex_path(node.path())
+
+    def _unindex_path(self, path):
+        entry = self.dependencyIndexPaths.pop(path, None)
+        if entry is None:
+            return
+        link_xpath, value = entry
+        paths = self.dependencyIndex[link_xpath].get(value)
+        if paths is not None:
+            paths.pop(path, None)
+            if not paths:
+                del self.dependencyIndex[link_xpath][value]
+
     """
     get_module_prefix:   get the prefix of a Yang module
     input:    name of the Yang module
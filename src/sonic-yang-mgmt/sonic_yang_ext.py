@@ -4,6 +4,11 @@
 from __future__ import print_function
 import yang as ly
 import syslog
+import hashlib
+import os
+import pickle
+import tempfile
+import time
 from json import dump, dumps, loads
 from xmltodict import parse
 from glob import glob
@@ -34,6 +39,31 @@ LEAF_LIST_WITH_STRING_VALUE_DICT = {
     ('PORT', 'adv_interface_types'): ',',
 }
 
+# Directory of the schema cache for system wide users, see SonicYangExtMixin.loadYangModel.
+# The cache is disabled unless a directory is passed to SonicYang.
+# The cache is unpickled, the directory must be writable only by root.
+SCHEMA_CACHE_DIR = '/var/cache/sonic-yang'
+# Version of the schema cache format, bump it when the cached objects change.
+SCHEMA_CACHE_VERSION = 1
+
+_codeHash = None
+
+"""
+Get sha256 of the sources of this library. Objects in the schema cache are
+created by this code, a cache saved by another version of it is not used.
+"""
+def _getCodeHash():
+
+    global _codeHash
+    if _codeHash is None:
+        sha = hashlib.sha256()
+        srcDir = os.path.dirname(os.path.realpath(__file__))
+        for name in ('sonic_yang.py', 'sonic_yang_ext.py'):
+            with open(os.path.join(srcDir, name), 'rb') as f:
+                sha.update(f.read())
+        _codeHash = sha.hexdigest()
+    return _codeHash
+
 """
 This is the Exception thrown out of all public function of this class.
 """
@@ -45,12 +75,19 @@ class SonicYangExtMixin:
 
     """
     load all YANG models, create JSON of yang models. (Public function)
+    The JSON of yang models, the map from config DB tables to yang containers
+    and the leaf dicts are stored in a schema cache, if the schema_cache_dir of
+    SonicYang is set. If the yang model files and this library are not changed, the next SonicYang instances load them from the cache,
+    and the yang models are loaded in libyang on first use of self.ctx.
     """
     def loadYangModel(self):
 
         try:
             # get all files
             self.yangFiles = glob(self.yang_dir +"/*.yang")
+            hashes = self._getYangFilesHashes(self.yangFiles)
+            if self._loadSchemaCache(hashes):
+                return True
             # load yang modules
             for file in self.yangFiles:
                 m = self._load_schema_module(file)
@@ -69,6 +106,10 @@ class SonicYangExtMixin:
             self._loadJsonYangModel()
             # create a map from config DB table to yang container
             self._createDBTableToModuleMap()
+            if self.schemaCacheDir:
+                # create leaf dicts of all tables, to have them in the cache
+                self._createLeafDicts()
+                self._saveSchemaCache(hashes)
         except Exception as e:
             self.sysLog(msg="Yang Models Load failed:{}".format(str(e)), \
                 debug=syslog.LOG_ERR, doPrint=True)
@@ -76,6 +117,116 @@ class SonicYangExtMixin:
 
         return True
 
+    """
+    Get sha256 of yang model files, keyed by the file name
+    """
+    def _getYangFilesHashes(self, yangFiles):
+
+        hashes = dict()
+        for file in yangFiles:
+            with open(file, 'rb') as f:
+                hashes[os.path.basename(file)] = hashlib.sha256(f.read()).hexdigest()
+        return hashes
+
+    """
+    Get path of the schema cache file of self.yang_dir, None if the cache is disabled
+    """
+    def _getSchemaCacheFile(self):
+
+        if not self.schemaCacheDir:
+            return None
+        dirHash = hashlib.sha1(os.path.realpath(self.yang_dir).encode()).hexdigest()
+        return os.path.join(self.schemaCacheDir, "schema-{}.pickle".format(dirHash[:16]))
+
+    """
+    Load the schema from the cache, if it was created from the same yang model files.
+    Yang models are loaded in libyang on first use of self.ctx.
+    Return True if the schema is loaded from the cache.
+    """
+    def _loadSchemaCache(self, hashes):
+
+        cacheFile = self._getSchemaCacheFile()
+        if cacheFile is None:
+            return False
+        try:
+            with open(cacheFile, 'rb') as f:
+                cache = pickle.load(f)
+            if cache.get('version') != SCHEMA_CACHE_VERSION or cache.get('codeHash') != _getCodeHash() \
+                or cache.get('hashes') != hashes:
+                self.sysLog(msg="Schema cache {} is outdated".format(cacheFile))
+                return False
+        except Exception as e:
+            self.sysLog(syslog.LOG_DEBUG, "Schema cache {} is not used: {}".format(cacheFile, str(e)))
+            return False
+
+        self.pendingYangFiles = self.yangFiles
+        self.yangFiles = cache['yangFiles']
+        self.yJson = cache['yJson']
+        self.confDbYangMap = cache['confDbYangMap']
+        self.preProcessedYang = cache['preProcessedYang']
+        self.leafDictCache = {id(model): (model, leafDict) for model, leafDict in cache['leafDicts']}
+        self.sysLog(msg="Loaded schema from cache {}".format(cacheFile))
+        return True
+
+    """
+    Save the schema in the cache. The cache is written atomically,
+    failures are logged and ignored.
+    """
+    def _saveSchemaCache(self, hashes):
+
+        cacheFile = self._getSchemaCacheFile()
+        if cacheFile is None:
+            return
+        # all objects are pickled at once to keep the references between them
+        cache = {
+            'version': SCHEMA_CACHE_VERSION,
+            'codeHash': _getCodeHash(),
+            'hashes': hashes,
+            'yangFiles': self.yangFiles,
+            'yJson': self.yJson,
+            'confDbYangMap': self.confDbYangMap,
+            'preProcessedYang': self.preProcessedYang,
+            'leafDicts': list(self.leafDictCache.values())
+        }
+        tmpFile = None
+        try:
+            os.makedirs(self.schemaCacheDir, exist_ok=True)
+            fd, tmpFile = tempfile.mkstemp(dir=self.schemaCacheDir, prefix='.schema-')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpFile, cacheFile)
+            self.sysLog(msg="Saved schema in cache {}".format(cacheFile))
+        except Exception as e:
+            self.sysLog(syslog.LOG_DEBUG, "Schema cache {} is not saved: {}".format(cacheFile, str(e)))
+            if tmpFile is not None and os.path.exists(tmpFile):
+                os.remove(tmpFile)
+        return
+
+    """
+    Create leaf dicts of all containers and lists of config DB tables
+    """
+    def _createLeafDicts(self):
+
+        def _walk(model, table):
+            self._createLeafDict(model, table)
+            for section in ('container', 'list'):
+                nodes = model.get(section)
+                if isinstance(nodes, dict):
+                    nodes = [nodes]
+                for node in nodes or []:
+                    _walk(node, table)
+
+        for table, cmap in self.confDbYangMap.items():
+            # common yang modules have no config DB table
+            if 'topLevelContainer' not in cmap:
+                continue
+            try:
+                _walk(cmap['container'], table)
+            except Exception as e:
+                # the leaf dict will be created, and fail, on translation of the table
+                self.sysLog(syslog.LOG_DEBUG, "_createLeafDicts failed for {}:{}".format(table, str(e)))
+        return
+
     """
     load JSON schema format from yang models
     """
@@ -369,8 +520,12 @@ class SonicYangExtMixin:
 
             Returns:
                  leafDict (dict): dict with leaf(s) information for List\Container
-                    corresponding to config DB table.
+                    corresponding to config DB table. The dict is created once
+                    per model and kept in self.leafDictCache.
         '''
+        cached = self.leafDictCache.get(id(model))
+        if cached is not None and cached[0] is model:
+            return cached[1]
         leafDict = dict()
         #Iterate over leaf, choices and leaf-list.
         self._fillLeafDict(model.get('leaf'), leafDict)
@@ -397,6 +552,7 @@ class SonicYangExtMixin:
         if model.get('uses') is not None:
             self._fillLeafDictUses(model.get('uses'), table, leafDict)
 
+        self.leafDictCache[id(model)] = (model, leafDict)
         return leafDict
 
     """
@@ -751,6 +907,7 @@ class SonicYangExtMixin:
 
         # find top level container for each table, and run the xlate_container.
         for table in jIn.keys():
+            start = time.time()
             cmap = self.confDbYangMap[table]
             # create top level containers
             key = cmap['module']+":"+cmap['topLevelContainer']
@@ -763,9 +920,21 @@ class SonicYangExtMixin:
             self._xlateContainer(cmap['container'], yangJ[key][subkey], \
                                 jIn[table], table)
             self.elementPath = []
+            self.loadDataTimings['xlate'][table] = int((time.time() - start) * 1000)
 
         return
 
+    """
+    Get the yang JSON keys of the top level container of a table and of the
+    table container in it
+    """
+    def _getXlateKeys(self, table):
+
+        cmap = self.confDbYangMap[table]
+        key = cmap['module']+":"+cmap['topLevelContainer']
+        subkey = cmap['topLevelContainer']+":"+cmap['container']['@name']
+        return key, subkey
+
     """
     Read config file and crop it as per yang models
     """
@@ -1167,14 +1336,18 @@ class SonicYangExtMixin:
           # reset xlate and tablesWithOutYang
           self.xlateJson = dict()
           self.tablesWithOutYang = dict()
+          self.loadDataTimings = {'xlate': dict(), 'parse': 0, 'validate': 0}
           # self.jIn will be cropped
           self._cropConfigDB()
           # xlated result will be in self.xlateJson
           self._xlateConfigDB(xlateFile=xlateFile)
           #print(self.xlateJson)
           self.sysLog(msg="Try to load Data in the tree")
+          start = time.time()
           self.root = self.ctx.parse_data_mem(dumps(self.xlateJson), \
                         ly.LYD_JSON, ly.LYD_OPT_CONFIG|ly.LYD_OPT_STRICT)
+          # data is validated while it is parsed
+          self.loadDataTimings['parse'] = int((time.time() - start) * 1000)
 
        except Exception as e:
            self.root = None
@@ -1184,6 +1357,137 @@ class SonicYangExtMixin:
 
        return True
 
+    """
+    load_data_delta: apply changes to the data loaded by loadData, translate
+    only the changed tables and validate the resulting data tree. (Public)
+    input:    configdbJsonDelta - dict of table -> key -> entry, an entry
+              replaces the entry of the key. A None key or table is deleted.
+    returns:  True - success, the data tree is left unchanged on failure.
+    Time spent in ms is stored in self.loadDataTimings: xlate per table,
+    parse of the changed yang modules and validation of the whole tree.
+    """
+    def loadDataDelta(self, configdbJsonDelta):
+
+        if self.root is None:
+            raise SonicYangException("Data Delta Loading Failed\nData is not loaded")
+
+        self.loadDataTimings = {'xlate': dict(), 'parse': 0, 'validate': 0}
+        # previous content of the changed tables, for rollback
+        oldTables = dict()
+        try:
+            self._applyConfigDelta(configdbJsonDelta, oldTables)
+            keys = self._xlateTables(oldTables)
+            self._loadDataTrees(keys)
+        except Exception as e:
+            self.sysLog(msg="Data Delta Loading Failed:{}".format(str(e)), \
+                debug=syslog.LOG_ERR, doPrint=True)
+            self._rollbackConfigDelta(oldTables)
+            raise SonicYangException("Data Delta Loading Failed\n{}".format(str(e)))
+
+        self.sysLog(msg="Data delta loaded, timings in ms:{}".format(self.loadDataTimings))
+        return True
+
+    """
+    Apply changes on self.jIn and self.tablesWithOutYang. Changed tables are
+    replaced, not modified, their previous content is stored in oldTables.
+    """
+    def _applyConfigDelta(self, configdbJsonDelta, oldTables):
+
+        for table, entries in configdbJsonDelta.items():
+            config = self.jIn if table in self.confDbYangMap else self.tablesWithOutYang
+            oldTables[table] = config.get(table)
+            if entries is None:
+                config.pop(table, None)
+                continue
+            newTable = dict(config.get(table, dict()))
+            for key, entry in entries.items():
+                if entry is None:
+                    newTable.pop(key, None)
+                else:
+                    newTable[key] = entry
+            config[table] = newTable
+
+        return
+
+    """
+    Translate the given tables from self.jIn in self.xlateJson.
+    Return the keys of the top level containers of these tables.
+    """
+    def _xlateTables(self, tables):
+
+        keys = set()
+        for table in tables:
+            if table not in self.confDbYangMap:
+                continue
+            key, subkey = self._getXlateKeys(table)
+            keys.add(key)
+            if key in self.xlateJson:
+                # getData() replaces self.xlateJson by the printed data tree,
+                # where the container has no module prefix
+                self.xlateJson[key].pop(self.confDbYangMap[table]['container']['@name'], None)
+                self.xlateJson[key].pop(subkey, None)
+                if len(self.xlateJson[key]) == 0:
+                    del self.xlateJson[key]
+            if table in self.jIn:
+                self._xlateConfigDBtoYang({table: self.jIn[table]}, self.xlateJson)
+
+        return keys
+
+    """
+    Replace the top level containers of the given keys in the data tree by
+    their translation in self.xlateJson, then validate the whole data tree.
+    """
+    def _loadDataTrees(self, keys):
+
+        start = time.time()
+        for key in keys:
+            node = self._find_data_node("/" + key)
+            if node is None:
+                continue
+            if node.path() == self.root.path():
+                self.root = node.next()
+            node.unlink()
+        # the yang JSON of the changed modules is parsed without validation,
+        # leafrefs to other modules are validated in the merged tree
+        yangJ = {key: self.xlateJson[key] for key in keys if key in self.xlateJson}
+        if len(yangJ):
+            tree = self.ctx.parse_data_mem(dumps(yangJ), ly.LYD_JSON, \
+                ly.LYD_OPT_CONFIG|ly.LYD_OPT_STRICT|ly.LYD_OPT_TRUSTED)
+            if self.root is None:
+                self.root = tree
+            elif tree is not None:
+                self.root.merge(tree, 0)
+        self._reset_dependency_index()
+        self.loadDataTimings['parse'] = int((time.time() - start) * 1000)
+
+        start = time.time()
+        self._validate_data(self.root, self.ctx)
+        self.loadDataTimings['validate'] = int((time.time() - start) * 1000)
+
+        return
+
+    """
+    Restore the tables changed by a failed delta and reload the whole data tree
+    """
+    def _rollbackConfigDelta(self, oldTables):
+
+        try:
+            for table, oldTable in oldTables.items():
+                config = self.jIn if table in self.confDbYangMap else self.tablesWithOutYang
+                if oldTable is None:
+                    config.pop(table, None)
+                else:
+                    config[table] = oldTable
+            self._xlateTables(oldTables)
+            self.root = self.ctx.parse_data_mem(dumps(self.xlateJson), \
+                ly.LYD_JSON, ly.LYD_OPT_CONFIG|ly.LYD_OPT_STRICT)
+        except Exception as e:
+            self.root = None
+            self.sysLog(msg="Data Delta Rollback Failed:{}".format(str(e)), \
+                debug=syslog.LOG_ERR, doPrint=True)
+
+        return
+
     """
     Get data from Data tree, data tree will be assigned in self.xlateJson. (Public)
     """
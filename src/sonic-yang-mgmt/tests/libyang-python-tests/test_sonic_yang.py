@@ -5,6 +5,7 @@ import sonic_yang as sy
 import json
 import glob
 import logging
+from unittest import mock
 from ijson import items as ijson_itmes
 
 test_path = os.path.dirname(os.path.abspath(__file__))
@@ -350,6 +351,119 @@ class Test_SonicYang(object):
 
         return
 
+    def test_schema_cache(self, sonic_yang_data, tmp_path):
+        # In this test, the schema is saved in the cache by a first instance,
+        # a second instance loads it from the cache and translates the same config.
+        test_file = sonic_yang_data['test_file']
+        yang_dir = sonic_yang_data['yang_dir']
+
+        cold = sy.SonicYang(yang_dir, schema_cache_dir=str(tmp_path))
+        cold.loadYangModel()
+        assert len(list(tmp_path.glob("schema-*.pickle"))) == 1
+        assert cold.pendingYangFiles == []
+
+        warm = sy.SonicYang(yang_dir, schema_cache_dir=str(tmp_path))
+        warm.loadYangModel()
+        assert len(warm.pendingYangFiles) == len(cold.yangFiles)
+        assert sorted(warm.yangFiles) == sorted(cold.yangFiles)
+        assert warm.confDbYangMap.keys() == cold.confDbYangMap.keys()
+        assert warm.yJson == cold.yJson
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        cold.loadData(jIn)
+        warm.loadData(jIn)
+        # yang models are loaded in libyang on first use
+        assert warm.pendingYangFiles == []
+        assert warm.xlateJson == cold.xlateJson
+        warm.validate_data_tree()
+
+        # a changed yang model invalidates the cache
+        assert not warm._loadSchemaCache({})
+        # so does a cache saved by another version of the library
+        with mock.patch('sonic_yang_ext._codeHash', 'other'):
+            other = sy.SonicYang(yang_dir, schema_cache_dir=str(tmp_path))
+            other.loadYangModel()
+            assert other.pendingYangFiles == []
+
+        # the cache is used only if a directory is given
+        default = sy.SonicYang(yang_dir)
+        assert default._getSchemaCacheFile() is None
+        # and leaf dicts are not created ahead of use for it
+        default.loadYangModel()
+        assert default.leafDictCache == {}
+
+        return
+
+    def test_dependency_index(self, sonic_yang_data):
+        # In this test, dependencies found with the dependency index must match
+        # the ones found by walking the data tree, also after data tree changes.
+        test_file = sonic_yang_data['test_file']
+        yang_dir = sonic_yang_data['yang_dir']
+        syc = sonic_yang_data['syc']
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        syc.loadData(jIn)
+        sycIdx = sy.SonicYang(yang_dir, dependency_index=True)
+        sycIdx.loadYangModel()
+        sycIdx.loadData(jIn)
+
+        ports = [syc.findXpathPortLeaf(port) for port in jIn['PORT']]
+        deps = dict()
+        for port in ports:
+            deps[port] = syc.find_data_dependencies(port)
+            assert sorted(sycIdx.find_data_dependencies(port)) == sorted(deps[port])
+        assert sycIdx.dependencyIndex
+
+        # delete a dependency of a port
+        port = [port for port in ports if deps[port]][0]
+        syc.deleteNode(deps[port][0])
+        sycIdx.deleteNode(deps[port][0])
+        assert sorted(sycIdx.find_data_dependencies(port)) == \
+            sorted(syc.find_data_dependencies(port))
+
+        # a new data tree resets the index
+        sycIdx.loadData(jIn)
+        assert not sycIdx.dependencyIndex
+        assert sorted(sycIdx.find_data_dependencies(port)) == sorted(deps[port])
+
+        return
+
+    def test_load_data_delta(self, sonic_yang_data):
+        # In this test, data changed with loadDataDelta must match the same
+        # config loaded with loadData, invalid changes must be rolled back.
+        test_file = sonic_yang_data['test_file']
+        syc = sonic_yang_data['syc']
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        jFull = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        delta = {
+            'PORT': {'Ethernet0': dict(jIn['PORT']['Ethernet0'], description='changed')},
+            'VLAN_MEMBER': {'Vlan111|Ethernet0': None},
+            'LOOPBACK_INTERFACE': None,
+            'NO_YANG_TABLE': {'key': {'field': 'value'}}
+        }
+        jFull['PORT']['Ethernet0']['description'] = 'changed'
+        del jFull['VLAN_MEMBER']['Vlan111|Ethernet0']
+        del jFull['LOOPBACK_INTERFACE']
+        jFull['NO_YANG_TABLE'] = {'key': {'field': 'value'}}
+
+        syc.loadData(jIn)
+        syc.loadDataDelta(delta)
+        assert set(syc.loadDataTimings['xlate']) == set(['PORT', 'VLAN_MEMBER'])
+        assert syc.tablesWithOutYang['NO_YANG_TABLE'] == {'key': {'field': 'value'}}
+        deltaData = syc.getData()
+
+        syc.loadData(jFull)
+        assert deltaData == syc.getData()
+
+        # a VLAN member of an unknown port is rejected, the data is unchanged
+        with pytest.raises(sy.SonicYangException):
+            syc.loadDataDelta({'VLAN_MEMBER': {'Vlan111|Ethernet999': {'tagging_mode': 'untagged'}}})
+        assert 'Vlan111|Ethernet999' not in syc.jIn['VLAN_MEMBER']
+        assert deltaData == syc.getData()
+
+        return
+
     def test_table_with_no_yang(self, sonic_yang_data):
         # in this test, tables with no YANG models must be stored seperately
         # by this library.
@@ -12,6 +12,9 @@ class Config(object):
     # Default system health check interval
     DEFAULT_INTERVAL = 60
 
+    # Default time in seconds the checkers have to complete a system health check
+    DEFAULT_CHECKER_TIMEOUT = 30
+
     # Default boot up timeout. When reboot system, system health will wait a few seconds before starting to work.
     DEFAULT_BOOTUP_TIMEOUT = 300
 
@@ -41,6 +44,7 @@ class Config(object):
         self._last_mtime = None
         self.config_data = None
         self.interval = Config.DEFAULT_INTERVAL
+        self.checker_timeout = Config.DEFAULT_CHECKER_TIMEOUT
         self.ignore_services = None
         self.ignore_devices = None
         self.user_defined_checkers = None
@@ -69,6 +73,7 @@ class Config(object):
                     self.config_data = json.load(f)
 
                 self.interval = self.config_data.get('polling_interval', Config.DEFAULT_INTERVAL)
+                self.checker_timeout = self.config_data.get('checker_timeout', Config.DEFAULT_CHECKER_TIMEOUT)
                 self.ignore_services = self._get_list_data('services_to_ignore')
                 self.ignore_devices = self._get_list_data('devices_to_ignore')
                 self.user_defined_checkers = self._get_list_data('user_defined_checkers')
@@ -83,6 +88,7 @@ class Config(object):
         self._last_mtime = None
         self.config_data = None
         self.interval = Config.DEFAULT_INTERVAL
+        self.checker_timeout = Config.DEFAULT_CHECKER_TIMEOUT
         self.ignore_services = None
         self.ignore_devices = None
         self.user_defined_checkers = None
@@ -1,3 +1,7 @@
+import concurrent.futures
+import threading
+import time
+
 from .config import Config
 from .health_checker import HealthChecker
 from .service_checker import ServiceChecker
@@ -12,6 +16,11 @@ class HealthCheckerManager(object):
     """
     def __init__(self):
         self._checkers = []
+        # Checks that did not complete in time, {<checker_name>:(<checker>, <future>, <start_time>)}.
+        # A checker is not started again until its previous check completes.
+        self._running = {}
+        # Statistic of the last check of each checker, {<checker_name>:{'latency_ms':<ms>, 'result':<result>}}
+        self.checker_stats = {}
         self.config = Config()
         self.initialize()
 
@@ -26,6 +35,8 @@ class HealthCheckerManager(object):
     def check(self, chassis):
         """
         Load new configuration if any and perform the system health check for all existing checkers.
+        The checkers run concurrently, a checker that does not complete within the checker timeout is
+        reported as failed.
         :param chassis: A chassis object.
         :return: A dictionary that contains the status for all objects that was checked.
         """
@@ -33,44 +44,100 @@ class HealthCheckerManager(object):
         stats = {}
         self.config.load_config()
 
-        for checker in self._checkers:
-            self._do_check(checker, stats)
-
+        checkers = list(self._checkers)
         if self.config.user_defined_checkers:
             for udc in self.config.user_defined_checkers:
-                checker = UserDefinedChecker(udc)
-                self._do_check(checker, stats)
+                checkers.append(UserDefinedChecker(udc))
+
+        checks = [self._start_check(checker) for checker in checkers]
+        deadline = time.time() + self.config.checker_timeout
+        self.checker_stats = {}
+        for checker, future, start in checks:
+            self._do_check(checker, future, start, deadline, stats)
 
         self._set_system_led(chassis)
         return stats
 
-    def _do_check(self, checker, stats):
+    def _start_check(self, checker):
+        """
+        Start the check of a checker in a thread, unless its previous check is still running.
+        :param checker: A checker object.
+        :return: A tuple of the checker, the future of its check and the start time of the check.
+        """
+        name = str(checker)
+        if name in self._running:
+            return self._running[name]
+
+        # The result of the future is the end time of the check and its exception if any
+        future = concurrent.futures.Future()
+        start = time.time()
+
+        def run():
+            error = None
+            try:
+                checker.check(self.config)
+            except Exception as e:
+                error = e
+            future.set_result((time.time(), error))
+
+        # Daemon thread, a hung checker must not prevent the daemon from exiting
+        thread = threading.Thread(target=run, name='health_checker {}'.format(name))
+        thread.daemon = True
+        thread.start()
+        self._running[name] = (checker, future, start)
+        return self._running[name]
+
+    def _do_check(self, checker, future, start, deadline, stats):
         """
-        Do check for a particular checker and collect the check statistic.
+        Wait for the check of a particular checker and collect the check statistic.
         :param checker: A checker object.
+        :param future: Future of the check.
+        :param start: Start time of the check.
+        :param deadline: Time the check must be completed by.
         :param stats: Check statistic.
         :return:
         """
+        name = str(checker)
+        result = 'OK'
+        end = None
         try:
-            checker.check(self.config)
+            end, error = future.result(timeout=max(0, deadline - time.time()))
+            self._running.pop(name)
+            if error is not None:
+                raise error
             category = checker.get_category()
             info = checker.get_info()
             if category not in stats:
                 stats[category] = info
             else:
                 stats[category].update(info)
+        except concurrent.futures.TimeoutError:
+            result = 'Timeout'
+            error_msg = 'Health check for {} did not complete in {} seconds'.format(checker, int(time.time() - start))
+            self._set_internal_error(checker, error_msg, stats)
         except Exception as e:
-            HealthChecker.summary = HealthChecker.STATUS_NOT_OK
+            result = 'Error'
             error_msg = 'Failed to perform health check for {} due to exception - {}'.format(checker, repr(e))
-            entry = {str(checker): {
-                HealthChecker.INFO_FIELD_OBJECT_STATUS: HealthChecker.STATUS_NOT_OK,
-                HealthChecker.INFO_FIELD_OBJECT_MSG: error_msg,
-                HealthChecker.INFO_FIELD_OBJECT_TYPE: "Internal"
-            }}
-            if 'Internal' not in stats:
-                stats['Internal'] = entry
-            else:
-                stats['Internal'].update(entry)
+            self._set_internal_error(checker, error_msg, stats)
+
+        if end is None:
+            end = time.time()
+        self.checker_stats[name] = {
+            'latency_ms': int((end - start) * 1000),
+            'result': result
+        }
+
+    def _set_internal_error(self, checker, error_msg, stats):
+        HealthChecker.summary = HealthChecker.STATUS_NOT_OK
+        entry = {str(checker): {
+            HealthChecker.INFO_FIELD_OBJECT_STATUS: HealthChecker.STATUS_NOT_OK,
+            HealthChecker.INFO_FIELD_OBJECT_MSG: error_msg,
+            HealthChecker.INFO_FIELD_OBJECT_TYPE: "Internal"
+        }}
+        if 'Internal' not in stats:
+            stats['Internal'] = entry
+        else:
+            stats['Internal'].update(entry)
 
     def _set_system_led(self, chassis):
         try:
@@ -25,6 +25,13 @@ class ServiceChecker(HealthChecker):
 
     CRITICAL_PROCESSES_PATH = 'etc/supervisor/critical_processes'
 
+    # Path of the supervisord XML-RPC unix socket in a container. supervisord uses /var/run/supervisor.sock,
+    # but /var/run is an absolute symlink to /run in the container, which would resolve to /run of the host
+    SUPERVISOR_SOCKET_PATH = 'run/supervisor.sock'
+
+    # Command to get the status of the processes in a container if its supervisord socket can't be reached
+    SUPERVISOR_STATUS_CMD = 'docker exec {} bash -c "supervisorctl status"'
+
     # Command to get merged directory of a container
     GET_CONTAINER_FOLDER_CMD = 'docker inspect {} --format "{{{{.GraphDriver.Data.MergedDir}}}}"'
 
@@ -51,6 +58,11 @@ class ServiceChecker(HealthChecker):
 
         self.container_feature_dict = {}
 
+        # Ids of the running containers, {<container_name>:<container_id>}
+        self.container_ids = {}
+        # Merged directory of the containers, {<container_name>:(<container_id>, <merged_dir>)}
+        self.container_folders = {}
+
         self.need_save_cache = False
 
         self.config_db = None
@@ -114,12 +126,14 @@ class ServiceChecker(HealthChecker):
         """
         DOCKER_CLIENT = docker.DockerClient(base_url='unix://var/run/docker.sock')
         running_containers = set()
+        self.container_ids = {}
         ctrs = DOCKER_CLIENT.containers
         try:
             lst = ctrs.list(filters={"status": "running"})
 
             for ctr in lst:
                 running_containers.add(ctr.name)
+                self.container_ids[ctr.name] = ctr.id
                 if ctr.name not in self.container_critical_processes:
                     self.fill_critical_process_by_container(ctr.name)
         except docker.errors.APIError as err:
@@ -163,7 +177,7 @@ class ServiceChecker(HealthChecker):
             container (str): container name
         """
         # Get container volumn folder
-        container_folder = self._get_container_folder(container)
+        container_folder = self._get_cached_container_folder(container)
         if not container_folder:
             logger.log_warning('Could not find MergedDir of container {}, was container stopped?'.format(container))
             return
@@ -195,6 +209,25 @@ class ServiceChecker(HealthChecker):
 
         return container_folder.strip()
 
+    def _get_cached_container_folder(self, container):
+        """Get merged directory of a container, it is queried again only if the container was recreated
+
+        Args:
+            container (str): container name
+
+        Returns:
+            container_folder: merged directory of the container, None or empty if not found
+        """
+        container_id = self.container_ids.get(container)
+        cached = self.container_folders.get(container)
+        if cached is not None and container_id is not None and cached[0] == container_id:
+            return cached[1]
+
+        container_folder = self._get_container_folder(container)
+        if container_folder and container_id is not None:
+            self.container_folders[container] = (container_id, container_folder)
+        return container_folder
+
     def save_critical_process_cache(self):
         """Save self.container_critical_processes to a cache file
         """
@@ -278,6 +311,9 @@ class ServiceChecker(HealthChecker):
         expected_running_containers, self.container_feature_dict = self.get_expected_running_containers(feature_table)
         current_running_containers = self.get_current_running_containers()
 
+        for stopped_container in set(self.container_folders.keys()).difference(current_running_containers):
+            self.container_folders.pop(stopped_container)
+
         newly_disabled_containers = set(self.container_critical_processes.keys()).difference(expected_running_containers)
         for newly_disabled_container in newly_disabled_containers:
             self.container_critical_processes.pop(newly_disabled_container)
@@ -329,6 +365,31 @@ class ServiceChecker(HealthChecker):
             data[items[0].strip()] = items[1].strip()
         return data
 
+    def get_process_status(self, container_name):
+        """Get the status of the processes in a container. supervisord is queried over its XML-RPC
+           socket, "supervisorctl status" is run in the container if the socket can't be reached.
+
+        Args:
+            container_name (str): Container name
+
+        Returns:
+            process_status: A dictionary {<process_name>:<state>}, None if the status can't be retrieved
+        """
+        container_folder = self._get_cached_container_folder(container_name)
+        if container_folder:
+            socket_path = os.path.join(container_folder, ServiceChecker.SUPERVISOR_SOCKET_PATH)
+            if os.path.exists(socket_path):
+                process_status = utils.get_supervisor_process_status(socket_path)
+                if process_status is not None:
+                    return process_status
+                logger.log_debug('Failed to query supervisord of {} over {}'.format(container_name, socket_path))
+
+        process_status = utils.run_command(ServiceChecker.SUPERVISOR_STATUS_CMD.format(container_name))
+        if process_status is None:
+            return None
+
+        return self._parse_supervisorctl_status(process_status.strip().splitlines())
+
     def publish_events(self, container_name, critical_process_list):
         params = swsscommon.FieldValueMap()
         params["ctr_name"] = container_name
@@ -352,18 +413,16 @@ class ServiceChecker(HealthChecker):
             if ("state" in feature_table[feature_name]
                     and feature_table[feature_name]["state"] not in ["disabled", "always_disabled"]):
 
-                # We are using supervisorctl status to check the critical process status. We cannot leverage psutil here because
+                # We are using supervisord to check the critical process status. We cannot leverage psutil here because
                 # it not always possible to get process cmdline in supervisor.conf. E.g, cmdline of orchagent is "/usr/bin/orchagent",
                 # however, in supervisor.conf it is "/usr/bin/orchagent.sh"
-                cmd = 'docker exec {} bash -c "supervisorctl status"'.format(container_name)
-                process_status = utils.run_command(cmd)
+                process_status = self.get_process_status(container_name)
                 if process_status is None:
                     for process_name in critical_process_list:
                         self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "Process '{}' in container '{}' is not running".format(process_name, container_name))
                     self.publish_events(container_name, critical_process_list)
                     return
 
-                process_status = self._parse_supervisorctl_status(process_status.strip().splitlines())
                 for process_name in critical_process_list:
                     if config and config.ignore_services and process_name in config.ignore_services:
                         continue
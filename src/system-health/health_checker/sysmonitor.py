@@ -24,6 +24,7 @@ QUEUE_TIMEOUT = 15
 TASK_STOP_TIMEOUT = 10
 logger = Logger(log_identifier=SYSLOG_IDENTIFIER)
 exclude_srv_list = ['ztp.service']
+UNIT_PROPERTIES = ['Id', 'LoadState', 'UnitFileState', 'Type', 'ActiveState', 'SubState', 'Result']
 
 #Subprocess which subscribes to STATE_DB FEATURE table for any update
 #and push service events to main process via queue
@@ -120,6 +121,8 @@ class Sysmonitor(ProcessTaskBase):
         self.state_db = None
         self.config_db = None
         self.config = Config()
+        # FEATURE table of config db, read once per scan of all the services
+        self.feature_table_cache = None
         self.mpmgr = multiprocessing.Manager()
         self.myQ = self.mpmgr.Queue()
 
@@ -240,7 +243,9 @@ class Sysmonitor(ProcessTaskBase):
         fail_reason = ""
         check_app_up_status = ""
         up_status_flag = ""
-        configdb_feature_table = self.config_db.get_table('FEATURE')
+        configdb_feature_table = self.feature_table_cache
+        if configdb_feature_table is None:
+            configdb_feature_table = self.config_db.get_table('FEATURE')
         update_time = "-"
 
         if service not in configdb_feature_table.keys():
@@ -248,16 +253,17 @@ class Sysmonitor(ProcessTaskBase):
         else:
             check_app_up_status = configdb_feature_table[service].get('check_up_status')
             if check_app_up_status is not None and (check_app_up_status.lower()) == "true":
-                up_status_flag = self.state_db.get(self.state_db.STATE_DB, 'FEATURE|{}'.format(service), 'up_status')
+                feature_state = self.state_db.get_all(self.state_db.STATE_DB, 'FEATURE|{}'.format(service))
+                up_status_flag = feature_state.get('up_status')
                 if up_status_flag is not None and (up_status_flag.lower()) == "true":
                     pstate = "Up"
                 else:
-                    fail_reason = self.state_db.get(self.state_db.STATE_DB, 'FEATURE|{}'.format(service), 'fail_reason')
+                    fail_reason = feature_state.get('fail_reason')
                     if fail_reason is None:
                         fail_reason = "NA"
                     pstate = "Down"
 
-                update_time = self.state_db.get(self.state_db.STATE_DB, 'FEATURE|{}'.format(service), 'update_time')
+                update_time = feature_state.get('update_time')
                 if update_time is None:
                     update_time = "-"
             else:
@@ -268,7 +274,7 @@ class Sysmonitor(ProcessTaskBase):
 
     #Gets the service properties
     def run_systemctl_show(self, service):
-        command = ('systemctl show {} --property=Id,LoadState,UnitFileState,Type,ActiveState,SubState,Result'.format(service))
+        command = ('systemctl show {} --property={}'.format(service, ','.join(UNIT_PROPERTIES)))
         output = utils.run_command(command)
         srv_properties = output.split('\n')
         prop_dict = {}
@@ -279,8 +285,44 @@ class Sysmonitor(ProcessTaskBase):
 
         return prop_dict
 
+    #Gets the properties of all the units in one D-Bus round, instead of forking
+    #systemctl per unit. Returns None if systemd can't be queried over D-Bus
+    def get_units_properties(self, units):
+        try:
+            import dbus
+
+            bus = dbus.SystemBus()
+            systemd = bus.get_object('org.freedesktop.systemd1', '/org/freedesktop/systemd1')
+            manager = dbus.Interface(systemd, 'org.freedesktop.systemd1.Manager')
+            units_properties = {}
+            for unit_info in manager.ListUnitsByNames(units):
+                name, _, load_state, active_state, sub_state, _, unit_path = [str(field) for field in unit_info[:7]]
+                prop_dict = {'Id': name, 'LoadState': load_state, 'ActiveState': active_state, 'SubState': sub_state}
+                if load_state == "loaded":
+                    unit = dbus.Interface(bus.get_object('org.freedesktop.systemd1', unit_path), 'org.freedesktop.DBus.Properties')
+                    prop_dict['UnitFileState'] = str(unit.Get('org.freedesktop.systemd1.Unit', 'UnitFileState'))
+                    #Type and Result are properties of the unit type interface, e.g. org.freedesktop.systemd1.Service
+                    unit_type = name.rsplit('.', 1)[-1].capitalize()
+                    for prop, value in unit.GetAll('org.freedesktop.systemd1.{}'.format(unit_type)).items():
+                        if prop in UNIT_PROPERTIES:
+                            prop_dict[str(prop)] = str(value)
+                units_properties[name] = prop_dict
+            return units_properties
+        except Exception as e:
+            logger.log_warning("Unable to get units properties over D-Bus, fall back to systemctl: {}".format(str(e)))
+            return None
+
+    #Gets a pipeline to post the status of all the services to state db at once
+    def get_state_db_pipeline(self):
+        try:
+            client = self.state_db.get_redis_client(self.state_db.STATE_DB)
+            return swsscommon.RedisPipeline(client)
+        except Exception as e:
+            logger.log_warning("Unable to create state db pipeline: {}".format(str(e)))
+            return None
+
     #Sets the service status to state db
-    def post_unit_status(self, srv_name, srv_status, app_status, fail_reason, update_time):
+    def post_unit_status(self, srv_name, srv_status, app_status, fail_reason, update_time, pipeline=None):
         if not self.state_db:
             self.state_db = swsscommon.SonicV2Connector(use_unix_socket_path=True)
             self.state_db.connect(self.state_db.STATE_DB)
@@ -291,10 +333,16 @@ class Sysmonitor(ProcessTaskBase):
         statusvalue['app_ready_status'] = app_status
         statusvalue['fail_reason'] = fail_reason
         statusvalue['update_time'] = update_time
-        self.state_db.hmset(self.state_db.STATE_DB, key, statusvalue)
+        if pipeline is not None:
+            command = swsscommon.RedisCommand()
+            command.formatHSET(key, statusvalue)
+            pipeline.push(command)
+        else:
+            self.state_db.hmset(self.state_db.STATE_DB, key, statusvalue)
 
     #Reads the current status of the service and posts it to state db
-    def get_unit_status(self, event):
+    #sysctl_show are the unit properties if already known, pipeline the state db pipeline to post the status to
+    def get_unit_status(self, event, sysctl_show=None, pipeline=None):
         """ Get a unit status"""
         global spl_srv_list
         unit_status = "NOT OK"
@@ -305,7 +353,8 @@ class Sysmonitor(ProcessTaskBase):
             service_up_status = "Down"
             service_name,last_name = event.split('.')
 
-            sysctl_show = self.run_systemctl_show(event)
+            if sysctl_show is None:
+                sysctl_show = self.run_systemctl_show(event)
 
             load_state = sysctl_show.get('LoadState')
             if load_state == "loaded":
@@ -355,7 +404,7 @@ class Sysmonitor(ProcessTaskBase):
                     else:
                         unit_status = "NOT OK"
 
-                    self.post_unit_status(service_name, service_status, service_up_status, fail_reason, update_time)
+                    self.post_unit_status(service_name, service_status, service_up_status, fail_reason, update_time, pipeline)
 
                     return unit_status
 
@@ -370,11 +419,27 @@ class Sysmonitor(ProcessTaskBase):
         scan_srv_list = []
 
         scan_srv_list = self.get_all_service_list()
-        for service in scan_srv_list:
-            ustate = self.get_unit_status(service)
-            if ustate == "NOT OK":
-                if service not in self.dnsrvs_name:
-                    self.dnsrvs_name.add(service)
+        if not self.state_db:
+            self.state_db = swsscommon.SonicV2Connector(use_unix_socket_path=True)
+            self.state_db.connect(self.state_db.STATE_DB)
+        if not self.config_db:
+            self.config_db = swsscommon.ConfigDBConnector(use_unix_socket_path=True)
+            self.config_db.connect()
+
+        units_properties = self.get_units_properties(scan_srv_list)
+        pipeline = self.get_state_db_pipeline()
+        self.feature_table_cache = self.config_db.get_table('FEATURE')
+        try:
+            for service in scan_srv_list:
+                sysctl_show = units_properties.get(service) if units_properties is not None else None
+                ustate = self.get_unit_status(service, sysctl_show, pipeline)
+                if ustate == "NOT OK":
+                    if service not in self.dnsrvs_name:
+                        self.dnsrvs_name.add(service)
+        finally:
+            self.feature_table_cache = None
+            if pipeline is not None:
+                pipeline.flush()
 
         if len(self.dnsrvs_name) == 0:
             return "UP"
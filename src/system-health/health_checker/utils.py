@@ -1,4 +1,10 @@
+import http.client
+import socket
 import subprocess
+import xmlrpc.client
+
+# Timeout in seconds of a supervisord XML-RPC call
+SUPERVISOR_RPC_TIMEOUT = 5
 
 
 def run_command(command):
@@ -23,3 +29,54 @@ def get_uptime():
         uptime_seconds = float(f.readline().split()[0])
 
     return uptime_seconds
+
+
+class UnixStreamHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a unix socket.
+    """
+    def __init__(self, socket_path, timeout):
+        http.client.HTTPConnection.__init__(self, 'localhost', timeout=timeout)
+        self._socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+class UnixStreamTransport(xmlrpc.client.Transport):
+    """
+    XML-RPC transport over a unix socket.
+    """
+    def __init__(self, socket_path, timeout):
+        xmlrpc.client.Transport.__init__(self)
+        self._socket_path = socket_path
+        self._timeout = timeout
+
+    def make_connection(self, host):
+        return UnixStreamHTTPConnection(self._socket_path, self._timeout)
+
+
+def get_supervisor_process_status(socket_path, timeout=SUPERVISOR_RPC_TIMEOUT):
+    """
+    Utility to get the status of the processes of a supervisord over its XML-RPC unix socket.
+    :param socket_path: Path of the supervisord unix socket.
+    :param timeout: Timeout in seconds of the call.
+    :return: A dictionary of process name, as shown by "supervisorctl status", to its state
+             like 'RUNNING'. None if supervisord can't be reached.
+    """
+    try:
+        proxy = xmlrpc.client.ServerProxy('http://localhost', transport=UnixStreamTransport(socket_path, timeout))
+        process_infos = proxy.supervisor.getAllProcessInfo()
+    except Exception:
+        return None
+
+    status = {}
+    for info in process_infos:
+        if info['group'] == info['name']:
+            name = info['name']
+        else:
+            name = '{}:{}'.format(info['group'], info['name'])
+        status[name] = info['statename']
+    return status
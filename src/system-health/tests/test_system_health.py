@@ -11,7 +11,12 @@
 """
 import copy
 import os
+import shutil
+import socketserver
 import sys
+import tempfile
+import threading
+import xmlrpc.server
 from imp import load_source
 from swsscommon import swsscommon
 
@@ -574,6 +579,45 @@ def test_manager(mock_hw_info, mock_service_info, mock_udc_info):
     chassis.set_status_led.side_effect = RuntimeError()
     manager._set_system_led(chassis)
 
+@patch('swsscommon.swsscommon.ConfigDBConnector', MagicMock())
+@patch('health_checker.service_checker.ServiceChecker.get_category', MagicMock(return_value='Services'))
+@patch('health_checker.service_checker.ServiceChecker.get_info', MagicMock(return_value={}))
+@patch('health_checker.hardware_checker.HardwareChecker.get_category', MagicMock(return_value='Hardware'))
+@patch('health_checker.hardware_checker.HardwareChecker.get_info', MagicMock(return_value={}))
+@patch('health_checker.hardware_checker.HardwareChecker.check', MagicMock())
+@patch('health_checker.service_checker.ServiceChecker.check')
+def test_manager_checker_timeout(mock_service_check):
+    release = threading.Event()
+    mock_service_check.side_effect = lambda config: release.wait(5)
+    chassis = MagicMock()
+
+    manager = HealthCheckerManager()
+    manager.config.checker_timeout = 0.1
+    stat = manager.check(chassis)
+    assert stat['Internal']['ServiceChecker']['status'] == 'Not OK'
+    assert 'Hardware' in stat
+    assert manager.checker_stats['ServiceChecker']['result'] == 'Timeout'
+    assert manager.checker_stats['HardwareChecker']['result'] == 'OK'
+
+    # The hung check is not started again
+    stat = manager.check(chassis)
+    assert stat['Internal']['ServiceChecker']['status'] == 'Not OK'
+    assert mock_service_check.call_count == 1
+
+    release.set()
+    manager.config.checker_timeout = 5
+    stat = manager.check(chassis)
+    assert 'Internal' not in stat
+    assert manager.checker_stats['ServiceChecker']['result'] == 'OK'
+    assert mock_service_check.call_count == 1
+    stat = manager.check(chassis)
+    assert mock_service_check.call_count == 2
+
+    daemon = HealthDaemon()
+    daemon._process_checker_stats(manager.checker_stats)
+    assert MockConnector.data['SYSTEM_HEALTH_CHECKER_STATS|ServiceChecker']['result'] == 'OK'
+
+
 def test_utils():
     output = utils.run_command('some invalid command')
     assert not output
@@ -582,6 +626,65 @@ def test_utils():
     assert output
 
 
+class UnixStreamXMLRPCServer(socketserver.UnixStreamServer, xmlrpc.server.SimpleXMLRPCDispatcher):
+    def __init__(self, socket_path):
+        self.logRequests = False
+        socketserver.UnixStreamServer.__init__(self, socket_path, UnixStreamXMLRPCRequestHandler)
+        xmlrpc.server.SimpleXMLRPCDispatcher.__init__(self, allow_none=False, encoding=None)
+
+
+class UnixStreamXMLRPCRequestHandler(xmlrpc.server.SimpleXMLRPCRequestHandler):
+    disable_nagle_algorithm = False
+
+    def address_string(self):
+        return 'localhost'
+
+
+@patch('health_checker.utils.run_command')
+def test_service_checker_supervisor_socket(mock_run):
+    # Container tree as in Debian images, /var/run is an absolute symlink to /run
+    folder = tempfile.mkdtemp()
+    os.makedirs(os.path.join(folder, 'run'))
+    os.makedirs(os.path.join(folder, 'var'))
+    os.symlink('/run', os.path.join(folder, 'var', 'run'))
+    socket_path = os.path.join(folder, 'run', 'supervisor.sock')
+    server = UnixStreamXMLRPCServer(socket_path)
+    server.register_function(lambda: [
+        {'name': 'snmpd', 'group': 'snmpd', 'statename': 'RUNNING'},
+        {'name': 'snmp-subagent', 'group': 'snmp-subagent', 'statename': 'EXITED'},
+        {'name': 'lldpd', 'group': 'lldp', 'statename': 'RUNNING'},
+    ], 'supervisor.getAllProcessInfo')
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    try:
+        assert utils.get_supervisor_process_status(socket_path) == {
+            'snmpd': 'RUNNING',
+            'snmp-subagent': 'EXITED',
+            'lldp:lldpd': 'RUNNING'
+        }
+
+        checker = ServiceChecker()
+        checker.container_ids = {'snmp': 'id1'}
+        with patch.object(checker, '_get_container_folder', MagicMock(return_value=folder)) as mock_get_folder:
+            assert checker.get_process_status('snmp')['snmp-subagent'] == 'EXITED'
+            assert checker.get_process_status('snmp')['snmpd'] == 'RUNNING'
+            # The merged directory is queried once per container
+            assert mock_get_folder.call_count == 1
+        mock_run.assert_not_called()
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(folder)
+
+    # supervisord can't be reached, fall back to supervisorctl in the container
+    mock_run.return_value = mock_supervisorctl_output
+    assert utils.get_supervisor_process_status(socket_path) is None
+    assert checker.get_process_status('snmp') == {'snmpd': 'RUNNING', 'snmp-subagent': 'EXITED'}
+    mock_run.assert_called_with(ServiceChecker.SUPERVISOR_STATUS_CMD.format('snmp'))
+
+
 @patch('swsscommon.swsscommon.ConfigDBConnector.connect', MagicMock())
 @patch('sonic_py_common.multi_asic.is_multi_asic', MagicMock(return_value=False))
 @patch('docker.DockerClient')
@@ -767,6 +870,45 @@ def test_get_all_system_status_not_ok():
     print("result:{}".format(result))
     assert result == 'DOWN'
 
+@patch('health_checker.sysmonitor.Sysmonitor.get_all_service_list', MagicMock(return_value=['mock_radv.service', 'mock_bgp.service', 'mock_ns.service']))
+@patch('health_checker.sysmonitor.Sysmonitor.run_systemctl_show', MagicMock(return_value=mock_srv_props['mock_radv.service']))
+@patch('health_checker.sysmonitor.Sysmonitor.get_app_ready_status', MagicMock(return_value=('Up','-','-')))
+@patch('health_checker.sysmonitor.Sysmonitor.post_unit_status')
+@patch('swsscommon.swsscommon.RedisPipeline')
+def test_get_all_system_status_dbus(mock_pipeline, mock_post_unit_status):
+    def interface(obj, name):
+        if name == 'org.freedesktop.systemd1.Manager':
+            manager = MagicMock()
+            manager.ListUnitsByNames.return_value = [
+                (srv, '', props['LoadState'], props['ActiveState'], props['SubState'], '', '/unit/' + srv, 0, '', '/')
+                for srv, props in mock_srv_props.items()]
+            return manager
+        props = mock_srv_props[obj.unit_path[len('/unit/'):]]
+        unit = MagicMock()
+        unit.Get.side_effect = lambda iface, prop: props[prop]
+        unit.GetAll.side_effect = lambda iface: {'Type': props['Type'], 'Result': props['Result'], 'PIDFile': ''}
+        return unit
+
+    mock_dbus = MagicMock()
+    mock_dbus.SystemBus.return_value.get_object.side_effect = lambda service, path: MagicMock(unit_path=path)
+    mock_dbus.Interface.side_effect = interface
+    sysmon = Sysmonitor()
+    sysmon.config_db = MagicMock()
+    sysmon.state_db = MagicMock()
+    with patch.dict('sys.modules', dbus=mock_dbus):
+        assert sysmon.get_units_properties(['mock_radv.service', 'mock_bgp.service']) == mock_srv_props
+        result = sysmon.get_all_system_status()
+    assert result == 'DOWN'
+    assert sysmon.dnsrvs_name == {'mock_bgp.service'}
+    # Units unknown to D-Bus fall back to systemctl
+    Sysmonitor.run_systemctl_show.assert_called_once_with('mock_ns.service')
+    # FEATURE table is read once for all the services
+    sysmon.config_db.get_table.assert_called_once_with('FEATURE')
+    pipeline = mock_pipeline.return_value
+    mock_post_unit_status.assert_any_call('mock_radv', 'OK', 'OK', '-', '-', pipeline)
+    pipeline.flush.assert_called_once()
+
+
 def test_post_unit_status():
     sysmon = Sysmonitor()
     sysmon.post_unit_status("mock_bgp", 'OK', 'Down', 'mock reason', '-')